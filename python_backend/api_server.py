@@ -6,17 +6,29 @@ REST API server that exposes the Casablanca Stock Exchange data pipeline
 to the Next.js frontend.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import logging
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import uvicorn
+import asyncio
+import functools
+import numpy as np
 import os
 
-from data_pipeline import MarketDataPipeline
+from data_pipeline import AsyncMarketDataPipeline
 from data_pipeline.config import PipelineConfig
+from data_pipeline.serialization import PayloadCache, VersionedPayload, dumps
+from data_pipeline.broadcaster import MarketBroadcaster
+from data_pipeline import columnar_export
+from data_pipeline.downsampling import downsample_frame, lttb_indices
+from data_pipeline.compression import CompressionMiddleware, choose_encoding
+from data_pipeline.correlation import CorrelationEngine, matrix_json
+from risk_engine import RiskModel
 
 # OpenAI import
 try:
@@ -35,11 +47,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Initialize data pipeline
+logger.info("Initializing market data pipeline...")
+pipeline = AsyncMarketDataPipeline()
+logger.info("Pipeline ready!")
+
+# Streaming clients are fed from each new snapshot, never from upstream directly
+broadcaster = MarketBroadcaster()
+broadcaster.attach(pipeline)
+
+# Idle interval after which a comment is sent to keep SSE connections open
+STREAM_KEEPALIVE_SECONDS = 15
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep the market snapshot warm while the server runs."""
+    if pipeline.config.enable_background_refresh:
+        await pipeline.start_background_refresh_async()
+    
+    yield
+    
+    await pipeline.stop_background_refresh_async()
+    await pipeline.aclose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Casablanca Stock Exchange API",
     description="Real-time market data from Bourse de Casablanca",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS for Next.js frontend
@@ -51,11 +89,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize data pipeline
-logger.info("Initializing market data pipeline...")
-pipeline = MarketDataPipeline()
-logger.info("Pipeline ready!")
-
+# Compresses dynamic responses; versioned payloads arrive pre-compressed
+app.add_middleware(CompressionMiddleware)
 
 def get_mock_market_data():
     """Return mock market data for demonstration when real sources are unavailable."""
@@ -182,6 +217,78 @@ def get_mock_market_data():
     }
 
 
+# The mock universe never changes, so it is serialized once at startup
+MOCK_PAYLOAD = VersionedPayload('mock', get_mock_market_data())
+
+# Snapshot-derived bodies, re-serialized only when the snapshot version changes
+payload_cache = PayloadCache()
+
+
+def versioned_response(request: Request, payload: VersionedPayload, **values) -> Response:
+    """
+    Serve a pre-serialized payload with its ETag.
+    
+    Answers 304 Not Modified when If-None-Match already names this version.
+    Otherwise the body is sent in the best encoding the client accepts,
+    compressed once per payload version.
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    
+    encoding = choose_encoding(request.headers.get("accept-encoding"), payload.encodings)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    
+    return Response(content=payload.encode(encoding, **values), media_type="application/json", headers=headers)
+
+
+def response_format(request: Request, requested: Optional[str]) -> str:
+    """Format negotiated from ?format= and the Accept header ('json', 'arrow' or 'parquet')."""
+    try:
+        fmt = columnar_export.negotiate_format(requested, request.headers.get("accept"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if fmt != "json" and not columnar_export.ARROW_AVAILABLE:
+        raise HTTPException(status_code=406, detail="Arrow and Parquet output require pyarrow")
+    return fmt
+
+
+def columnar_response(df, fmt: str, filename: str) -> Response:
+    """Encode a DataFrame as an Arrow IPC stream or Parquet file response."""
+    return Response(
+        content=columnar_export.encode(df, fmt),
+        media_type=columnar_export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
+
+
+def snapshot_body(market_data) -> dict:
+    """JSON body of /api/market/snapshot; age and staleness are filled per request."""
+    return {
+        "indices": {
+            "masi": float(market_data.indices.masi),
+            "masi_change": float(market_data.indices.masi_change),
+            "masi_volume": market_data.indices.masi_volume,
+            "madex": float(market_data.indices.madex),
+            "madex_change": float(market_data.indices.madex_change),
+            "madex_volume": market_data.indices.madex_volume,
+            "market_status": market_data.indices.market_status,
+            "timestamp": market_data.indices.timestamp.isoformat(),
+            "source": market_data.indices.source
+        },
+        "stocks": market_data.frame.to_records(),
+        "data_quality": market_data.data_quality,
+        "fetch_metadata": {
+            **market_data.fetch_metadata,
+            "snapshot_age_seconds": VersionedPayload.slot("snapshot_age_seconds"),
+            "stale": VersionedPayload.slot("stale")
+        }
+    }
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -201,6 +308,7 @@ async def health_check():
         return {
             "status": "healthy",
             "pipeline": status,
+            "stream": broadcaster.get_status(),
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -209,10 +317,13 @@ async def health_check():
 
 
 @app.get("/api/market/snapshot")
-async def get_market_snapshot(force_refresh: bool = False, use_mock: bool = True):
+async def get_market_snapshot(request: Request, force_refresh: bool = False, use_mock: bool = True):
     """
     Get complete market snapshot including indices and stocks.
     
+    The body is serialized once per snapshot version and sent with an ETag;
+    clients revalidating with If-None-Match get 304 until the data changes.
+    
     Query params:
         force_refresh: Force refresh data from sources (default: false)
         use_mock: Use mock data directly (default: true for faster loading)
@@ -220,88 +331,224 @@ async def get_market_snapshot(force_refresh: bool = False, use_mock: bool = True
     # Use mock data by default for faster response
     if use_mock:
         logger.info("Returning mock data (use_mock=True)")
-        return get_mock_market_data()
+        return versioned_response(request, MOCK_PAYLOAD)
     
     try:
         logger.info(f"Fetching market snapshot (force_refresh={force_refresh})")
         
         # Try to fetch real data, fallback to mock if it fails
         try:
-            market_data = pipeline.fetch_market_snapshot(force_refresh=force_refresh)
+            market_data = await pipeline.fetch_market_snapshot_async(force_refresh=force_refresh)
         except Exception as real_data_error:
             logger.warning(f"Failed to fetch real data: {real_data_error}")
             logger.info("Returning mock data for demonstration")
             
-            # Return mock data
-            from datetime import timezone
-            from decimal import Decimal
-            
-            return get_mock_market_data()
+            return versioned_response(request, MOCK_PAYLOAD)
         
+        metadata = market_data.fetch_metadata
+        payload = payload_cache.get("snapshot", metadata.get("snapshot_version"), lambda: snapshot_body(market_data))
         
-        # Convert to JSON-serializable format
-        return {
-            "indices": {
-                "masi": float(market_data.indices.masi),
-                "masi_change": float(market_data.indices.masi_change),
-                "masi_volume": market_data.indices.masi_volume,
-                "madex": float(market_data.indices.madex),
-                "madex_change": float(market_data.indices.madex_change),
-                "madex_volume": market_data.indices.madex_volume,
-                "market_status": market_data.indices.market_status,
-                "timestamp": market_data.indices.timestamp.isoformat(),
-                "source": market_data.indices.source
-            },
-            "stocks": [
-                {
-                    "symbol": stock.symbol,
-                    "name": stock.name,
-                    "price": float(stock.price),
-                    "open": float(stock.open) if stock.open else None,
-                    "high": float(stock.high) if stock.high else None,
-                    "low": float(stock.low) if stock.low else None,
-                    "close": float(stock.close) if stock.close else None,
-                    "volume": stock.volume,
-                    "change": float(stock.change),
-                    "change_percent": float(stock.change_percent),
-                    "market_cap": float(stock.market_cap) if stock.market_cap else None,
-                    "sector": stock.sector,
-                    "pe_ratio": float(stock.pe_ratio) if stock.pe_ratio else None,
-                    "dividend_yield": float(stock.dividend_yield) if stock.dividend_yield else None,
-                    "timestamp": stock.timestamp.isoformat(),
-                    "source": stock.source
-                }
-                for stock in market_data.stocks
-            ],
-            "data_quality": market_data.data_quality,
-            "fetch_metadata": market_data.fetch_metadata
-        }
+        return versioned_response(
+            request,
+            payload,
+            snapshot_age_seconds=metadata.get("snapshot_age_seconds"),
+            stale=metadata.get("stale")
+        )
     except Exception as e:
         logger.error(f"Error fetching market snapshot: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/market/delta")
+async def get_market_delta(request: Request, since: int):
+    """
+    Get what changed since a snapshot version the client already holds.
+    
+    Returns the changed index values and, per added or changed stock, its
+    symbol, timestamp and changed fields, plus removed symbols. When
+    `since` is no longer kept by the pipeline the full snapshot is sent
+    instead, marked with "full": true.
+    
+    Query params:
+        since: fetch_metadata.snapshot_version from an earlier response
+    """
+    try:
+        market_data = await pipeline.fetch_market_snapshot_async()
+        metadata = market_data.fetch_metadata
+        version = metadata.get("snapshot_version")
+        
+        delta = pipeline.get_snapshot_delta(since)
+        if delta is None:
+            payload = payload_cache.get(
+                "delta_full",
+                version,
+                lambda: {**snapshot_body(market_data), "full": True, "version": version}
+            )
+        else:
+            payload = VersionedPayload(f"{since}-{delta['version']}", {
+                **delta,
+                "full": False,
+                "fetch_metadata": {
+                    **metadata,
+                    "snapshot_age_seconds": VersionedPayload.slot("snapshot_age_seconds"),
+                    "stale": VersionedPayload.slot("stale")
+                }
+            })
+        
+        return versioned_response(
+            request,
+            payload,
+            snapshot_age_seconds=metadata.get("snapshot_age_seconds"),
+            stale=metadata.get("stale")
+        )
+    except Exception as e:
+        logger.error(f"Error computing market delta: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def parse_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated query parameter."""
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+async def initial_update(subscription) -> Optional[dict]:
+    """Current state of the market, trimmed to a subscription."""
+    market_data = await pipeline.fetch_market_snapshot_async()
+    return subscription.filter(
+        MarketBroadcaster.snapshot_message(market_data),
+        MarketBroadcaster.sector_lookup(market_data)
+    )
+
+
+@app.get("/api/stream/market")
+async def stream_market(request: Request, symbols: Optional[str] = None, sectors: Optional[str] = None):
+    """
+    Server-sent events with market updates.
+    
+    The first event carries the current state ("full": true); each later
+    event carries only what changed in a new snapshot for the followed
+    stocks, in the /api/market/delta format.
+    
+    Query params:
+        symbols: Comma-separated symbols to follow
+        sectors: Comma-separated sectors to follow (no filter = all stocks)
+    """
+    subscription = broadcaster.subscribe(parse_list(symbols), parse_list(sectors))
+    
+    async def events():
+        try:
+            update = await initial_update(subscription)
+            while True:
+                if update is not None:
+                    yield b"id: %d\nevent: market\ndata: %s\n\n" % (update["version"], dumps(update))
+                
+                if await request.is_disconnected():
+                    break
+                try:
+                    update = await asyncio.wait_for(subscription.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    update = None
+                    yield b": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/ws/market")
+async def market_websocket(websocket: WebSocket, symbols: Optional[str] = None, sectors: Optional[str] = None):
+    """
+    WebSocket with market updates (same messages as /api/stream/market).
+    
+    The filter can be changed at any time by sending
+    {"symbols": [...], "sectors": [...]}; the current state of the new
+    selection is sent back before further updates.
+    """
+    await websocket.accept()
+    subscription = broadcaster.subscribe(parse_list(symbols), parse_list(sectors))
+    
+    async def send(update: Optional[dict]):
+        if update is not None:
+            await websocket.send_text(dumps(update).decode("utf-8"))
+    
+    async def receive_filters():
+        while True:
+            message = await websocket.receive_json()
+            subscription.update_filter(message.get("symbols"), message.get("sectors"))
+            await send(await initial_update(subscription))
+    
+    receiver = asyncio.create_task(receive_filters())
+    try:
+        await send(await initial_update(subscription))
+        while not receiver.done():
+            getter = asyncio.ensure_future(subscription.get())
+            await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                await send(getter.result())
+            else:
+                getter.cancel()
+        receiver.result()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Market websocket error: {e}")
+    finally:
+        receiver.cancel()
+        broadcaster.unsubscribe(subscription)
+
+
 @app.get("/api/stocks")
-async def get_all_stocks():
-    """Get list of all stocks."""
+async def get_all_stocks(request: Request, output_format: Optional[str] = Query(None, alias="format")):
+    """
+    Get list of all stocks.
+    
+    Query params:
+        format: json (default), arrow or parquet; the Accept header
+            (application/vnd.apache.arrow.stream, application/vnd.apache.parquet)
+            is used when omitted
+    """
+    fmt = response_format(request, output_format)
     try:
-        df = pipeline.get_stocks_dataframe()
+        market_data = await pipeline.fetch_market_snapshot_async()
         
-        if df.empty:
-            return {"stocks": []}
+        if fmt != "json":
+            return columnar_response(market_data.frame.to_dataframe(copy=False), fmt, "stocks")
         
-        # Convert DataFrame to list of dicts
-        stocks = df.to_dict('records')
+        payload = payload_cache.get(
+            "stocks",
+            market_data.fetch_metadata.get("snapshot_version"),
+            lambda: {"stocks": market_data.frame.to_records()}
+        )
+        return versioned_response(request, payload)
+    except Exception as e:
+        logger.error(f"Error fetching stocks: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/stocks/batch")
+async def get_stocks_batch(symbols: str):
+    """
+    Get several stocks in one request.
+    
+    Query params:
+        symbols: Comma-separated stock symbols (e.g. ATW,BCP,IAM)
+    """
+    try:
+        market_data = await pipeline.fetch_market_snapshot_async()
         
-        # Convert Decimal to float
-        for stock in stocks:
-            for key, value in stock.items():
-                if hasattr(value, '__float__'):
-                    stock[key] = float(value)
+        requested = [s.strip() for s in symbols.split(",") if s.strip()]
+        frame = market_data.frame
         
-        return {"stocks": stocks}
+        return {
+            "stocks": [frame.record(s) for s in requested if s in frame],
+            "not_found": [s for s in requested if s not in frame]
+        }
     except Exception as e:
-        logger.error(f"Error fetching stocks: {e}")
+        logger.error(f"Error fetching stocks batch: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -309,32 +556,14 @@ async def get_all_stocks():
 async def get_stock_detail(symbol: str):
     """Get detailed information for a specific stock."""
     try:
-        market_data = pipeline.fetch_market_snapshot()
-        
-        # Find the stock
-        stock = next((s for s in market_data.stocks if s.symbol == symbol), None)
+        # Served from the cached snapshot; O(1) lookup through its symbol index
+        market_data = await pipeline.fetch_market_snapshot_async()
+        stock = market_data.frame.record(symbol)
         
         if not stock:
             raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
         
-        return {
-            "symbol": stock.symbol,
-            "name": stock.name,
-            "price": float(stock.price),
-            "open": float(stock.open) if stock.open else None,
-            "high": float(stock.high) if stock.high else None,
-            "low": float(stock.low) if stock.low else None,
-            "close": float(stock.close) if stock.close else None,
-            "volume": stock.volume,
-            "change": float(stock.change),
-            "change_percent": float(stock.change_percent),
-            "market_cap": float(stock.market_cap) if stock.market_cap else None,
-            "sector": stock.sector,
-            "pe_ratio": float(stock.pe_ratio) if stock.pe_ratio else None,
-            "dividend_yield": float(stock.dividend_yield) if stock.dividend_yield else None,
-            "timestamp": stock.timestamp.isoformat(),
-            "source": stock.source
-        }
+        return stock
     except HTTPException:
         raise
     except Exception as e:
@@ -343,12 +572,13 @@ async def get_stock_detail(symbol: str):
 
 
 @app.get("/api/indices/masi/history")
-async def get_masi_history(period: str = "1mo"):
+async def get_masi_history(period: str = "1mo", max_points: Optional[int] = Query(None, ge=3)):
     """
     Get historical MASI index data (mock data for now).
     
     Query params:
         period: Time period (1mo, 3mo, 6mo, 1y)
+        max_points: Downsample to at most this many points (LTTB on value)
     """
     try:
         logger.info(f"Fetching MASI history (period={period})")
@@ -376,6 +606,10 @@ async def get_masi_history(period: str = "1mo"):
                 "low": round(value - random.uniform(10, 30), 2)
             })
         
+        if max_points and len(history) > max_points:
+            values = [point["value"] for point in history]
+            history = [history[i] for i in lttb_indices(np.arange(len(values)), values, max_points).tolist()]
+        
         return {"history": history, "period": period}
     except Exception as e:
         logger.error(f"Error fetching MASI history: {e}")
@@ -384,9 +618,13 @@ async def get_masi_history(period: str = "1mo"):
 
 @app.get("/api/stocks/{symbol}/history")
 async def get_stock_history(
+    request: Request,
     symbol: str,
     period: str = "1mo",
-    interval: str = "1d"
+    interval: str = "1d",
+    layout: str = "rows",
+    max_points: Optional[int] = Query(None, ge=3),
+    output_format: Optional[str] = Query(None, alias="format")
 ):
     """
     Get historical data for a stock.
@@ -394,10 +632,36 @@ async def get_stock_history(
     Query params:
         period: Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max)
         interval: Data interval (1m, 5m, 15m, 30m, 1h, 1d, 1wk, 1mo)
+        layout: JSON shape; rows (default, one record per bar) or columnar
+            (parallel arrays with epoch-millisecond timestamps)
+        max_points: Downsample to at most this many bars (LTTB on close),
+            keeping the chart's shape while bounding the payload
+        format: json (default), arrow or parquet (or via the Accept header)
     """
+    fmt = response_format(request, output_format)
+    if layout not in ("rows", "columnar"):
+        raise HTTPException(status_code=400, detail=f"Unknown layout '{layout}' (expected rows or columnar)")
+    
     try:
         logger.info(f"Fetching history for {symbol} (period={period}, interval={interval})")
-        hist_df = pipeline.fetch_historical_data(symbol, period=period, interval=interval)
+        hist_df = await pipeline.fetch_historical_data_async(symbol, period=period, interval=interval)
+        if max_points:
+            hist_df = downsample_frame(hist_df, max_points)
+        
+        if fmt != "json":
+            return columnar_response(hist_df, fmt, f"{symbol}_{period}_{interval}")
+        
+        if layout == "columnar":
+            return Response(
+                content=dumps({
+                    "symbol": symbol,
+                    "period": period,
+                    "interval": interval,
+                    "layout": "columnar",
+                    "history": columnar_export.json_columns(hist_df)
+                }),
+                media_type="application/json"
+            )
         
         if hist_df.empty:
             return {"history": [], "symbol": symbol}
@@ -428,38 +692,212 @@ async def get_stock_history(
 
 
 @app.get("/api/sectors")
-async def get_sector_performance():
+async def get_sector_performance(request: Request):
     """Get sector-wise performance statistics."""
     try:
-        df = pipeline.get_stocks_dataframe()
-        
-        if df.empty or 'sector' not in df.columns:
-            return {"sectors": []}
-        
-        # Group by sector
-        sector_stats = df.groupby('sector').agg({
-            'symbol': 'count',
-            'change_percent': 'mean',
-            'volume': 'sum'
-        }).reset_index()
-        
-        sector_stats.columns = ['sector', 'stock_count', 'avg_change', 'total_volume']
-        
-        # Convert to records
-        sectors = sector_stats.to_dict('records')
+        market_data = await pipeline.fetch_market_snapshot_async()
+        payload = payload_cache.get(
+            "sectors",
+            market_data.fetch_metadata.get("snapshot_version"),
+            lambda: {"sectors": market_data.frame.sector_summary()}
+        )
+        return versioned_response(request, payload)
+    except Exception as e:
+        logger.error(f"Error fetching sector performance: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/sectors/{sector}/stocks")
+async def get_sector_stocks(sector: str):
+    """Get all stocks in a sector."""
+    try:
+        market_data = await pipeline.fetch_market_snapshot_async()
+        stocks = market_data.stocks_in_sector(sector)
         
-        # Convert numeric types
-        for sector in sectors:
-            for key, value in sector.items():
-                if hasattr(value, '__float__'):
-                    sector[key] = float(value)
+        if not stocks:
+            raise HTTPException(status_code=404, detail=f"Sector {sector} not found")
         
-        return {"sectors": sectors}
+        return {"sector": sector, "stocks": [market_data.frame.record(stock.symbol) for stock in stocks]}
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching sector performance: {e}")
+        logger.error(f"Error fetching stocks for sector {sector}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/analytics/correlation")
+async def get_correlation_matrix(
+    request: Request,
+    window: int = Query(CorrelationEngine.DEFAULT_WINDOW, ge=5, le=CorrelationEngine.MAX_WINDOW),
+    symbols: Optional[str] = None
+):
+    """
+    Pairwise correlation of daily returns across the universe.
+    
+    Returns are synced once per trading day and the matrix is kept up to
+    date incrementally, so repeat requests are served from cache (with an
+    ETag per trading day and window).
+    
+    Query params:
+        window: Lookback in trading days (5-250, default 60)
+        symbols: Comma-separated subset, in the order wanted (default: every
+            symbol with history)
+    """
+    try:
+        universe, matrix = await pipeline.get_correlation_matrix_async(window)
+        if not universe:
+            raise HTTPException(status_code=503, detail="No return history available")
+        
+        as_of = pipeline.correlation_engine.as_of.date().isoformat()
+        requested = parse_list(symbols)
+        if not requested:
+            payload = payload_cache.get(
+                ("correlation", window),
+                as_of,
+                lambda: {"as_of": as_of, "window": window, "symbols": universe, "matrix": matrix_json(matrix)}
+            )
+            return versioned_response(request, payload)
+        
+        missing = [symbol for symbol in requested if symbol not in universe]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"No return history for {', '.join(missing)}")
+        
+        positions = [universe.index(symbol) for symbol in requested]
+        return {
+            "as_of": as_of,
+            "window": window,
+            "symbols": requested,
+            "matrix": matrix_json(matrix[np.ix_(positions, positions)])
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing correlation matrix: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/analytics/correlation/{first}/{second}")
+async def get_pair_correlation(
+    first: str,
+    second: str,
+    window: int = Query(CorrelationEngine.DEFAULT_WINDOW, ge=5, le=CorrelationEngine.MAX_WINDOW)
+):
+    """
+    Rolling correlation of two stocks' daily returns.
+    
+    Query params:
+        window: Lookback in trading days (5-250, default 60)
+    """
+    try:
+        series = await pipeline.get_pair_correlation_async(first, second, window)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"No return history for {e.args[0]}")
+    except Exception as e:
+        logger.error(f"Error computing correlation of {first}/{second}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return Response(
+        content=dumps({
+            "symbols": [first, second],
+            "window": window,
+            "correlation": round(float(series.iloc[-1]), 4) if len(series) else None,
+            "history": columnar_export.json_columns(series.round(4).to_frame())
+        }),
+        media_type="application/json"
+    )
+
+
+# Risk Models
+class RiskRequest(BaseModel):
+    weights: Dict[str, float]
+    confidence: float = Field(0.95, gt=0.5, lt=1)
+    horizon_days: int = Field(1, ge=1, le=60)
+    lookback: int = Field(RiskModel.LOOKBACK, ge=30, le=2 * CorrelationEngine.MAX_WINDOW)
+    simulations: int = Field(100_000, ge=1_000, le=1_000_000)
+    portfolio_value: Optional[float] = Field(None, gt=0)
+    seed: Optional[int] = None
+
+
+# Cap on simulations x horizon_days, so one request cannot tie up a worker thread
+MAX_SIMULATED_DAYS = 10_000_000
+
+
+# Covariance estimates per lookback, with the (last date, symbols) of the returns they came
+# from; re-estimated when a new trading day arrives or the universe changes
+risk_models: Dict[int, Tuple[tuple, RiskModel]] = {}
+
+
+async def risk_model(lookback: int) -> RiskModel:
+    """Risk model for the latest returns, estimated once per trading day, universe and lookback."""
+    returns = await pipeline.get_daily_returns_async()
+    if returns.empty:
+        raise HTTPException(status_code=503, detail="No return history available")
+    
+    signature = (returns.index[-1], tuple(returns.columns))
+    cached = risk_models.get(lookback)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    loop = asyncio.get_running_loop()
+    model = await loop.run_in_executor(None, RiskModel, returns, lookback)
+    risk_models[lookback] = (signature, model)
+    return model
+
+
+@app.post("/api/analytics/risk")
+async def get_portfolio_risk(request: RiskRequest):
+    """
+    Value at Risk and CVaR (expected shortfall) of a portfolio.
+    
+    Weights are fractions of portfolio value per symbol (negative for
+    short positions). Historical, parametric (normal) and Monte Carlo
+    estimates are returned as positive loss fractions, plus amounts when
+    portfolio_value is given.
+    """
+    if not request.weights:
+        raise HTTPException(status_code=400, detail="weights must name at least one symbol")
+    if request.simulations * request.horizon_days > MAX_SIMULATED_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"simulations x horizon_days must not exceed {MAX_SIMULATED_DAYS:,}"
+        )
+    
+    model = await risk_model(request.lookback)
+    
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, functools.partial(
+            model.evaluate,
+            request.weights,
+            confidence=request.confidence,
+            horizon_days=request.horizon_days,
+            simulations=request.simulations,
+            seed=request.seed
+        ))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"No return history for {e.args[0]}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing portfolio risk: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if request.portfolio_value:
+        for method in ("historical", "parametric", "monte_carlo"):
+            result[method]["var_amount"] = result[method]["var"] * request.portfolio_value
+            result[method]["cvar_amount"] = result[method]["cvar"] * request.portfolio_value
+    
+    return {
+        "as_of": model.as_of.date().isoformat(),
+        "lookback": request.lookback,
+        "confidence": request.confidence,
+        "horizon_days": request.horizon_days,
+        "simulations": request.simulations,
+        "weights": request.weights,
+        **result
+    }
+
+
 # Chatbot Models
 class ChatMessage(BaseModel):
     role: str
@@ -485,7 +923,7 @@ async def chat_with_ai(request: ChatRequest):
     try:
         # System prompt for Bourse de Casablanca expert
         system_prompt = """You are an expert AI assistant specializing in the Moroccan stock market (Bourse de Casablanca).
-        
+
 Your knowledge includes:
 - Bourse de Casablanca structure and operations
 - MASI (Moroccan All Shares Index) and MADEX indices
@@ -497,7 +935,7 @@ Your knowledge includes:
 Provide clear, accurate, and helpful responses. When discussing specific stocks or investment strategies, always remind users to do their own research and consult with financial advisors.
 
 Keep responses concise (2-3 paragraphs max) unless asked for detailed explanations."""
-
+        
         # Build conversation history
         messages = [{"role": "system", "content": system_prompt}]
         
@@ -11,7 +11,12 @@ License: MIT
 """
 
 from .pipeline import MarketDataPipeline
+from .async_pipeline import AsyncMarketDataPipeline
 from .schemas import StockData, MarketIndices, UnifiedMarketData
+from .universe import SymbolUniverse, Listing
 
-__all__ = ['MarketDataPipeline', 'StockData', 'MarketIndices', 'UnifiedMarketData']
+__all__ = [
+    'MarketDataPipeline', 'AsyncMarketDataPipeline', 'StockData', 'MarketIndices', 'UnifiedMarketData',
+    'SymbolUniverse', 'Listing'
+]
 __version__ = '1.0.0'
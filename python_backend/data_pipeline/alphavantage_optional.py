@@ -13,11 +13,16 @@ Features:
 
 import logging
 from typing import Optional, Dict
-from decimal import Decimal
 import requests
 import pandas as pd
 
-from .schemas import TechnicalIndicators
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from .schemas import TechnicalIndicators, NumericMode, to_number
 
 logger = logging.getLogger(__name__)
 
@@ -32,16 +37,18 @@ class AlphaVantageClient:
     
     BASE_URL = "https://www.alphavantage.co/query"
     
-    def __init__(self, api_key: Optional[str] = None, timeout: int = 10):
+    def __init__(self, api_key: Optional[str] = None, timeout: int = 10, numeric_mode: NumericMode = 'float'):
         """
         Initialize Alpha Vantage client.
         
         Args:
             api_key: Alpha Vantage API key (optional)
             timeout: Request timeout in seconds
+            numeric_mode: 'float' or 'decimal' representation of indicator values
         """
         self.api_key = api_key
         self.timeout = timeout
+        self.numeric_mode = numeric_mode
         self.enabled = api_key is not None
         
         if not self.enabled:
@@ -72,18 +79,7 @@ class AlphaVantageClient:
             response = requests.get(self.BASE_URL, params=params, timeout=self.timeout)
             response.raise_for_status()
             
-            data = response.json()
-            
-            # Check for API errors
-            if 'Error Message' in data:
-                logger.error(f"Alpha Vantage API error: {data['Error Message']}")
-                return None
-            
-            if 'Note' in data:
-                logger.warning(f"Alpha Vantage rate limit: {data['Note']}")
-                return None
-            
-            return data
+            return self._check_response(response.json())
             
         except requests.RequestException as e:
             logger.error(f"Error calling Alpha Vantage API: {e}")
@@ -92,28 +88,59 @@ class AlphaVantageClient:
             logger.error(f"Unexpected error with Alpha Vantage: {e}")
             return None
     
-    def fetch_rsi(self, symbol: str, interval: str = 'daily', time_period: int = 14) -> Optional[float]:
-        """
-        Fetch RSI (Relative Strength Index) from Alpha Vantage.
+    def _check_response(self, data: dict) -> Optional[dict]:
+        """Return the payload, or None if Alpha Vantage reported an error."""
+        if 'Error Message' in data:
+            logger.error(f"Alpha Vantage API error: {data['Error Message']}")
+            return None
         
-        Args:
-            symbol: Stock symbol
-            interval: Time interval (daily, weekly, monthly)
-            time_period: Number of periods for RSI calculation
+        if 'Note' in data:
+            logger.warning(f"Alpha Vantage rate limit: {data['Note']}")
+            return None
         
-        Returns:
-            Current RSI value or None
-        """
-        params = {
+        return data
+    
+    @staticmethod
+    def _rsi_params(symbol: str, interval: str, time_period: int) -> dict:
+        return {
             'function': 'RSI',
             'symbol': symbol,
             'interval': interval,
             'time_period': time_period,
             'series_type': 'close'
         }
-        
-        data = self._make_request(params)
-        
+    
+    @staticmethod
+    def _macd_params(symbol: str, interval: str) -> dict:
+        return {
+            'function': 'MACD',
+            'symbol': symbol,
+            'interval': interval,
+            'series_type': 'close'
+        }
+    
+    @staticmethod
+    def _bbands_params(symbol: str, interval: str) -> dict:
+        return {
+            'function': 'BBANDS',
+            'symbol': symbol,
+            'interval': interval,
+            'time_period': 20,
+            'series_type': 'close'
+        }
+    
+    @staticmethod
+    def _sma_params(symbol: str, time_period: int, interval: str) -> dict:
+        return {
+            'function': 'SMA',
+            'symbol': symbol,
+            'interval': interval,
+            'time_period': time_period,
+            'series_type': 'close'
+        }
+    
+    def _parse_rsi(self, symbol: str, data: Optional[dict]) -> Optional[float]:
+        """Extract the latest RSI value from an Alpha Vantage response."""
         if not data or 'Technical Analysis: RSI' not in data:
             return None
         
@@ -129,26 +156,8 @@ class AlphaVantageClient:
             logger.error(f"Error parsing RSI data: {e}")
             return None
     
-    def fetch_macd(self, symbol: str, interval: str = 'daily') -> Optional[Dict[str, float]]:
-        """
-        Fetch MACD (Moving Average Convergence Divergence).
-        
-        Args:
-            symbol: Stock symbol
-            interval: Time interval
-        
-        Returns:
-            Dictionary with MACD, signal, and histogram values
-        """
-        params = {
-            'function': 'MACD',
-            'symbol': symbol,
-            'interval': interval,
-            'series_type': 'close'
-        }
-        
-        data = self._make_request(params)
-        
+    def _parse_macd(self, symbol: str, data: Optional[dict]) -> Optional[Dict[str, float]]:
+        """Extract the latest MACD values from an Alpha Vantage response."""
         if not data or 'Technical Analysis: MACD' not in data:
             return None
         
@@ -170,27 +179,8 @@ class AlphaVantageClient:
             logger.error(f"Error parsing MACD data: {e}")
             return None
     
-    def fetch_bollinger_bands(self, symbol: str, interval: str = 'daily') -> Optional[Dict[str, float]]:
-        """
-        Fetch Bollinger Bands.
-        
-        Args:
-            symbol: Stock symbol
-            interval: Time interval
-        
-        Returns:
-            Dictionary with upper, middle, and lower band values
-        """
-        params = {
-            'function': 'BBANDS',
-            'symbol': symbol,
-            'interval': interval,
-            'time_period': 20,
-            'series_type': 'close'
-        }
-        
-        data = self._make_request(params)
-        
+    def _parse_bollinger_bands(self, symbol: str, data: Optional[dict]) -> Optional[Dict[str, float]]:
+        """Extract the latest Bollinger Bands from an Alpha Vantage response."""
         if not data or 'Technical Analysis: BBANDS' not in data:
             return None
         
@@ -212,28 +202,8 @@ class AlphaVantageClient:
             logger.error(f"Error parsing Bollinger Bands data: {e}")
             return None
     
-    def fetch_sma(self, symbol: str, time_period: int = 50, interval: str = 'daily') -> Optional[float]:
-        """
-        Fetch Simple Moving Average.
-        
-        Args:
-            symbol: Stock symbol
-            time_period: Number of periods
-            interval: Time interval
-        
-        Returns:
-            SMA value or None
-        """
-        params = {
-            'function': 'SMA',
-            'symbol': symbol,
-            'interval': interval,
-            'time_period': time_period,
-            'series_type': 'close'
-        }
-        
-        data = self._make_request(params)
-        
+    def _parse_sma(self, symbol: str, time_period: int, data: Optional[dict]) -> Optional[float]:
+        """Extract the latest SMA value from an Alpha Vantage response."""
         if not data or 'Technical Analysis: SMA' not in data:
             return None
         
@@ -249,6 +219,88 @@ class AlphaVantageClient:
             logger.error(f"Error parsing SMA data: {e}")
             return None
     
+    def fetch_rsi(self, symbol: str, interval: str = 'daily', time_period: int = 14) -> Optional[float]:
+        """
+        Fetch RSI (Relative Strength Index) from Alpha Vantage.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Time interval (daily, weekly, monthly)
+            time_period: Number of periods for RSI calculation
+        
+        Returns:
+            Current RSI value or None
+        """
+        data = self._make_request(self._rsi_params(symbol, interval, time_period))
+        return self._parse_rsi(symbol, data)
+    
+    def fetch_macd(self, symbol: str, interval: str = 'daily') -> Optional[Dict[str, float]]:
+        """
+        Fetch MACD (Moving Average Convergence Divergence).
+        
+        Args:
+            symbol: Stock symbol
+            interval: Time interval
+        
+        Returns:
+            Dictionary with MACD, signal, and histogram values
+        """
+        data = self._make_request(self._macd_params(symbol, interval))
+        return self._parse_macd(symbol, data)
+    
+    def fetch_bollinger_bands(self, symbol: str, interval: str = 'daily') -> Optional[Dict[str, float]]:
+        """
+        Fetch Bollinger Bands.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Time interval
+        
+        Returns:
+            Dictionary with upper, middle, and lower band values
+        """
+        data = self._make_request(self._bbands_params(symbol, interval))
+        return self._parse_bollinger_bands(symbol, data)
+    
+    def fetch_sma(self, symbol: str, time_period: int = 50, interval: str = 'daily') -> Optional[float]:
+        """
+        Fetch Simple Moving Average.
+        
+        Args:
+            symbol: Stock symbol
+            time_period: Number of periods
+            interval: Time interval
+        
+        Returns:
+            SMA value or None
+        """
+        data = self._make_request(self._sma_params(symbol, time_period, interval))
+        return self._parse_sma(symbol, time_period, data)
+    
+    def _build_indicators(
+        self,
+        symbol: str,
+        rsi: Optional[float],
+        macd_data: Optional[Dict[str, float]],
+        bbands: Optional[Dict[str, float]],
+        sma_20: Optional[float],
+        sma_50: Optional[float],
+        sma_200: Optional[float]
+    ) -> TechnicalIndicators:
+        """Assemble a TechnicalIndicators object from individual indicator values."""
+        mode = self.numeric_mode
+        return TechnicalIndicators(
+            symbol=symbol,
+            rsi=to_number(rsi, mode) if rsi else None,
+            sma_20=to_number(sma_20, mode) if sma_20 else None,
+            sma_50=to_number(sma_50, mode) if sma_50 else None,
+            sma_200=to_number(sma_200, mode) if sma_200 else None,
+            macd=to_number(macd_data['macd'], mode) if macd_data else None,
+            macd_signal=to_number(macd_data['signal'], mode) if macd_data else None,
+            bollinger_upper=to_number(bbands['upper'], mode) if bbands else None,
+            bollinger_lower=to_number(bbands['lower'], mode) if bbands else None
+        )
+    
     def fetch_all_indicators(self, symbol: str) -> Optional[TechnicalIndicators]:
         """
         Fetch comprehensive technical indicators for a symbol.
@@ -272,17 +324,78 @@ class AlphaVantageClient:
         sma_50 = self.fetch_sma(symbol, time_period=50)
         sma_200 = self.fetch_sma(symbol, time_period=200)
         
-        # Create TechnicalIndicators object
-        indicators = TechnicalIndicators(
-            symbol=symbol,
-            rsi=Decimal(str(rsi)) if rsi else None,
-            sma_20=Decimal(str(sma_20)) if sma_20 else None,
-            sma_50=Decimal(str(sma_50)) if sma_50 else None,
-            sma_200=Decimal(str(sma_200)) if sma_200 else None,
-            macd=Decimal(str(macd_data['macd'])) if macd_data else None,
-            macd_signal=Decimal(str(macd_data['signal'])) if macd_data else None,
-            bollinger_upper=Decimal(str(bbands['upper'])) if bbands else None,
-            bollinger_lower=Decimal(str(bbands['lower'])) if bbands else None
-        )
+        return self._build_indicators(symbol, rsi, macd_data, bbands, sma_20, sma_50, sma_200)
+
+
+class AsyncAlphaVantageClient(AlphaVantageClient):
+    """
+    Asyncio variant of the Alpha Vantage client built on httpx.
+    
+    Shares parameter building and response parsing with AlphaVantageClient;
+    only the transport differs.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncAlphaVantageClient")
+        
+        self.client = httpx.AsyncClient(timeout=self.timeout)
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+    
+    async def _make_request(self, params: dict) -> Optional[dict]:
+        """Make an async API request to Alpha Vantage."""
+        if not self.enabled:
+            logger.debug("Alpha Vantage is disabled")
+            return None
+        
+        try:
+            params['apikey'] = self.api_key
+            response = await self.client.get(self.BASE_URL, params=params)
+            response.raise_for_status()
+            
+            return self._check_response(response.json())
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error calling Alpha Vantage API: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error with Alpha Vantage: {e}")
+            return None
+    
+    async def fetch_rsi(self, symbol: str, interval: str = 'daily', time_period: int = 14) -> Optional[float]:
+        data = await self._make_request(self._rsi_params(symbol, interval, time_period))
+        return self._parse_rsi(symbol, data)
+    
+    async def fetch_macd(self, symbol: str, interval: str = 'daily') -> Optional[Dict[str, float]]:
+        data = await self._make_request(self._macd_params(symbol, interval))
+        return self._parse_macd(symbol, data)
+    
+    async def fetch_bollinger_bands(self, symbol: str, interval: str = 'daily') -> Optional[Dict[str, float]]:
+        data = await self._make_request(self._bbands_params(symbol, interval))
+        return self._parse_bollinger_bands(symbol, data)
+    
+    async def fetch_sma(self, symbol: str, time_period: int = 50, interval: str = 'daily') -> Optional[float]:
+        data = await self._make_request(self._sma_params(symbol, time_period, interval))
+        return self._parse_sma(symbol, time_period, data)
+    
+    async def fetch_all_indicators(self, symbol: str) -> Optional[TechnicalIndicators]:
+        """Fetch comprehensive technical indicators for a symbol without blocking."""
+        if not self.enabled:
+            return None
+        
+        logger.info(f"Fetching all technical indicators for {symbol}")
+        
+        # Sequential on purpose: the free tier allows 5 calls per minute
+        rsi = await self.fetch_rsi(symbol)
+        macd_data = await self.fetch_macd(symbol)
+        bbands = await self.fetch_bollinger_bands(symbol)
+        sma_20 = await self.fetch_sma(symbol, time_period=20)
+        sma_50 = await self.fetch_sma(symbol, time_period=50)
+        sma_200 = await self.fetch_sma(symbol, time_period=200)
         
-        return indicators
+        return self._build_indicators(symbol, rsi, macd_data, bbands, sma_20, sma_50, sma_200)
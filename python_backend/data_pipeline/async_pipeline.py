@@ -0,0 +1,314 @@
+"""
+Asyncio Data Pipeline
+=====================
+
+Non-blocking counterpart of MarketDataPipeline for use inside an event loop
+(e.g. the FastAPI server). HTTP sources are awaited through httpx; sync-only
+and CPU-bound steps (yfinance, DataFrame construction) run in an executor.
+"""
+
+import asyncio
+import logging
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from .schemas import StockData, MarketIndices, UnifiedMarketData, TechnicalIndicators
+from .casablanca_source import AsyncCasablancaBourseClient
+from .yahoo_fallback import AsyncYahooFinanceFallback
+from .alphavantage_optional import AsyncAlphaVantageClient
+from .pipeline import MarketDataPipeline
+from .correlation import CorrelationEngine
+from .config import PipelineConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMarketDataPipeline(MarketDataPipeline):
+    """
+    Market data pipeline with awaitable fetch methods.
+    
+    Shares configuration, runtime state and the synchronous API with
+    MarketDataPipeline, and adds `*_async` coroutines that never block
+    the calling event loop.
+    
+    Usage:
+        pipeline = AsyncMarketDataPipeline()
+        
+        market_data = await pipeline.fetch_market_snapshot_async()
+        hist_df = await pipeline.fetch_historical_data_async('ATW', period='1y')
+        
+        await pipeline.aclose()
+    """
+    
+    def __init__(self, config: Optional[PipelineConfig] = None):
+        super().__init__(config)
+        
+        # Background refresh runs as a task on the server's event loop
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_loop_ref: Optional[asyncio.AbstractEventLoop] = None
+        self._async_refresh_wakeup: Optional[asyncio.Event] = None
+    
+    def _init_data_sources(self) -> None:
+        """Initialize sync data sources plus their async counterparts."""
+        super()._init_data_sources()
+        
+        self.async_primary_source = AsyncCasablancaBourseClient(
+            timeout=self.config.data_source.request_timeout_seconds,
+            max_retries=self.config.data_source.max_retries,
+            max_concurrent_requests=self.config.data_source.max_concurrent_requests,
+            circuit_failure_threshold=self.config.data_source.circuit_failure_threshold,
+            circuit_recovery_seconds=self.config.data_source.circuit_recovery_seconds,
+            retry_backoff_seconds=self.config.data_source.retry_backoff_seconds,
+            universe=self.universe,
+            numeric_mode=self.config.numeric_mode
+        )
+        # Sync and async clients hit the same endpoints, so they share breakers
+        self.async_primary_source.breakers = self.primary_source.breakers
+        
+        if self.fallback_source:
+            self.async_fallback_source = AsyncYahooFinanceFallback(self.fallback_source)
+        else:
+            self.async_fallback_source = None
+        
+        if self.alphavantage:
+            self.async_alphavantage = AsyncAlphaVantageClient(
+                api_key=self.config.data_source.alphavantage_api_key,
+                timeout=self.config.data_source.request_timeout_seconds,
+                numeric_mode=self.config.numeric_mode
+            )
+        else:
+            self.async_alphavantage = None
+    
+    async def aclose(self) -> None:
+        """Release the async HTTP clients."""
+        await self.async_primary_source.aclose()
+        if self.async_alphavantage:
+            await self.async_alphavantage.aclose()
+    
+    async def fetch_market_snapshot_async(self, force_refresh: bool = False) -> UnifiedMarketData:
+        """
+        Fetch complete market snapshot without blocking the event loop.
+        
+        Args:
+            force_refresh: Force refresh even if cached data is available
+        
+        Returns:
+            UnifiedMarketData object containing indices, stocks, and metadata
+        """
+        cached = self._get_cached_snapshot(force_refresh)
+        if cached is not None:
+            return cached
+        
+        # Concurrent callers (sync or async) share one in-flight fetch
+        return await self._inflight.do_async(self.SNAPSHOT_KEY, self._fetch_snapshot_async)
+    
+    async def _fetch_snapshot_async(self) -> UnifiedMarketData:
+        """Fetch a new snapshot from the async data sources, bypassing the cache."""
+        logger.info("Fetching market snapshot (async)")
+        start_time = datetime.now()
+        
+        if self.universe.needs_refresh() and self.async_primary_source.is_available():
+            await self._refresh_universe_async()
+        
+        # Try primary source first
+        indices, stocks, source_used = await self._fetch_from_primary_async()
+        
+        # Fallback if primary fails
+        if (not stocks or not indices) and self.config.auto_fallback and self.async_fallback_source:
+            logger.warning("Primary source failed, attempting fallback")
+            indices, stocks, source_used = await self._fetch_from_fallback_async()
+        
+        # Compute (and optionally cross-check) technical indicators
+        technical_indicators = None
+        if self._indicators_enabled():
+            technical_indicators = await self._fetch_technical_indicators_async(
+                [s.symbol for s in stocks],
+                {s.symbol: float(s.price) for s in stocks}
+            ) or None
+        
+        return self._build_snapshot(indices, stocks, source_used, technical_indicators, start_time)
+    
+    async def start_background_refresh_async(self) -> None:
+        """
+        Start refreshing the snapshot as a task on the running event loop.
+        
+        Intended to be called from the FastAPI lifespan; see
+        MarketDataPipeline.start_background_refresh for the cadence.
+        """
+        if self.is_background_refresh_running():
+            return
+        
+        self._refresh_loop_ref = asyncio.get_running_loop()
+        self._async_refresh_wakeup = asyncio.Event()
+        self._refresh_task = asyncio.create_task(self._refresh_loop_async(), name='snapshot-refresher')
+        logger.info("Background snapshot refresh started")
+    
+    async def stop_background_refresh_async(self) -> None:
+        """Cancel the background refresh task and wait for it to finish."""
+        if self._refresh_task is None:
+            return
+        
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        
+        self._refresh_task = None
+        logger.info("Background snapshot refresh stopped")
+    
+    def is_background_refresh_running(self) -> bool:
+        """Check whether the thread- or task-based refresher is active."""
+        task_running = self._refresh_task is not None and not self._refresh_task.done()
+        return task_running or super().is_background_refresh_running()
+    
+    def _request_background_refresh(self) -> None:
+        """Wake the refresher; safe to call from any thread."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_loop_ref.call_soon_threadsafe(self._async_refresh_wakeup.set)
+        else:
+            super()._request_background_refresh()
+    
+    async def _refresh_loop_async(self) -> None:
+        while True:
+            try:
+                await self._inflight.do_async(self.SNAPSHOT_KEY, self._fetch_snapshot_async)
+            except Exception as e:
+                logger.error(f"Background snapshot refresh failed: {e}")
+            
+            try:
+                await asyncio.wait_for(self._async_refresh_wakeup.wait(), timeout=self._next_refresh_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._async_refresh_wakeup.clear()
+    
+    async def _refresh_universe_async(self) -> None:
+        """Reload the symbol universe from the exchange listing."""
+        self.universe.mark_attempt()
+        rows = await self.async_primary_source.fetch_listing()
+        if rows:
+            self.universe.update(rows)
+    
+    async def _fetch_from_primary_async(self) -> tuple[Optional[MarketIndices], List[StockData], str]:
+        """Fetch indices and stocks from Casablanca Bourse concurrently."""
+        try:
+            if not self.async_primary_source.is_available():
+                logger.warning("Primary source circuit open, skipping to fallback")
+                return None, [], 'none'
+            
+            logger.info("Fetching from primary source (Casablanca Bourse)")
+            
+            indices, stocks = await asyncio.gather(
+                self.async_primary_source.fetch_market_indices(),
+                self.async_primary_source.fetch_all_stocks()
+            )
+            
+            if indices and stocks:
+                logger.info(f"Successfully fetched from primary source ({len(stocks)} stocks)")
+                return indices, stocks, 'casablanca_bourse'
+            else:
+                logger.warning("Primary source returned incomplete data")
+                return None, [], 'none'
+                
+        except Exception as e:
+            logger.error(f"Error fetching from primary source: {e}")
+            return None, [], 'none'
+    
+    async def _fetch_from_fallback_async(self) -> tuple[Optional[MarketIndices], List[StockData], str]:
+        """Fetch data from fallback source (Yahoo Finance) in an executor."""
+        try:
+            logger.info("Fetching from fallback source (Yahoo Finance)")
+            
+            stocks = await self.async_fallback_source.fetch_all_stocks()
+            return self._fallback_result(stocks)
+                
+        except Exception as e:
+            logger.error(f"Error fetching from fallback source: {e}")
+            return None, [], 'none'
+    
+    async def _fetch_technical_indicators_async(
+        self,
+        symbols: List[str],
+        prices: Optional[Dict[str, float]] = None
+    ) -> Dict[str, TechnicalIndicators]:
+        """Technical indicators for a list of symbols (see _fetch_technical_indicators)."""
+        # Synced recently, or a background-thread sync while the refresher runs
+        if self._indicators_fresh() or self.is_background_refresh_running():
+            return self._fetch_technical_indicators(symbols, prices)
+        
+        logger.info(f"Syncing technical indicators for {len(symbols)} symbols")
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._advance_indicator_state, symbols)
+        
+        remote = {}
+        if self.async_alphavantage and self.async_alphavantage.is_enabled():
+            for symbol in symbols[:self.MAX_INDICATOR_SYMBOLS]:  # Limit to avoid rate limits
+                result = await self.async_alphavantage.fetch_all_indicators(symbol)
+                if result is not None:
+                    remote[symbol] = result
+        
+        self._store_indicators(symbols, remote)
+        return self._current_indicators(symbols, prices)
+    
+    async def get_stocks_dataframe_async(self) -> pd.DataFrame:
+        """
+        Get current stocks as pandas DataFrame.
+        
+        Returns:
+            DataFrame with stock data
+        """
+        if not self._cached_data or not self._cached_data.stocks:
+            logger.info("No cached data, fetching fresh data")
+            await self.fetch_market_snapshot_async()
+        
+        return self._cached_data.frame.to_dataframe()
+    
+    async def get_correlation_matrix_async(self, window: int = CorrelationEngine.DEFAULT_WINDOW) -> Tuple[List[str], np.ndarray]:
+        """Correlation matrix (see get_correlation_matrix) computed in an executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_correlation_matrix, window)
+    
+    async def get_daily_returns_async(self) -> pd.DataFrame:
+        """Daily returns (see get_daily_returns), synced in an executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_daily_returns)
+    
+    async def get_pair_correlation_async(
+        self,
+        first: str,
+        second: str,
+        window: int = CorrelationEngine.DEFAULT_WINDOW
+    ) -> pd.Series:
+        """Rolling pair correlation (see get_pair_correlation) computed in an executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_pair_correlation, first, second, window)
+    
+    async def fetch_historical_data_async(
+        self,
+        symbol: str,
+        period: str = '1y',
+        interval: str = '1d'
+    ) -> pd.DataFrame:
+        """
+        Fetch historical price data without blocking the event loop.
+        
+        Args:
+            symbol: Stock symbol
+            period: Time period (e.g., '1d', '5d', '1mo', '1y')
+            interval: Data interval (e.g., '1d', '1h', '5m')
+        
+        Returns:
+            DataFrame with historical OHLCV data
+        """
+        if not self.async_fallback_source:
+            logger.error("Yahoo Finance fallback not enabled - cannot fetch historical data")
+            return pd.DataFrame()
+        
+        logger.info(f"Fetching historical data for {symbol} (period={period}, interval={interval})")
+        return await self._inflight.do_async(
+            ('history', symbol, period, interval),
+            self.async_fallback_source.fetch_historical_data,
+            symbol, period, interval
+        )
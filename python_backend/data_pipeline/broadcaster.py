@@ -0,0 +1,224 @@
+"""
+Market Update Broadcaster
+=========================
+
+In-memory fan-out of snapshot changes to streaming clients (SSE or
+WebSocket). The pipeline computes one delta per new snapshot version;
+the broadcaster filters it per subscription and hands each subscriber
+its share, so upstream load does not depend on the number of clients.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Iterable, Optional, Set
+
+from .snapshot_history import index_values
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One client's filter and pending updates.
+    
+    Created by MarketBroadcaster.subscribe() on the client's event loop;
+    consume it with `await subscription.get()`.
+    """
+    
+    def __init__(
+        self,
+        symbols: Optional[Iterable[str]],
+        sectors: Optional[Iterable[str]],
+        max_pending: int
+    ):
+        self.symbols: Set[str] = set(symbols or ())
+        self.sectors: Set[str] = set(sectors or ())
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._loop = asyncio.get_running_loop()
+    
+    def update_filter(self, symbols: Optional[Iterable[str]], sectors: Optional[Iterable[str]]) -> None:
+        """Replace the symbols and sectors this client follows."""
+        self.symbols = set(symbols or ())
+        self.sectors = set(sectors or ())
+    
+    def matches(self, symbol: str, sector: Optional[str]) -> bool:
+        """True if the client follows this stock (no filter = everything)."""
+        if not self.symbols and not self.sectors:
+            return True
+        return symbol in self.symbols or (sector is not None and sector in self.sectors)
+    
+    def filter(self, message: dict, sector_of, removed_sector_of=None) -> Optional[dict]:
+        """
+        Trim a broadcast message to this client's stocks.
+        
+        Args:
+            message: Broadcast message
+            sector_of: symbol -> sector in the new snapshot
+            removed_sector_of: symbol -> sector in the previous snapshot, for
+                removed symbols; removals whose sector is unknown reach every
+                client following a sector
+        
+        Returns:
+            The trimmed message, or None if nothing in it concerns the client
+        """
+        stocks = [row for row in message['stocks'] if self.matches(row['symbol'], sector_of(row['symbol']))]
+        
+        removed = []
+        for symbol in message['removed']:
+            sector = removed_sector_of(symbol) if removed_sector_of else None
+            if self.matches(symbol, sector) or (sector is None and self.sectors):
+                removed.append(symbol)
+        
+        if not stocks and not removed and not message['indices'] and not message['full']:
+            return None
+        return {**message, 'stocks': stocks, 'removed': removed}
+    
+    async def get(self) -> dict:
+        """Wait for the next update."""
+        return await self._queue.get()
+    
+    def _offer(self, message: dict) -> None:
+        # A slow client loses its oldest pending update rather than
+        # holding back the broadcaster
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+
+class MarketBroadcaster:
+    """
+    Fans pipeline snapshot deltas out to subscribers.
+    
+    Usage:
+        broadcaster = MarketBroadcaster()
+        broadcaster.attach(pipeline)
+        
+        subscription = broadcaster.subscribe(symbols=['ATW'], sectors=['Mining'])
+        try:
+            while True:
+                update = await subscription.get()
+                ...
+        finally:
+            broadcaster.unsubscribe(subscription)
+    """
+    
+    def __init__(self, max_pending: int = 16):
+        """
+        Initialize the broadcaster.
+        
+        Args:
+            max_pending: Updates buffered per subscriber before the oldest is dropped
+        """
+        self.max_pending = max_pending
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._published = 0
+        
+        # Sectors of the last published snapshot, for the symbols the next one removes
+        self._previous_sector_of = None
+    
+    def attach(self, pipeline) -> None:
+        """Receive every new snapshot version of a pipeline."""
+        pipeline.add_snapshot_listener(self.publish)
+    
+    def detach(self, pipeline) -> None:
+        pipeline.remove_snapshot_listener(self.publish)
+    
+    def subscribe(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        sectors: Optional[Iterable[str]] = None
+    ) -> Subscription:
+        """
+        Register a subscriber; must be called from its event loop.
+        
+        Args:
+            symbols: Symbols to follow
+            sectors: Sectors to follow (all their stocks)
+        
+        Returns:
+            Subscription; with neither filter, every stock is followed
+        """
+        subscription = Subscription(symbols, sectors, self.max_pending)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+    
+    @staticmethod
+    def snapshot_message(market_data) -> dict:
+        """Full-state message for a snapshot (sent on connect or when no delta exists)."""
+        return {
+            'version': market_data.fetch_metadata.get('snapshot_version'),
+            'full': True,
+            'indices': index_values(market_data.indices),
+            'stocks': market_data.frame.to_records(),
+            'removed': []
+        }
+    
+    @staticmethod
+    def sector_lookup(market_data):
+        """symbol -> sector function over a snapshot's frame."""
+        frame = market_data.frame
+        sectors = frame['sector']
+        
+        def sector_of(symbol: str) -> Optional[str]:
+            row = frame.row(symbol)
+            return None if row is None else sectors[row]
+        return sector_of
+    
+    def publish(self, market_data, delta: Optional[dict]) -> None:
+        """
+        Deliver a new snapshot version to every matching subscriber.
+        
+        Safe to call from any thread; messages are handed to each
+        subscriber's own event loop.
+        
+        Args:
+            market_data: The new UnifiedMarketData
+            delta: Change from the previous version, or None to send full state
+        """
+        sector_of = self.sector_lookup(market_data)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            removed_sector_of, self._previous_sector_of = self._previous_sector_of, sector_of
+        if not subscriptions:
+            return
+        
+        if delta is None:
+            message = self.snapshot_message(market_data)
+        else:
+            message = {
+                'version': delta['version'],
+                'full': False,
+                'indices': delta['indices'],
+                'stocks': delta['stocks'],
+                'removed': delta['removed']
+            }
+        
+        self._published += 1
+        
+        for subscription in subscriptions:
+            update = subscription.filter(message, sector_of, removed_sector_of)
+            if update is None:
+                continue
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._offer, update)
+            except RuntimeError:
+                # Subscriber's loop has closed
+                self.unsubscribe(subscription)
+    
+    def get_status(self) -> dict:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return {
+            'subscribers': len(subscriptions),
+            'published': self._published,
+            'dropped': sum(s.dropped for s in subscriptions)
+        }
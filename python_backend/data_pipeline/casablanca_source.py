@@ -12,20 +12,94 @@ Strategies implemented:
 Market Hours: 9:00 AM - 3:30 PM Morocco Time (GMT+1)
 """
 
+import asyncio
 import logging
-from datetime import datetime, time
-from decimal import Decimal
+import time as _time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
 from typing import Optional, List
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import pytz
 
-from .schemas import StockData, MarketIndices
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from .schemas import StockData, MarketIndices, NumericMode, Number, to_number
+from .market_frame import MarketFrame
+from .resilience import CircuitBreaker, CircuitOpenError, backoff_delays
+from .universe import SymbolUniverse
 
 logger = logging.getLogger(__name__)
 
 
+# Response parsing, shared by the sync and async clients (they differ only
+# in transport)
+
+def _parse_indices(data: dict, numeric_mode: NumericMode, market_status: str) -> MarketIndices:
+    """Build MarketIndices from the /api/indices JSON body."""
+    masi = data.get('masi', {})
+    madex = data.get('madex', {})
+    return MarketIndices(
+        masi=to_number(masi.get('value', 0), numeric_mode),
+        masi_change=to_number(masi.get('change_percent', 0), numeric_mode),
+        masi_volume=masi.get('volume'),
+        madex=to_number(madex.get('value', 0), numeric_mode),
+        madex_change=to_number(madex.get('change_percent', 0), numeric_mode),
+        madex_volume=madex.get('volume'),
+        source='casablanca_bourse',
+        market_status=market_status
+    )
+
+
+def _extract_number(soup: BeautifulSoup, selector: str) -> Optional[float]:
+    """Helper to extract and clean numeric values from HTML."""
+    try:
+        element = soup.select_one(selector)
+        if element:
+            text = element.get_text(strip=True)
+            # Remove common formatting (commas, currency symbols, etc.)
+            cleaned = text.replace(',', '').replace('MAD', '').replace('%', '').strip()
+            return float(cleaned)
+    except Exception as e:
+        logger.debug(f"Could not extract number from {selector}: {e}")
+    return None
+
+
+def _parse_index_html(text: str, numeric_mode: NumericMode, market_status: str) -> Optional[MarketIndices]:
+    """
+    Extract MASI and MADEX from the exchange home page.
+    
+    Returns:
+        MarketIndices, or None if the values are not on the page
+    """
+    soup = BeautifulSoup(text, 'html.parser')
+    
+    # These selectors are placeholders - adjust based on actual website structure
+    masi_value = _extract_number(soup, selector='#masi-value')
+    masi_change = _extract_number(soup, selector='#masi-change')
+    madex_value = _extract_number(soup, selector='#madex-value')
+    madex_change = _extract_number(soup, selector='#madex-change')
+    
+    if not (masi_value and madex_value):
+        logger.warning("Could not extract indices from website")
+        return None
+    
+    return MarketIndices(
+        masi=to_number(masi_value, numeric_mode),
+        masi_change=to_number(masi_change or 0, numeric_mode),
+        madex=to_number(madex_value, numeric_mode),
+        madex_change=to_number(madex_change or 0, numeric_mode),
+        source='casablanca_bourse',
+        market_status=market_status
+    )
+
+
 class CasablancaBourseClient:
     """
     Primary data source for Moroccan stock market data.
@@ -40,17 +114,57 @@ class CasablancaBourseClient:
     MARKET_OPEN = time(9, 0)
     MARKET_CLOSE = time(15, 30)
     
-    def __init__(self, timeout: int = 10, max_retries: int = 3):
+    # Endpoints guarded by their own circuit breaker
+    ENDPOINTS = ('indices', 'stock', 'listing', 'website')
+    
+    def __init__(
+        self,
+        timeout: int = 10,
+        max_retries: int = 3,
+        max_concurrent_requests: int = 6,
+        circuit_failure_threshold: int = 5,
+        circuit_recovery_seconds: float = 60.0,
+        retry_backoff_seconds: float = 0.5,
+        universe: Optional[SymbolUniverse] = None,
+        numeric_mode: NumericMode = 'float'
+    ):
         """
         Initialize the Casablanca Bourse client.
         
         Args:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            max_concurrent_requests: Maximum number of per-symbol requests in flight
+            circuit_failure_threshold: Consecutive failures that open an endpoint's breaker
+            circuit_recovery_seconds: How long a breaker stays open before probing
+            retry_backoff_seconds: Base delay for jittered exponential backoff
+            universe: Symbol registry to iterate over (defaults to the seed list)
+            numeric_mode: 'float' or 'decimal' representation of prices
         """
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.universe = universe or SymbolUniverse()
+        self.numeric_mode = numeric_mode
+        self.breakers = {
+            endpoint: CircuitBreaker(
+                f"casablanca_{endpoint}",
+                failure_threshold=circuit_failure_threshold,
+                recovery_timeout=circuit_recovery_seconds
+            )
+            for endpoint in self.ENDPOINTS
+        }
         self.session = requests.Session()
+        
+        # Size the connection pool so concurrent fetches reuse connections
+        # instead of opening (and discarding) extra ones
+        adapter = HTTPAdapter(
+            pool_connections=self.max_concurrent_requests,
+            pool_maxsize=self.max_concurrent_requests
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Academic Research Bot)',
             'Accept': 'text/html,application/json'
@@ -58,6 +172,69 @@ class CasablancaBourseClient:
         
         logger.info("Initialized Casablanca Bourse client")
     
+    def _num(self, value) -> Number:
+        """Convert a raw value according to numeric_mode."""
+        return to_number(value, self.numeric_mode)
+    
+    def is_available(self) -> bool:
+        """
+        Check whether the exchange API is worth calling.
+        
+        Returns:
+            False while the indices or stock endpoint breaker is open
+        """
+        return not (self.breakers['indices'].is_open() or self.breakers['stock'].is_open())
+    
+    def get_circuit_status(self) -> dict:
+        """Circuit breaker state per endpoint."""
+        return {endpoint: breaker.get_status() for endpoint, breaker in self.breakers.items()}
+    
+    @staticmethod
+    def _is_retryable_status(status_code: int) -> bool:
+        return status_code >= 500 or status_code == 429
+    
+    def _get(self, endpoint: str, url: str) -> requests.Response:
+        """
+        GET through the endpoint's circuit breaker with jittered retries.
+        
+        Connection errors, timeouts, 429 and 5xx responses are retried up to
+        max_retries times. Retrying stops early if the breaker opens
+        meanwhile (e.g. other concurrent requests failed).
+        
+        Args:
+            endpoint: Breaker name (one of ENDPOINTS)
+            url: URL to fetch
+        
+        Returns:
+            The response (any non-retryable status)
+        
+        Raises:
+            CircuitOpenError: If the breaker rejects the request
+            requests.RequestException: If every attempt failed
+        """
+        breaker = self.breakers[endpoint]
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {endpoint}")
+        
+        delays = backoff_delays(self.max_retries, base_delay=self.retry_backoff_seconds)
+        while True:
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if not self._is_retryable_status(response.status_code):
+                    breaker.record_success()
+                    return response
+                error = requests.HTTPError(f"HTTP {response.status_code} from {url}", response=response)
+            except requests.RequestException as e:
+                error = e
+            
+            breaker.record_failure()
+            delay = next(delays, None)
+            if delay is None or breaker.is_open():
+                raise error
+            
+            logger.debug(f"Retrying {url} in {delay:.2f}s after: {error}")
+            _time.sleep(delay)
+    
     def is_market_open(self) -> bool:
         """
         Check if the Casablanca Stock Exchange is currently open.
@@ -81,6 +258,29 @@ class CasablancaBourseClient:
         
         return is_open
     
+    def next_market_open(self) -> datetime:
+        """
+        Get the start of the next trading session.
+        
+        Returns:
+            Timezone-aware datetime (Morocco time) of the next market open
+        """
+        now = datetime.now(self.MARKET_TIMEZONE)
+        candidate = now.replace(
+            hour=self.MARKET_OPEN.hour,
+            minute=self.MARKET_OPEN.minute,
+            second=0,
+            microsecond=0
+        )
+        
+        if now.time() >= self.MARKET_OPEN:
+            candidate += timedelta(days=1)
+        
+        while candidate.weekday() >= 5:  # Skip the weekend
+            candidate += timedelta(days=1)
+        
+        return candidate
+    
     def get_market_status(self) -> str:
         """Get current market session status."""
         if not self.is_market_open():
@@ -109,25 +309,17 @@ class CasablancaBourseClient:
             # Note: This is a placeholder - actual endpoint may vary
             url = f"{self.BASE_URL}/api/indices"
             
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get('indices', url)
             
             if response.status_code == 200:
-                data = response.json()
-                
-                return MarketIndices(
-                    masi=Decimal(str(data.get('masi', {}).get('value', 0))),
-                    masi_change=Decimal(str(data.get('masi', {}).get('change_percent', 0))),
-                    masi_volume=data.get('masi', {}).get('volume'),
-                    madex=Decimal(str(data.get('madex', {}).get('value', 0))),
-                    madex_change=Decimal(str(data.get('madex', {}).get('change_percent', 0))),
-                    madex_volume=data.get('madex', {}).get('volume'),
-                    source='casablanca_bourse',
-                    market_status=self.get_market_status()
-                )
+                return _parse_indices(response.json(), self.numeric_mode, self.get_market_status())
             else:
                 logger.warning(f"API returned status {response.status_code}, falling back to scraping")
                 return self._scrape_indices()
                 
+        except CircuitOpenError:
+            logger.warning("Indices endpoint circuit open, skipping request")
+            return None
         except requests.RequestException as e:
             logger.error(f"Error fetching indices: {e}")
             return self._scrape_indices()
@@ -144,29 +336,10 @@ class CasablancaBourseClient:
         try:
             logger.info("Scraping indices from Casablanca Bourse website")
             
-            response = self.session.get(self.BASE_URL, timeout=self.timeout)
+            response = self._get('website', self.BASE_URL)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # These selectors are placeholders - adjust based on actual website structure
-            masi_value = self._extract_number(soup, selector='#masi-value')
-            masi_change = self._extract_number(soup, selector='#masi-change')
-            madex_value = self._extract_number(soup, selector='#madex-value')
-            madex_change = self._extract_number(soup, selector='#madex-change')
-            
-            if masi_value and madex_value:
-                return MarketIndices(
-                    masi=Decimal(str(masi_value)),
-                    masi_change=Decimal(str(masi_change or 0)),
-                    madex=Decimal(str(madex_value)),
-                    madex_change=Decimal(str(madex_change or 0)),
-                    source='casablanca_bourse',
-                    market_status=self.get_market_status()
-                )
-            
-            logger.warning("Could not extract indices from website")
-            return None
+            return _parse_index_html(response.text, self.numeric_mode, self.get_market_status())
             
         except Exception as e:
             logger.error(f"Error scraping indices: {e}")
@@ -187,7 +360,7 @@ class CasablancaBourseClient:
             
             # Try API endpoint
             url = f"{self.BASE_URL}/api/stock/{symbol}"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get('stock', url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -196,60 +369,93 @@ class CasablancaBourseClient:
                 logger.warning(f"API unavailable for {symbol}, attempting scraping")
                 return self._scrape_stock_data(symbol)
                 
+        except CircuitOpenError:
+            logger.debug(f"Stock endpoint circuit open, skipping {symbol}")
+            return None
         except Exception as e:
             logger.error(f"Error fetching stock {symbol}: {e}")
             return None
     
+    def fetch_listing(self) -> Optional[List[dict]]:
+        """
+        Fetch the full list of listed companies in one request.
+        
+        Returns:
+            Listing rows (symbol, name, sector, shares_outstanding, indices)
+            or None if the request fails
+        """
+        try:
+            logger.info("Fetching listing from Casablanca Bourse")
+            
+            response = self._get('listing', f"{self.BASE_URL}/api/listing")
+            response.raise_for_status()
+            return self._parse_listing(response.json())
+            
+        except CircuitOpenError:
+            logger.warning("Listing endpoint circuit open, skipping request")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching listing: {e}")
+            return None
+    
+    @staticmethod
+    def _parse_listing(data) -> List[dict]:
+        """Normalize a listing response (bare list or {'data': [...]}) into rows."""
+        rows = data.get('data', []) if isinstance(data, dict) else data
+        return [
+            {
+                key: row[key]
+                for key in ('symbol', 'name', 'sector', 'shares_outstanding', 'indices')
+                if row.get(key) is not None
+            }
+            for row in rows
+            if isinstance(row, dict) and row.get('symbol')
+        ]
+    
     def fetch_all_stocks(self) -> List[StockData]:
         """
         Fetch data for all listed stocks.
         
+        Symbols are fetched concurrently (bounded by max_concurrent_requests),
+        so total latency tracks the slowest symbol rather than the sum.
+        
         Returns:
             List of StockData objects
         """
-        # List of major Moroccan stocks
-        # In production, this should be fetched dynamically
-        moroccan_symbols = [
-            'ATW',  # Attijariwafa Bank
-            'BCP',  # Banque Centrale Populaire
-            'CDM',  # Crédit du Maroc
-            'IAM',  # Maroc Telecom
-            'ADH',  # Douja Prom Addoha
-            'ALL',  # Alliances
-            'LHM',  # LafargeHolcim Maroc
-            'SID',  # Sonasid
-            'SRM',  # Samir
-            'WAA',  # Wafa Assurance
-            'MNG',  # Managem
-            'LBL',  # Label'Vie
-        ]
+        symbols = self.universe.symbols()
+        
+        # Fan out over the shared session; map() yields results in symbol order
+        workers = max(1, min(self.max_concurrent_requests, len(symbols)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='casablanca') as executor:
+            results = list(executor.map(self.fetch_stock_data, symbols))
         
-        stocks = []
-        for symbol in moroccan_symbols:
-            stock_data = self.fetch_stock_data(symbol)
-            if stock_data:
-                stocks.append(stock_data)
+        stocks = [stock_data for stock_data in results if stock_data]
         
         logger.info(f"Fetched data for {len(stocks)} stocks")
         return stocks
     
     def _parse_stock_data(self, data: dict, symbol: str) -> StockData:
-        """Parse API response into StockData object."""
+        """Parse API response into StockData object, filling static fields from the universe."""
+        listing = self.universe.get(symbol)
+        market_cap = data.get('market_cap')
+        if not market_cap and listing and listing.shares_outstanding and data.get('price'):
+            market_cap = float(data['price']) * listing.shares_outstanding
+        
         return StockData(
             symbol=symbol,
-            name=data.get('name', symbol),
-            price=Decimal(str(data.get('price', 0))),
-            open=Decimal(str(data.get('open', 0))) if data.get('open') else None,
-            high=Decimal(str(data.get('high', 0))) if data.get('high') else None,
-            low=Decimal(str(data.get('low', 0))) if data.get('low') else None,
-            close=Decimal(str(data.get('close', 0))) if data.get('close') else None,
+            name=data.get('name') or (listing.name if listing else symbol),
+            price=self._num(data.get('price', 0)),
+            open=self._num(data.get('open', 0)) if data.get('open') else None,
+            high=self._num(data.get('high', 0)) if data.get('high') else None,
+            low=self._num(data.get('low', 0)) if data.get('low') else None,
+            close=self._num(data.get('close', 0)) if data.get('close') else None,
             volume=int(data.get('volume', 0)),
-            change=Decimal(str(data.get('change', 0))),
-            change_percent=Decimal(str(data.get('change_percent', 0))),
-            market_cap=Decimal(str(data.get('market_cap', 0))) if data.get('market_cap') else None,
-            sector=data.get('sector'),
-            pe_ratio=Decimal(str(data.get('pe_ratio', 0))) if data.get('pe_ratio') else None,
-            dividend_yield=Decimal(str(data.get('dividend_yield', 0))) if data.get('dividend_yield') else None,
+            change=self._num(data.get('change', 0)),
+            change_percent=self._num(data.get('change_percent', 0)),
+            market_cap=self._num(market_cap) if market_cap else None,
+            sector=data.get('sector') or (listing.sector if listing else None),
+            pe_ratio=self._num(data.get('pe_ratio', 0)) if data.get('pe_ratio') else None,
+            dividend_yield=self._num(data.get('dividend_yield', 0)) if data.get('dividend_yield') else None,
             source='casablanca_bourse'
         )
     
@@ -257,7 +463,7 @@ class CasablancaBourseClient:
         """Scrape stock data from website (fallback method)."""
         try:
             url = f"{self.BASE_URL}/stock/{symbol}"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get('website', url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -272,19 +478,6 @@ class CasablancaBourseClient:
             logger.error(f"Error scraping stock {symbol}: {e}")
             return None
     
-    def _extract_number(self, soup: BeautifulSoup, selector: str) -> Optional[float]:
-        """Helper to extract and clean numeric values from HTML."""
-        try:
-            element = soup.select_one(selector)
-            if element:
-                text = element.get_text(strip=True)
-                # Remove common formatting (commas, currency symbols, etc.)
-                cleaned = text.replace(',', '').replace('MAD', '').replace('%', '').strip()
-                return float(cleaned)
-        except Exception as e:
-            logger.debug(f"Could not extract number from {selector}: {e}")
-        return None
-    
     def to_dataframe(self, stocks: List[StockData]) -> pd.DataFrame:
         """
         Convert list of StockData to pandas DataFrame.
@@ -298,8 +491,7 @@ class CasablancaBourseClient:
         if not stocks:
             return pd.DataFrame()
         
-        data = [stock.dict() for stock in stocks]
-        df = pd.DataFrame(data)
+        df = MarketFrame.from_stocks(stocks).to_dataframe()
         
         # Ensure consistent column naming
         df = df.rename(columns={
@@ -310,3 +502,190 @@ class CasablancaBourseClient:
         })
         
         return df
+
+
+class AsyncCasablancaBourseClient(CasablancaBourseClient):
+    """
+    Asyncio variant of the Casablanca Bourse client built on httpx.
+    
+    Exposes the same fetch methods as coroutines so the API server can
+    await them without blocking the event loop. Parsing helpers and
+    market-hours logic are shared with CasablancaBourseClient.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncCasablancaBourseClient")
+        
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            headers=dict(self.session.headers),
+            limits=httpx.Limits(max_connections=self.max_concurrent_requests)
+        )
+        
+        logger.info("Initialized async Casablanca Bourse client")
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+    
+    async def _get_async(self, endpoint: str, url: str) -> 'httpx.Response':
+        """Async counterpart of _get: same breaker, retries and backoff."""
+        breaker = self.breakers[endpoint]
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {endpoint}")
+        
+        delays = backoff_delays(self.max_retries, base_delay=self.retry_backoff_seconds)
+        while True:
+            try:
+                response = await self.client.get(url)
+                if not self._is_retryable_status(response.status_code):
+                    breaker.record_success()
+                    return response
+                error = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code} from {url}",
+                    request=response.request,
+                    response=response
+                )
+            except httpx.HTTPError as e:
+                error = e
+            
+            breaker.record_failure()
+            delay = next(delays, None)
+            if delay is None or breaker.is_open():
+                raise error
+            
+            logger.debug(f"Retrying {url} in {delay:.2f}s after: {error}")
+            await asyncio.sleep(delay)
+    
+    async def fetch_market_indices(self) -> Optional[MarketIndices]:
+        """
+        Fetch MASI and MADEX indices from Casablanca Bourse.
+        
+        Returns:
+            MarketIndices object or None if fetch fails
+        """
+        try:
+            logger.info("Fetching market indices from Casablanca Bourse")
+            
+            url = f"{self.BASE_URL}/api/indices"
+            response = await self._get_async('indices', url)
+            
+            if response.status_code == 200:
+                return _parse_indices(response.json(), self.numeric_mode, self.get_market_status())
+            else:
+                logger.warning(f"API returned status {response.status_code}, falling back to scraping")
+                return await self._scrape_indices()
+                
+        except CircuitOpenError:
+            logger.warning("Indices endpoint circuit open, skipping request")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching indices: {e}")
+            return await self._scrape_indices()
+        except Exception as e:
+            logger.error(f"Unexpected error fetching indices: {e}")
+            return None
+    
+    async def _scrape_indices(self) -> Optional[MarketIndices]:
+        """Scrape market indices from the Casablanca Bourse website."""
+        try:
+            logger.info("Scraping indices from Casablanca Bourse website")
+            
+            response = await self._get_async('website', self.BASE_URL)
+            response.raise_for_status()
+            
+            # HTML parsing is CPU-bound, keep it off the event loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, _parse_index_html, response.text, self.numeric_mode, self.get_market_status()
+            )
+            
+        except Exception as e:
+            logger.error(f"Error scraping indices: {e}")
+            return None
+    
+    async def fetch_stock_data(self, symbol: str) -> Optional[StockData]:
+        """
+        Fetch data for a single stock.
+        
+        Args:
+            symbol: Stock ticker symbol (e.g., 'ATW', 'IAM')
+        
+        Returns:
+            StockData object or None if fetch fails
+        """
+        try:
+            logger.info(f"Fetching data for {symbol}")
+            
+            url = f"{self.BASE_URL}/api/stock/{symbol}"
+            response = await self._get_async('stock', url)
+            
+            if response.status_code == 200:
+                return self._parse_stock_data(response.json(), symbol)
+            else:
+                logger.warning(f"API unavailable for {symbol}, attempting scraping")
+                return await self._scrape_stock_data(symbol)
+                
+        except CircuitOpenError:
+            logger.debug(f"Stock endpoint circuit open, skipping {symbol}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching stock {symbol}: {e}")
+            return None
+    
+    async def _scrape_stock_data(self, symbol: str) -> Optional[StockData]:
+        """Scrape stock data from website (fallback method)."""
+        try:
+            url = f"{self.BASE_URL}/stock/{symbol}"
+            response = await self._get_async('website', url)
+            response.raise_for_status()
+            
+            logger.warning(f"Web scraping not fully implemented for {symbol}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error scraping stock {symbol}: {e}")
+            return None
+    
+    async def fetch_listing(self) -> Optional[List[dict]]:
+        """
+        Fetch the full list of listed companies in one request.
+        
+        Returns:
+            Listing rows or None if the request fails
+        """
+        try:
+            logger.info("Fetching listing from Casablanca Bourse")
+            
+            response = await self._get_async('listing', f"{self.BASE_URL}/api/listing")
+            response.raise_for_status()
+            return self._parse_listing(response.json())
+            
+        except CircuitOpenError:
+            logger.warning("Listing endpoint circuit open, skipping request")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching listing: {e}")
+            return None
+    
+    async def fetch_all_stocks(self) -> List[StockData]:
+        """
+        Fetch data for all listed stocks concurrently.
+        
+        Returns:
+            List of StockData objects, in symbol order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        async def fetch_bounded(symbol: str) -> Optional[StockData]:
+            async with semaphore:
+                return await self.fetch_stock_data(symbol)
+        
+        results = await asyncio.gather(*(fetch_bounded(symbol) for symbol in self.universe.symbols()))
+        stocks = [stock_data for stock_data in results if stock_data]
+        
+        logger.info(f"Fetched data for {len(stocks)} stocks")
+        return stocks
@@ -0,0 +1,145 @@
+"""
+Columnar Export
+===============
+
+Columnar encodings of pipeline DataFrames: Arrow IPC streams and Parquet
+files for bulk consumers (notebooks, data tools), and parallel JSON arrays
+for the dashboard. Columns are converted as whole arrays, with no per-row
+Python work.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Optional: pyarrow provides both the Arrow IPC and Parquet writers
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Export format -> response media type
+MEDIA_TYPES = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+# Accept header media types understood by negotiate_format()
+_ACCEPT_FORMATS = {
+    'application/vnd.apache.arrow.stream': 'arrow',
+    'application/vnd.apache.parquet': 'parquet',
+    'application/x-parquet': 'parquet',
+    'application/json': 'json'
+}
+
+
+def negotiate_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """
+    Pick the response format of a DataFrame endpoint.
+    
+    An explicit `?format=` wins over the Accept header; JSON is the default.
+    
+    Args:
+        requested: 'json', 'arrow' or 'parquet', or None
+        accept: Raw Accept header, or None
+    
+    Returns:
+        'json', 'arrow' or 'parquet'
+    
+    Raises:
+        ValueError: If `requested` is not a known format
+    """
+    if requested:
+        requested = requested.lower()
+        if requested != 'json' and requested not in MEDIA_TYPES:
+            raise ValueError(f"Unknown format '{requested}' (expected json, arrow or parquet)")
+        return requested
+    
+    for media_range in (accept or '').split(','):
+        media_type = media_range.split(';')[0].strip().lower()
+        if media_type in _ACCEPT_FORMATS:
+            return _ACCEPT_FORMATS[media_type]
+    
+    return 'json'
+
+
+def to_arrow_table(df: pd.DataFrame) -> 'pa.Table':
+    """Convert a DataFrame to an Arrow table (a non-default index becomes a column)."""
+    if not ARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is not installed")
+    return pa.Table.from_pandas(df, preserve_index=None)
+
+
+def to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as an Arrow IPC stream.
+    
+    Returns:
+        Stream bytes, readable with pyarrow.ipc.open_stream
+    """
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_parquet(df: pd.DataFrame, compression: str = 'zstd') -> bytes:
+    """
+    Encode a DataFrame as a Parquet file.
+    
+    Args:
+        df: DataFrame to encode
+        compression: Parquet column compression codec
+    
+    Returns:
+        File bytes, readable with pandas.read_parquet
+    """
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression=compression)
+    return sink.getvalue().to_pybytes()
+
+
+def encode(df: pd.DataFrame, fmt: str) -> bytes:
+    """Encode a DataFrame as 'arrow' or 'parquet'."""
+    return to_arrow_ipc(df) if fmt == 'arrow' else to_parquet(df)
+
+
+def json_columns(df: pd.DataFrame) -> dict:
+    """
+    Numeric columns of a time-indexed DataFrame as parallel JSON arrays.
+    
+    Each column is converted as a whole from its NumPy buffer; only
+    columns containing NaN take a per-value pass to turn NaN into None.
+    Non-numeric columns (e.g. symbol, source) are left out.
+    
+    Args:
+        df: DataFrame with a DatetimeIndex (e.g. from fetch_historical_data)
+    
+    Returns:
+        {'timestamp': [epoch ms, ...], '<column>': [...], ...} with column
+        names lower-cased and spaces replaced by underscores
+    """
+    if df.empty:
+        return {'timestamp': []}
+    
+    # .values of a tz-aware index is UTC, so epoch values need no adjustment
+    index = pd.DatetimeIndex(df.index)
+    columns = {'timestamp': index.values.astype('datetime64[ms]').astype(np.int64).tolist()}
+    
+    for name, series in df.items():
+        if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            continue
+        
+        values = series.to_numpy()
+        key = str(name).lower().replace(' ', '_')
+        if values.dtype.kind == 'f' and np.isnan(values).any():
+            columns[key] = [None if v != v else v for v in values.tolist()]
+        else:
+            columns[key] = values.tolist()
+    
+    return columns
@@ -0,0 +1,189 @@
+"""
+Response Compression
+====================
+
+Content-encoding negotiation and codecs (gzip always; brotli and zstd
+when their packages are installed), plus an ASGI middleware that
+compresses dynamic responses. Versioned payloads compress themselves once
+per version (see serialization.VersionedPayload.encode) and are passed
+through by the middleware untouched.
+"""
+
+import gzip
+from typing import Iterable, Optional
+
+# Optional codecs: brotli and zstd compress JSON better than gzip
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Supported encodings, most preferred first
+AVAILABLE_ENCODINGS = tuple(
+    encoding for encoding, available in (
+        ('br', BROTLI_AVAILABLE),
+        ('zstd', ZSTD_AVAILABLE),
+        ('gzip', True)
+    )
+    if available
+)
+
+# Levels used for cached payloads (compressed once) and for the middleware
+# (compressed per response)
+CACHED_LEVELS = {'br': 11, 'zstd': 19, 'gzip': 9}
+DYNAMIC_LEVELS = {'br': 5, 'zstd': 3, 'gzip': 6}
+
+# Bodies below this size are sent as-is
+MINIMUM_SIZE = 512
+
+# Content types the middleware never compresses (streams, already compressed)
+EXCLUDED_CONTENT_TYPES = ('text/event-stream', 'application/vnd.apache.parquet', 'image/', 'video/')
+
+
+def choose_encoding(accept_encoding: Optional[str], supported: Iterable[str] = AVAILABLE_ENCODINGS) -> Optional[str]:
+    """
+    Pick a content encoding from an Accept-Encoding header.
+    
+    Args:
+        accept_encoding: Raw header value, or None
+        supported: Encodings the server can produce, most preferred first
+    
+    Returns:
+        The first supported encoding the client accepts (q > 0), or None
+        for identity
+    """
+    if not accept_encoding:
+        return None
+    
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    
+    wildcard = accepted.get('*', 0.0)
+    for encoding in supported:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress bytes with one of AVAILABLE_ENCODINGS.
+    
+    Args:
+        data: Uncompressed body
+        encoding: 'br', 'zstd' or 'gzip'
+        level: Codec level (defaults to CACHED_LEVELS)
+    
+    Returns:
+        Compressed body
+    """
+    level = CACHED_LEVELS[encoding] if level is None else level
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-body HTTP responses.
+    
+    Responses that already carry a Content-Encoding (pre-compressed
+    payloads), streamed responses, small bodies and EXCLUDED_CONTENT_TYPES
+    are sent unchanged.
+    
+    Usage:
+        app.add_middleware(CompressionMiddleware)
+    """
+    
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        accept_encoding = None
+        for name, value in scope.get('headers', ()):
+            if name == b'accept-encoding':
+                accept_encoding = value.decode('latin-1')
+                break
+        
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        passthrough = False
+        
+        async def send_wrapper(message) -> None:
+            nonlocal start_message, passthrough
+            
+            if message['type'] == 'http.response.start':
+                start_message = message
+                passthrough = not self._compressible(message['headers'])
+                if passthrough:
+                    await send(message)
+                return
+            
+            if passthrough or message['type'] != 'http.response.body':
+                await send(message)
+                return
+            
+            body = message.get('body', b'')
+            if message.get('more_body', False) or len(body) < self.minimum_size:
+                # Streamed or small: send as produced
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            
+            body = compress(body, encoding, DYNAMIC_LEVELS[encoding])
+            vary = [value for name, value in start_message['headers'] if name == b'vary']
+            headers = [
+                (name, value) for name, value in start_message['headers']
+                if name not in (b'content-length', b'vary')
+            ]
+            headers += [
+                (b'content-encoding', encoding.encode('ascii')),
+                (b'content-length', str(len(body)).encode('ascii')),
+                (b'vary', b', '.join(vary + [b'Accept-Encoding']))
+            ]
+            
+            await send({**start_message, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    @staticmethod
+    def _compressible(headers) -> bool:
+        for name, value in headers:
+            if name == b'content-encoding':
+                return False
+            if name == b'content-type':
+                content_type = value.decode('latin-1').lower()
+                if any(content_type.startswith(excluded) for excluded in EXCLUDED_CONTENT_TYPES):
+                    return False
+        return True
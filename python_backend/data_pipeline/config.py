@@ -24,8 +24,18 @@ class DataSourceConfig:
     enable_alphavantage: bool = False
     alphavantage_api_key: Optional[str] = None
     cache_duration_minutes: int = 5
+    closed_market_cache_minutes: int = 60
+    refresh_interval_seconds: int = 60
+    history_store_dir: Optional[str] = 'data/history'
+    universe_cache_path: Optional[str] = 'data/universe.json'
+    universe_refresh_hours: int = 24
+    indicator_state_path: Optional[str] = 'data/indicator_state.npz'
     request_timeout_seconds: int = 10
     max_retries: int = 3
+    max_concurrent_requests: int = 6
+    circuit_failure_threshold: int = 5
+    circuit_recovery_seconds: int = 60
+    retry_backoff_seconds: float = 0.5
 
 
 @dataclass
@@ -36,6 +46,13 @@ class PipelineConfig:
     log_file: Optional[str] = None
     enable_data_validation: bool = True
     auto_fallback: bool = True
+    enable_background_refresh: bool = True
+    enable_local_indicators: bool = True
+    numeric_mode: str = 'float'  # 'float' (fast path) or 'decimal' (exact, for audit)
+    
+    def __post_init__(self):
+        if self.numeric_mode not in ('float', 'decimal'):
+            raise ValueError(f"numeric_mode must be 'float' or 'decimal', got {self.numeric_mode!r}")
     
     @classmethod
     def from_yaml(cls, config_path: str) -> 'PipelineConfig':
@@ -59,7 +76,10 @@ class PipelineConfig:
                 log_level=config_data.get('log_level', 'INFO'),
                 log_file=config_data.get('log_file'),
                 enable_data_validation=config_data.get('enable_data_validation', True),
-                auto_fallback=config_data.get('auto_fallback', True)
+                auto_fallback=config_data.get('auto_fallback', True),
+                enable_background_refresh=config_data.get('enable_background_refresh', True),
+                enable_local_indicators=config_data.get('enable_local_indicators', True),
+                numeric_mode=config_data.get('numeric_mode', 'float')
             )
         except FileNotFoundError:
             logger.warning(f"Config file not found: {config_path}, using defaults")
@@ -82,8 +102,18 @@ class PipelineConfig:
             enable_alphavantage=os.getenv('ENABLE_ALPHAVANTAGE', 'false').lower() == 'true',
             alphavantage_api_key=os.getenv('ALPHAVANTAGE_API_KEY'),
             cache_duration_minutes=int(os.getenv('CACHE_DURATION_MINUTES', '5')),
+            closed_market_cache_minutes=int(os.getenv('CLOSED_MARKET_CACHE_MINUTES', '60')),
+            refresh_interval_seconds=int(os.getenv('REFRESH_INTERVAL_SECONDS', '60')),
+            history_store_dir=os.getenv('HISTORY_STORE_DIR', 'data/history') or None,
+            universe_cache_path=os.getenv('UNIVERSE_CACHE_PATH', 'data/universe.json') or None,
+            universe_refresh_hours=int(os.getenv('UNIVERSE_REFRESH_HOURS', '24')),
+            indicator_state_path=os.getenv('INDICATOR_STATE_PATH', 'data/indicator_state.npz') or None,
             request_timeout_seconds=int(os.getenv('REQUEST_TIMEOUT_SECONDS', '10')),
-            max_retries=int(os.getenv('MAX_RETRIES', '3'))
+            max_retries=int(os.getenv('MAX_RETRIES', '3')),
+            max_concurrent_requests=int(os.getenv('MAX_CONCURRENT_REQUESTS', '6')),
+            circuit_failure_threshold=int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5')),
+            circuit_recovery_seconds=int(os.getenv('CIRCUIT_RECOVERY_SECONDS', '60')),
+            retry_backoff_seconds=float(os.getenv('RETRY_BACKOFF_SECONDS', '0.5'))
         )
         
         return cls(
@@ -91,7 +121,10 @@ class PipelineConfig:
             log_level=os.getenv('LOG_LEVEL', 'INFO'),
             log_file=os.getenv('LOG_FILE'),
             enable_data_validation=os.getenv('ENABLE_DATA_VALIDATION', 'true').lower() == 'true',
-            auto_fallback=os.getenv('AUTO_FALLBACK', 'true').lower() == 'true'
+            auto_fallback=os.getenv('AUTO_FALLBACK', 'true').lower() == 'true',
+            enable_background_refresh=os.getenv('ENABLE_BACKGROUND_REFRESH', 'true').lower() == 'true',
+            enable_local_indicators=os.getenv('ENABLE_LOCAL_INDICATORS', 'true').lower() == 'true',
+            numeric_mode=os.getenv('NUMERIC_MODE', 'float')
         )
     
     def to_yaml(self, output_path: str) -> None:
@@ -108,13 +141,26 @@ class PipelineConfig:
                 'enable_alphavantage': self.data_source.enable_alphavantage,
                 'alphavantage_api_key': self.data_source.alphavantage_api_key,
                 'cache_duration_minutes': self.data_source.cache_duration_minutes,
+                'closed_market_cache_minutes': self.data_source.closed_market_cache_minutes,
+                'refresh_interval_seconds': self.data_source.refresh_interval_seconds,
+                'history_store_dir': self.data_source.history_store_dir,
+                'universe_cache_path': self.data_source.universe_cache_path,
+                'universe_refresh_hours': self.data_source.universe_refresh_hours,
+                'indicator_state_path': self.data_source.indicator_state_path,
                 'request_timeout_seconds': self.data_source.request_timeout_seconds,
-                'max_retries': self.data_source.max_retries
+                'max_retries': self.data_source.max_retries,
+                'max_concurrent_requests': self.data_source.max_concurrent_requests,
+                'circuit_failure_threshold': self.data_source.circuit_failure_threshold,
+                'circuit_recovery_seconds': self.data_source.circuit_recovery_seconds,
+                'retry_backoff_seconds': self.data_source.retry_backoff_seconds
             },
             'log_level': self.log_level,
             'log_file': self.log_file,
             'enable_data_validation': self.enable_data_validation,
-            'auto_fallback': self.auto_fallback
+            'auto_fallback': self.auto_fallback,
+            'enable_background_refresh': self.enable_background_refresh,
+            'enable_local_indicators': self.enable_local_indicators,
+            'numeric_mode': self.numeric_mode
         }
         
         with open(output_path, 'w') as f:
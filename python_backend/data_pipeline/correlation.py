@@ -0,0 +1,301 @@
+"""
+Return Correlation
+==================
+
+Pairwise correlation of daily returns across the symbol universe.
+
+Closing prices are aligned on a common date axis and turned into a
+dates x symbols return matrix. For each lookback window, running sums of
+counts, returns, squared returns and cross products are kept as N x N
+arrays; a new day adds one outer product and the day leaving the window
+subtracts one, so the matrix never has to be recomputed from the full
+history.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RollingCrossProducts:
+    """
+    Running pairwise sums over the last `window` return rows.
+    
+    Pairs use the rows where both symbols have a return (pairwise-complete
+    observations), so a symbol with gaps does not shrink everyone else's
+    sample.
+    """
+    
+    def __init__(self, window: int, size: int):
+        """
+        Initialize empty sums.
+        
+        Args:
+            window: Number of most recent rows covered
+            size: Number of symbols (row length)
+        """
+        self.window = window
+        self._rows = deque()
+        
+        self.counts = np.zeros((size, size))
+        self.sums = np.zeros((size, size))      # [i, j]: sum of r_i where i and j are valid
+        self.squares = np.zeros((size, size))   # [i, j]: sum of r_i ** 2 where i and j are valid
+        self.products = np.zeros((size, size))  # [i, j]: sum of r_i * r_j
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def push(self, row: np.ndarray) -> None:
+        """Add one row of returns (NaN where missing), dropping the oldest beyond the window."""
+        valid = np.isfinite(row).astype(np.float64)
+        values = np.where(valid > 0, row, 0.0)
+        
+        self._apply(values, valid, 1.0)
+        self._rows.append((values, valid))
+        
+        if len(self._rows) > self.window:
+            self._apply(*self._rows.popleft(), -1.0)
+    
+    def _apply(self, values: np.ndarray, valid: np.ndarray, sign: float) -> None:
+        self.counts += sign * np.outer(valid, valid)
+        self.sums += sign * np.outer(values, valid)
+        self.squares += sign * np.outer(values * values, valid)
+        self.products += sign * np.outer(values, values)
+    
+    def correlation(self, min_periods: int) -> np.ndarray:
+        """
+        Pearson correlation matrix from the running sums.
+        
+        Args:
+            min_periods: Minimum overlapping observations per pair
+        
+        Returns:
+            N x N array, NaN for pairs with too few observations or a
+            constant series
+        """
+        n = self.counts
+        covariance = n * self.products - self.sums * self.sums.T
+        variance = n * self.squares - self.sums ** 2
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = covariance / np.sqrt(variance * variance.T)
+        
+        # Tiny negative variances are rounding noise from the running updates
+        defined = (n >= min_periods) & (variance > 1e-18) & (variance.T > 1e-18)
+        corr = np.where(defined, np.clip(corr, -1.0, 1.0), np.nan)
+        np.fill_diagonal(corr, np.where(np.diag(defined), 1.0, np.nan))
+        return corr
+
+
+class CorrelationEngine:
+    """
+    Return-correlation matrices for the whole universe.
+    
+    Feed it daily histories with update(); only dates newer than the last
+    update are added to the running sums. Windows are registered on first
+    use and kept up to date from then on.
+    
+    Usage:
+        engine = CorrelationEngine()
+        engine.update({'ATW': atw_history_df, 'IAM': iam_history_df})
+        symbols, matrix = engine.matrix(window=60)
+        series = engine.rolling_pair('ATW', 'IAM', window=60)
+    """
+    
+    DEFAULT_WINDOW = 60
+    MAX_WINDOW = 250
+    
+    # Fewest overlapping returns for a pair to get a value
+    MIN_PERIODS = 20
+    
+    def __init__(self, max_window: int = MAX_WINDOW):
+        """
+        Initialize the engine.
+        
+        Args:
+            max_window: Longest lookback served; twice as many returns are
+                kept so rolling pair series can span a full window
+        """
+        self.max_window = max_window
+        self._lock = threading.Lock()
+        
+        self._returns = pd.DataFrame()
+        self._windows: Dict[int, RollingCrossProducts] = {}
+    
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._returns.columns)
+    
+    @property
+    def as_of(self) -> Optional[pd.Timestamp]:
+        """Date of the latest return, or None before the first update."""
+        return self._returns.index[-1] if len(self._returns) else None
+    
+    @property
+    def returns(self) -> pd.DataFrame:
+        """Aligned daily returns (dates x symbols, NaN where missing)."""
+        with self._lock:
+            return self._returns.copy()
+    
+    def min_periods(self, window: int) -> int:
+        return max(2, min(window, self.MIN_PERIODS))
+    
+    @staticmethod
+    def return_matrix(histories: Dict[str, pd.DataFrame], column: str = 'close') -> pd.DataFrame:
+        """
+        Daily simple returns of several symbols on a common date axis.
+        
+        Args:
+            histories: Symbol -> OHLCV DataFrame (e.g. from fetch_historical_data)
+            column: Price column to use
+        
+        Returns:
+            DataFrame indexed by date, one column per symbol; a return is
+            NaN when either of its two closes is missing
+        """
+        series = {}
+        for symbol, df in histories.items():
+            if df is None or df.empty or column not in df.columns:
+                continue
+            
+            close = df[column].astype(np.float64)
+            index = pd.DatetimeIndex(close.index)
+            close.index = (index.tz_localize(None) if index.tz is not None else index).normalize()
+            series[symbol] = close[~close.index.duplicated(keep='last')]
+        
+        if not series:
+            return pd.DataFrame()
+        
+        closes = pd.concat(series, axis=1, sort=True)
+        return closes.pct_change(fill_method=None).iloc[1:]
+    
+    def update(self, histories: Dict[str, pd.DataFrame]) -> int:
+        """
+        Add new trading days from daily histories.
+        
+        The same (overlapping) histories can be passed every day: only
+        dates after the latest one already added are pushed into the
+        running sums. Returns on known dates that differ from the stored
+        ones (e.g. a corrected last close) replace them, and the sums are
+        rebuilt from the stored returns on next use. A change in the symbol
+        set rebuilds the state.
+        
+        Args:
+            histories: Symbol -> daily OHLCV DataFrame of closed bars
+        
+        Returns:
+            Number of dates added
+        """
+        returns = self.return_matrix(histories)
+        if returns.empty:
+            return 0
+        
+        keep = 2 * self.max_window
+        with self._lock:
+            if sorted(returns.columns) != sorted(self._returns.columns) or self._returns.empty:
+                self._returns = returns.iloc[-keep:]
+                self._windows.clear()
+                logger.info(f"Correlation state rebuilt: {len(self._returns)} days x {returns.shape[1]} symbols")
+                return len(self._returns)
+            
+            self._apply_corrections(returns.loc[returns.index <= self._returns.index[-1], self._returns.columns])
+            
+            new = returns.loc[returns.index > self._returns.index[-1], self._returns.columns]
+            if new.empty:
+                return 0
+            
+            for row in new.to_numpy(dtype=np.float64):
+                for sums in self._windows.values():
+                    sums.push(row)
+            
+            self._returns = pd.concat([self._returns, new]).iloc[-keep:]
+            logger.info(f"Correlation state advanced by {len(new)} days")
+            return len(new)
+    
+    def _apply_corrections(self, known: pd.DataFrame) -> None:
+        """Overwrite stored returns that a newer download reports differently (caller holds the lock)."""
+        known = known.loc[known.index.isin(self._returns.index)]
+        if known.empty:
+            return
+        
+        stored = self._returns.loc[known.index].to_numpy(dtype=np.float64)
+        fresh = known.to_numpy(dtype=np.float64)
+        
+        # A return missing from the new download is not a correction
+        changed = np.isfinite(fresh) & ~np.isclose(stored, fresh, rtol=0, atol=1e-12, equal_nan=True)
+        if not changed.any():
+            return
+        
+        self._returns.loc[known.index] = np.where(changed, fresh, stored)
+        self._windows.clear()
+        logger.info(f"Correlation state corrected on {int(changed.any(axis=1).sum())} days")
+    
+    def matrix(self, window: int = DEFAULT_WINDOW) -> Tuple[List[str], np.ndarray]:
+        """
+        Correlation matrix over the last `window` trading days.
+        
+        Args:
+            window: Lookback in trading days (at most max_window)
+        
+        Returns:
+            (symbols, N x N array with NaN for undefined pairs)
+        
+        Raises:
+            ValueError: If window is outside 2..max_window
+        """
+        if not 2 <= window <= self.max_window:
+            raise ValueError(f"window must be between 2 and {self.max_window}, got {window}")
+        
+        with self._lock:
+            sums = self._windows.get(window)
+            if sums is None:
+                sums = RollingCrossProducts(window, self._returns.shape[1])
+                for row in self._returns.to_numpy(dtype=np.float64)[-window:]:
+                    sums.push(row)
+                self._windows[window] = sums
+            
+            return list(self._returns.columns), sums.correlation(self.min_periods(window))
+    
+    def rolling_pair(self, first: str, second: str, window: int = DEFAULT_WINDOW) -> pd.Series:
+        """
+        Rolling correlation of two symbols' returns.
+        
+        Args:
+            first: Symbol
+            second: Symbol
+            window: Lookback in trading days
+        
+        Returns:
+            Series indexed by date (dates without enough overlap dropped)
+        
+        Raises:
+            KeyError: If a symbol has no return history
+        """
+        with self._lock:
+            for symbol in (first, second):
+                if symbol not in self._returns.columns:
+                    raise KeyError(symbol)
+            pair = self._returns[[first, second]]
+        
+        rolling = pair[first].rolling(window, min_periods=self.min_periods(window)).corr(pair[second])
+        return rolling.dropna().rename('correlation')
+    
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                'symbols': self._returns.shape[1],
+                'days': len(self._returns),
+                'as_of': self._returns.index[-1].date().isoformat() if len(self._returns) else None,
+                'windows': sorted(self._windows)
+            }
+
+
+def matrix_json(matrix: np.ndarray, decimals: int = 4) -> List[List[Optional[float]]]:
+    """Nested lists of a matrix, rounded, with NaN as None."""
+    return [[None if v != v else v for v in row] for row in np.round(matrix, decimals).tolist()]
@@ -0,0 +1,97 @@
+"""
+Chart Downsampling
+==================
+
+Largest-Triangle-Three-Buckets (LTTB) selection of the points that best
+preserve a series' visual shape, so chart payloads stay bounded whatever
+period is requested.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Positions of the points kept by LTTB.
+    
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previous
+    pick and the average of the next bucket. Work inside a bucket is
+    vectorized, so the Python loop runs once per output point.
+    
+    Args:
+        x: Increasing x values (e.g. epoch times)
+        y: Finite y values, same length as x
+        max_points: Number of points to keep (at least 3)
+    
+    Returns:
+        Sorted integer positions into x/y (all positions if the series is
+        already short enough)
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # Bucket boundaries over the interior points 1 .. n-2
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    
+    a = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        # Twice the triangle area (the constant factor does not change argmax)
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    
+    return selected
+
+
+def downsample_frame(df: pd.DataFrame, max_points: int, column: str = 'close') -> pd.DataFrame:
+    """
+    Keep at most max_points rows of a time-indexed DataFrame using LTTB.
+    
+    Selection uses `column` against the index; whole rows are kept, so
+    the other columns of each picked bar are unchanged. Rows where
+    `column` is missing are dropped when downsampling applies.
+    
+    Args:
+        df: DataFrame with a DatetimeIndex (e.g. from fetch_historical_data)
+        max_points: Maximum rows to return
+        column: Column whose shape is preserved
+    
+    Returns:
+        The same DataFrame if it is short enough, otherwise a row subset
+    """
+    if len(df) <= max_points or column not in df.columns:
+        return df
+    
+    values = df[column].to_numpy(dtype=np.float64)
+    valid = np.flatnonzero(np.isfinite(values))
+    if len(valid) <= max_points:
+        return df.iloc[valid]
+    
+    if isinstance(df.index, pd.DatetimeIndex):
+        x = df.index.asi8[valid]
+    else:
+        x = valid
+    
+    return df.iloc[valid[lttb_indices(x, values[valid], max_points)]]
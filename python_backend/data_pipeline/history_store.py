@@ -0,0 +1,295 @@
+"""
+Local OHLCV History Store
+=========================
+
+Persistent columnar store for historical bars, one directory per
+(interval, symbol). Every column is a raw little-endian binary file that
+is appended to as new bars arrive and read back through np.memmap, so
+any date range is a slice of the mapped file rather than a re-download.
+read_arrays() returns those slices as views; read() copies them into a
+DataFrame.
+
+Layout:
+    <root>/<interval>/<symbol>/
+        meta.json          # row count, columns, coverage, timezone
+        timestamp.i8       # bar open time, UTC nanoseconds
+        <column>.f8        # one float64 file per OHLCV column (integer
+                           # columns such as volume are cast back on read)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryStore:
+    """
+    Append-only, memory-mapped store for OHLCV history.
+    
+    Usage:
+        store = HistoryStore('data/history')
+        store.replace('ATW', '1d', hist_df, coverage_start=None)
+        store.append('ATW', '1d', new_bars_df)
+        df = store.read('ATW', '1d', start=pd.Timestamp('2024-01-01', tz='UTC'))
+    """
+    
+    TIMESTAMP_FILE = 'timestamp.i8'
+    META_FILE = 'meta.json'
+    
+    def __init__(self, root_dir: str):
+        """
+        Initialize the history store.
+        
+        Args:
+            root_dir: Directory under which series are stored
+        """
+        self.root = Path(root_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        
+        logger.info(f"Initialized history store at {self.root}")
+    
+    @staticmethod
+    def _safe_name(name: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+    
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        return self.root / self._safe_name(interval) / self._safe_name(symbol)
+    
+    def _column_file(self, series_dir: Path, column: str) -> Path:
+        return series_dir / f"{self._safe_name(column)}.f8"
+    
+    @staticmethod
+    def _overwrite(path: Path, offset: int, data: bytes) -> None:
+        # Files are written over in place and never truncated: arrays
+        # already handed out by read_arrays() may still map the old bytes
+        # (truncating them would crash those readers with SIGBUS, and
+        # Windows refuses to truncate or replace a mapped file). The row
+        # count in meta bounds what readers see.
+        with open(path, 'r+b' if path.exists() else 'wb') as f:
+            f.seek(offset)
+            f.write(data)
+    
+    def get_meta(self, symbol: str, interval: str) -> Optional[dict]:
+        """
+        Get metadata for a stored series.
+        
+        Returns:
+            Metadata dict, or None if nothing is stored
+        """
+        meta_path = self._series_dir(symbol, interval) / self.META_FILE
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Corrupt history metadata for {symbol} ({interval}): {e}")
+            return None
+    
+    def _write_meta(self, series_dir: Path, meta: dict) -> None:
+        # Written last and atomically: readers never see a row count that
+        # exceeds the data already on disk
+        tmp_path = series_dir / f"{self.META_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, series_dir / self.META_FILE)
+    
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest stored bar, or None."""
+        meta = self.get_meta(symbol, interval)
+        if not meta or meta['count'] == 0:
+            return None
+        return pd.Timestamp(meta['last_timestamp'], tz='UTC')
+    
+    @staticmethod
+    def _columns_of(df: pd.DataFrame) -> List[str]:
+        return [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+    
+    @staticmethod
+    def _timestamps_of(df: pd.DataFrame) -> np.ndarray:
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        return index.tz_convert('UTC').as_unit('ns').asi8
+    
+    def replace(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        coverage_start: Optional[pd.Timestamp]
+    ) -> None:
+        """
+        Overwrite a series with a freshly downloaded frame.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval (e.g. '1d')
+            df: OHLCV frame indexed by timestamp
+            coverage_start: Earliest time the download covered (None for 'max')
+        """
+        series_dir = self._series_dir(symbol, interval)
+        columns = self._columns_of(df)
+        timestamps = self._timestamps_of(df)
+        
+        with self._lock:
+            series_dir.mkdir(parents=True, exist_ok=True)
+            
+            self._overwrite(series_dir / self.TIMESTAMP_FILE, 0, timestamps.astype('<i8').tobytes())
+            for column in columns:
+                values = df[column].to_numpy(dtype='<f8', na_value=np.nan)
+                self._overwrite(self._column_file(series_dir, column), 0, values.tobytes())
+            
+            index = pd.DatetimeIndex(df.index)
+            self._write_meta(series_dir, {
+                'count': len(df),
+                'columns': columns,
+                'integer_columns': [c for c in columns if pd.api.types.is_integer_dtype(df[c])],
+                'index_name': df.index.name,
+                'tz': str(index.tz) if index.tz is not None else None,
+                'coverage_start': None if coverage_start is None else int(coverage_start.value),
+                'last_timestamp': int(timestamps[-1]) if len(timestamps) else None,
+                'updated_at': time.time()
+            })
+        
+        logger.info(f"Stored {len(df)} bars for {symbol} ({interval})")
+    
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Append bars to a stored series.
+        
+        Stored bars at or after the first incoming timestamp are dropped
+        first, so a still-forming bar (e.g. today's daily bar) is updated
+        in place rather than duplicated.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval
+            df: New OHLCV bars indexed by timestamp
+        
+        Returns:
+            Number of rows written
+        """
+        series_dir = self._series_dir(symbol, interval)
+        
+        with self._lock:
+            # Read under the lock: a concurrent append or replace may have
+            # changed the row count or columns
+            meta = self.get_meta(symbol, interval)
+            if meta is None:
+                raise KeyError(f"No stored history for {symbol} ({interval})")
+            
+            meta['updated_at'] = time.time()
+            
+            if df.empty:
+                self._write_meta(series_dir, meta)
+                return 0
+            
+            timestamps = self._timestamps_of(df)
+            stored = self._map(series_dir / self.TIMESTAMP_FILE, '<i8', meta['count'])
+            keep = int(np.searchsorted(stored, timestamps[0], side='left')) if stored is not None else 0
+            del stored
+            
+            files = [(series_dir / self.TIMESTAMP_FILE, 8, timestamps.astype('<i8'))]
+            for column in meta['columns']:
+                if column in df.columns:
+                    values = df[column].to_numpy(dtype='<f8', na_value=np.nan)
+                else:
+                    values = np.full(len(df), np.nan, dtype='<f8')
+                files.append((self._column_file(series_dir, column), 8, values))
+            
+            for path, itemsize, values in files:
+                self._overwrite(path, keep * itemsize, values.tobytes())
+            
+            meta['count'] = keep + len(df)
+            meta['last_timestamp'] = int(timestamps[-1])
+            self._write_meta(series_dir, meta)
+        
+        logger.info(f"Appended {len(df)} bars for {symbol} ({interval})")
+        return len(df)
+    
+    @staticmethod
+    def _map(path: Path, dtype: str, count: int) -> Optional[np.ndarray]:
+        if count == 0:
+            return None
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+    
+    def read_arrays(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get the stored columns from `start` onwards as memory-mapped views.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval
+            start: First timestamp to include (None for the whole series)
+        
+        Returns:
+            Dictionary of column -> read-only array view ('timestamp' holds
+            UTC nanoseconds), or None if nothing is stored
+        """
+        meta = self.get_meta(symbol, interval)
+        if not meta or meta['count'] == 0:
+            return None
+        
+        series_dir = self._series_dir(symbol, interval)
+        timestamps = self._map(series_dir / self.TIMESTAMP_FILE, '<i8', meta['count'])
+        
+        first = 0
+        if start is not None:
+            first = int(np.searchsorted(timestamps, pd.Timestamp(start).value, side='left'))
+        
+        arrays = {'timestamp': timestamps[first:]}
+        for column in meta['columns']:
+            arrays[column] = self._map(self._column_file(series_dir, column), '<f8', meta['count'])[first:]
+        
+        return arrays
+    
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """
+        Read stored bars from `start` onwards as a DataFrame.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval
+            start: First timestamp to include (None for the whole series)
+        
+        Returns:
+            OHLCV DataFrame indexed like the original download (empty if
+            none); integer columns keep their dtype unless bars are missing
+            values for them
+        """
+        arrays = self.read_arrays(symbol, interval, start)
+        if arrays is None:
+            return pd.DataFrame()
+        
+        meta = self.get_meta(symbol, interval)
+        index = pd.DatetimeIndex(pd.to_datetime(arrays.pop('timestamp'), utc=True))
+        index = index.tz_convert(meta.get('tz'))
+        index.name = meta.get('index_name')
+        
+        for column in meta.get('integer_columns', []):
+            if np.isfinite(arrays[column]).all():
+                arrays[column] = arrays[column].astype(np.int64)
+        
+        return pd.DataFrame(arrays, index=index)
@@ -0,0 +1,576 @@
+"""
+Local Technical Indicators
+==========================
+
+Computes every TechnicalIndicators field for the whole symbol universe.
+
+IndicatorEngine evaluates indicators from scratch over a 2-D price matrix
+(one row per symbol, one column per bar). IndicatorState keeps running
+accumulators per symbol instead, so each new bar is folded in with a
+constant amount of work and the state survives restarts on disk.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .schemas import TechnicalIndicators, NumericMode, to_number
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorEngine:
+    """
+    Vectorized indicator calculator over a price matrix.
+    
+    Conventions follow the usual definitions (and Alpha Vantage's):
+    Wilder-smoothed RSI(14), simple moving averages, EMAs seeded with the
+    first price, MACD(12, 26, 9) and Bollinger Bands(20, 2 population
+    standard deviations).
+    
+    Usage:
+        engine = IndicatorEngine()
+        indicators = engine.compute_from_histories({
+            'ATW': atw_history_df,
+            'IAM': iam_history_df
+        })
+        print(indicators['ATW'].rsi)
+    """
+    
+    # Bars kept per symbol; far beyond what SMA 200 and EMA convergence need
+    LOOKBACK_BARS = 400
+    
+    RSI_PERIOD = 14
+    SMA_PERIODS = (20, 50, 200)
+    MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+    BOLLINGER_PERIOD, BOLLINGER_WIDTH = 20, 2.0
+    
+    def __init__(self, numeric_mode: NumericMode = 'float', lookback_bars: int = LOOKBACK_BARS):
+        """
+        Initialize the engine.
+        
+        Args:
+            numeric_mode: 'float' or 'decimal' representation of results
+            lookback_bars: Most recent bars used per symbol
+        """
+        self.numeric_mode = numeric_mode
+        self.lookback_bars = lookback_bars
+    
+    def price_matrix(
+        self,
+        histories: Dict[str, pd.DataFrame],
+        column: str = 'close'
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Align closing prices of several symbols on a common time axis.
+        
+        Args:
+            histories: Symbol -> OHLCV DataFrame (e.g. from fetch_historical_data)
+            column: Price column to use
+        
+        Returns:
+            (symbols, matrix) where matrix has shape (len(symbols), bars)
+            and NaN where a symbol has no bar at that time
+        """
+        series = {
+            symbol: df[column]
+            for symbol, df in histories.items()
+            if df is not None and not df.empty and column in df.columns
+        }
+        if not series:
+            return [], np.empty((0, 0))
+        
+        aligned = pd.concat(series, axis=1, sort=True).iloc[-self.lookback_bars:]
+        return list(aligned.columns), aligned.to_numpy(dtype=np.float64).T
+    
+    def compute_from_histories(self, histories: Dict[str, pd.DataFrame]) -> Dict[str, TechnicalIndicators]:
+        """Compute indicators for every symbol with price history."""
+        symbols, matrix = self.price_matrix(histories)
+        return self.compute(symbols, matrix)
+    
+    def compute(self, symbols: List[str], matrix: np.ndarray) -> Dict[str, TechnicalIndicators]:
+        """
+        Compute the latest indicator values for every row of a price matrix.
+        
+        Args:
+            symbols: Row labels
+            matrix: Prices, shape (len(symbols), bars), NaN for missing bars
+        
+        Returns:
+            Symbol -> TechnicalIndicators; a value is None when the symbol
+            has fewer valid bars than the indicator needs, and symbols
+            without any price are omitted
+        """
+        if not symbols:
+            return {}
+        
+        values = self.compute_arrays(matrix)
+        timestamp = pd.Timestamp.now().to_pydatetime()
+        
+        columns = {field: array.tolist() for field, array in values.items()}
+        results = {}
+        for row, symbol in enumerate(symbols):
+            fields = {field: column[row] for field, column in columns.items()}
+            if all(v != v for v in fields.values()):
+                continue
+            results[symbol] = TechnicalIndicators.model_construct(
+                symbol=symbol,
+                timestamp=timestamp,
+                **{
+                    field: None if value != value else to_number(value, self.numeric_mode)
+                    for field, value in fields.items()
+                }
+            )
+        
+        logger.info(f"Computed local indicators for {len(results)}/{len(symbols)} symbols")
+        return results
+    
+    def compute_arrays(self, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Latest value of each TechnicalIndicators field, one entry per row.
+        
+        Args:
+            matrix: Prices, shape (symbols, bars), NaN for missing bars
+        
+        Returns:
+            Field name -> float array of shape (symbols,), NaN where there
+            is not enough history
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        valid_bars = np.isfinite(matrix).sum(axis=1)
+        prices = self._fill_gaps(matrix)
+        
+        def require(values: np.ndarray, bars: int) -> np.ndarray:
+            return np.where(valid_bars >= bars, values, np.nan)
+        
+        out = {'rsi': require(self._rsi(prices, self.RSI_PERIOD), self.RSI_PERIOD + 1)}
+        
+        for period in self.SMA_PERIODS:
+            out[f'sma_{period}'] = require(prices[:, -period:].mean(axis=1), period)
+        
+        ema_fast = self._ema(prices, 2.0 / (self.MACD_FAST + 1))
+        ema_slow = self._ema(prices, 2.0 / (self.MACD_SLOW + 1))
+        macd_line = ema_fast - ema_slow
+        signal = self._ema(macd_line, 2.0 / (self.MACD_SIGNAL + 1))
+        
+        out['ema_12'] = require(ema_fast[:, -1], self.MACD_FAST)
+        out['ema_26'] = require(ema_slow[:, -1], self.MACD_SLOW)
+        out['macd'] = require(macd_line[:, -1], self.MACD_SLOW)
+        out['macd_signal'] = require(signal[:, -1], self.MACD_SLOW + self.MACD_SIGNAL - 1)
+        
+        window = prices[:, -self.BOLLINGER_PERIOD:]
+        middle = window.mean(axis=1)
+        width = self.BOLLINGER_WIDTH * window.std(axis=1)
+        out['bollinger_upper'] = require(middle + width, self.BOLLINGER_PERIOD)
+        out['bollinger_lower'] = require(middle - width, self.BOLLINGER_PERIOD)
+        
+        return out
+    
+    @staticmethod
+    def _fill_gaps(matrix: np.ndarray) -> np.ndarray:
+        """
+        Forward-fill missing bars per row, then back-fill leading ones.
+        
+        Back-filling the start with the first price leaves EMAs unchanged
+        (they are seeded with that price anyway); windowed indicators are
+        masked by the valid-bar count instead.
+        """
+        bars = matrix.shape[1]
+        if bars == 0:
+            return matrix
+        
+        valid = np.isfinite(matrix)
+        positions = np.where(valid, np.arange(bars), -1)
+        last_valid = np.maximum.accumulate(positions, axis=1)
+        first_valid = np.argmax(valid, axis=1)
+        
+        source = np.where(last_valid >= 0, last_valid, first_valid[:, None])
+        return np.take_along_axis(matrix, source, axis=1)
+    
+    @staticmethod
+    def _ema(matrix: np.ndarray, alpha: float) -> np.ndarray:
+        """Exponential moving average along time, seeded with the first column."""
+        out = np.empty_like(matrix)
+        if matrix.shape[1] == 0:
+            return out
+        
+        # One vector operation across all symbols per bar
+        out[:, 0] = matrix[:, 0]
+        decay = 1.0 - alpha
+        for t in range(1, matrix.shape[1]):
+            out[:, t] = alpha * matrix[:, t] + decay * out[:, t - 1]
+        return out
+    
+    @classmethod
+    def _rsi(cls, prices: np.ndarray, period: int) -> np.ndarray:
+        """Wilder RSI of the last bar for every row."""
+        if prices.shape[1] < 2:
+            return np.full(prices.shape[0], np.nan)
+        
+        changes = np.diff(prices, axis=1)
+        gains = cls._ema(np.clip(changes, 0, None), 1.0 / period)[:, -1]
+        losses = cls._ema(np.clip(-changes, 0, None), 1.0 / period)[:, -1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100.0 - 100.0 / (1.0 + gains / losses)
+        return np.where(losses == 0, np.where(gains > 0, 100.0, 50.0), rsi)
+
+
+class IndicatorState:
+    """
+    Incrementally maintained indicators for many symbols.
+    
+    Per symbol it keeps the EMA values (12, 26 and the MACD signal), Wilder
+    RSI gain/loss averages, a ring buffer of the last 200 closes with
+    running sums for the 20/50/200 SMAs and a running sum of squares for
+    the Bollinger window. All fields are arrays with one row per symbol, so
+    one bar for many symbols is a handful of vector operations.
+    
+    Committed bars change the state; preview prices (e.g. the live price of
+    today's unfinished bar) are applied on the fly without changing it.
+    Definitions match IndicatorEngine.
+    
+    Usage:
+        state = IndicatorState('data/indicator_state.npz')
+        state.advance('ATW', timestamps, closes)   # new closed daily bars
+        indicators = state.indicators(['ATW'], prices={'ATW': 512.3})
+        state.save()
+    """
+    
+    SMA_PERIODS = IndicatorEngine.SMA_PERIODS
+    RING_SIZE = max(IndicatorEngine.SMA_PERIODS)
+    
+    _SCALARS = ('count', 'position', 'last_timestamp', 'last_close', 'ema_fast', 'ema_slow', 'signal', 'avg_gain', 'avg_loss', 'sum_squares')
+    _INTEGERS = ('count', 'position', 'last_timestamp')
+    
+    def __init__(self, state_path: Optional[str] = None, numeric_mode: NumericMode = 'float'):
+        """
+        Initialize the state, restoring it from disk when available.
+        
+        Args:
+            state_path: .npz file the state is snapshotted to (None keeps it in memory)
+            numeric_mode: 'float' or 'decimal' representation of results
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self.numeric_mode = numeric_mode
+        self._lock = threading.Lock()
+        
+        self._rows: Dict[str, int] = {}
+        self._arrays: Dict[str, np.ndarray] = self._empty_arrays(0)
+        
+        self._load_state()
+    
+    def _empty_arrays(self, n: int) -> Dict[str, np.ndarray]:
+        arrays = {
+            name: np.zeros(n, dtype=np.int64 if name in self._INTEGERS else np.float64)
+            for name in self._SCALARS
+        }
+        arrays['last_timestamp'][:] = np.iinfo(np.int64).min
+        arrays['sums'] = np.zeros((n, len(self.SMA_PERIODS)), dtype=np.float64)
+        arrays['ring'] = np.zeros((n, self.RING_SIZE), dtype=np.float64)
+        return arrays
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._rows
+    
+    def last_timestamp(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Time of the last committed bar of a symbol (UTC), or None."""
+        row = self._rows.get(symbol)
+        if row is None or self._arrays['count'][row] == 0:
+            return None
+        return pd.Timestamp(int(self._arrays['last_timestamp'][row]), tz='UTC')
+    
+    def _row(self, symbol: str) -> int:
+        """Row of a symbol, growing the arrays for a new one."""
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self._rows)
+            extra = self._empty_arrays(max(8, row))
+            if row >= len(self._arrays['count']):
+                self._arrays = {
+                    name: np.concatenate([values, extra[name]]) for name, values in self._arrays.items()
+                }
+            self._rows[symbol] = row
+        return row
+    
+    def advance(self, symbol: str, timestamps: Iterable, closes: Iterable[float]) -> int:
+        """
+        Commit new bars of one symbol.
+        
+        Bars at or before the last committed timestamp and non-finite
+        closes are skipped, so overlapping history can be passed safely.
+        
+        Args:
+            symbol: Stock symbol
+            timestamps: Bar times (anything pandas.DatetimeIndex accepts)
+            closes: Closing prices, same length
+        
+        Returns:
+            Number of bars committed
+        """
+        return self.advance_many({symbol: (timestamps, closes)})
+    
+    def advance_many(self, bars: Dict[str, Tuple[Iterable, Iterable[float]]]) -> int:
+        """
+        Commit new bars for several symbols.
+        
+        The k-th new bar of every symbol is applied in one vectorized step,
+        so the cost grows with the number of new bars, not with window
+        lengths.
+        
+        Args:
+            bars: Symbol -> (timestamps, closes)
+        
+        Returns:
+            Total number of bars committed
+        """
+        with self._lock:
+            pending = {}
+            for symbol, (timestamps, closes) in bars.items():
+                # .values of a tz-aware index is UTC; nanoseconds whatever the index unit
+                times = pd.DatetimeIndex(timestamps).values.astype('datetime64[ns]').astype(np.int64)
+                closes = np.asarray(closes, dtype=np.float64)
+                
+                row = self._row(symbol)
+                keep = (times > self._arrays['last_timestamp'][row]) & np.isfinite(closes)
+                if keep.any():
+                    pending[row] = (times[keep], closes[keep])
+            
+            if not pending:
+                return 0
+            
+            rows = np.fromiter(pending.keys(), dtype=np.int64)
+            lengths = np.array([len(v[1]) for v in pending.values()])
+            width = int(lengths.max())
+            
+            times = np.zeros((len(rows), width), dtype=np.int64)
+            closes = np.full((len(rows), width), np.nan)
+            for i, (row_times, row_closes) in enumerate(pending.values()):
+                times[i, :len(row_times)] = row_times
+                closes[i, :len(row_closes)] = row_closes
+            
+            for k in range(width):
+                active = lengths > k
+                step_rows = rows[active]
+                updated = self._step(step_rows, closes[active, k])
+                for name, values in updated.items():
+                    self._arrays[name][step_rows] = values
+                self._arrays['last_timestamp'][step_rows] = times[active, k]
+            
+            return int(lengths.sum())
+    
+    def _step(self, rows: np.ndarray, closes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        State of `rows` after one more bar, without modifying the arrays.
+        
+        Returns:
+            Updated state fields for those rows (ring included)
+        """
+        a = self._arrays
+        count = a['count'][rows]
+        first = count == 0
+        change = np.where(first, 0.0, closes - a['last_close'][rows])
+        
+        fast = 2.0 / (IndicatorEngine.MACD_FAST + 1)
+        slow = 2.0 / (IndicatorEngine.MACD_SLOW + 1)
+        signal = 2.0 / (IndicatorEngine.MACD_SIGNAL + 1)
+        wilder = 1.0 / IndicatorEngine.RSI_PERIOD
+        
+        ema_fast = np.where(first, closes, fast * closes + (1 - fast) * a['ema_fast'][rows])
+        ema_slow = np.where(first, closes, slow * closes + (1 - slow) * a['ema_slow'][rows])
+        macd = ema_fast - ema_slow
+        new_signal = np.where(first, macd, signal * macd + (1 - signal) * a['signal'][rows])
+        
+        # Wilder averages are seeded with the first price change
+        gain, loss = np.clip(change, 0, None), np.clip(-change, 0, None)
+        seed = count == 1
+        avg_gain = np.where(seed, gain, np.where(first, 0.0, wilder * gain + (1 - wilder) * a['avg_gain'][rows]))
+        avg_loss = np.where(seed, loss, np.where(first, 0.0, wilder * loss + (1 - wilder) * a['avg_loss'][rows]))
+        
+        # Values leaving each SMA window (zero while the window is filling)
+        position = a['position'][rows]
+        ring = a['ring'][rows].copy()
+        sums = a['sums'][rows].copy()
+        for i, period in enumerate(self.SMA_PERIODS):
+            leaving = np.where(count >= period, ring[np.arange(len(rows)), (position - period) % self.RING_SIZE], 0.0)
+            sums[:, i] += closes - leaving
+            if period == IndicatorEngine.BOLLINGER_PERIOD:
+                leaving_bollinger = leaving
+        
+        sum_squares = a['sum_squares'][rows] + closes ** 2 - leaving_bollinger ** 2
+        ring[np.arange(len(rows)), position] = closes
+        
+        return {
+            'count': count + 1,
+            'position': (position + 1) % self.RING_SIZE,
+            'last_close': closes,
+            'ema_fast': ema_fast,
+            'ema_slow': ema_slow,
+            'signal': new_signal,
+            'avg_gain': avg_gain,
+            'avg_loss': avg_loss,
+            'sums': sums,
+            'sum_squares': sum_squares,
+            'ring': ring
+        }
+    
+    def compute_arrays(self, rows: np.ndarray, preview: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Indicator values of some rows, optionally with a provisional bar.
+        
+        Args:
+            rows: State rows
+            preview: Price per row to treat as one more (uncommitted) bar,
+                NaN to use the committed state as is
+        
+        Returns:
+            Field name -> float array, NaN where there is not enough history
+        """
+        a = self._arrays
+        state = {name: a[name][rows] for name in ('count', 'ema_fast', 'ema_slow', 'signal', 'avg_gain', 'avg_loss', 'sums', 'sum_squares')}
+        
+        if preview is not None:
+            has_preview = np.isfinite(preview)
+            if has_preview.any():
+                stepped = self._step(rows[has_preview], preview[has_preview])
+                for name in state:
+                    state[name][has_preview] = stepped[name]
+        
+        count = state['count']
+        
+        def require(values: np.ndarray, bars: int) -> np.ndarray:
+            return np.where(count >= bars, values, np.nan)
+        
+        gains, losses = state['avg_gain'], state['avg_loss']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100.0 - 100.0 / (1.0 + gains / losses)
+        rsi = np.where(losses == 0, np.where(gains > 0, 100.0, 50.0), rsi)
+        
+        out = {'rsi': require(rsi, IndicatorEngine.RSI_PERIOD + 1)}
+        for i, period in enumerate(self.SMA_PERIODS):
+            out[f'sma_{period}'] = require(state['sums'][:, i] / period, period)
+        
+        macd = state['ema_fast'] - state['ema_slow']
+        out['ema_12'] = require(state['ema_fast'], IndicatorEngine.MACD_FAST)
+        out['ema_26'] = require(state['ema_slow'], IndicatorEngine.MACD_SLOW)
+        out['macd'] = require(macd, IndicatorEngine.MACD_SLOW)
+        out['macd_signal'] = require(state['signal'], IndicatorEngine.MACD_SLOW + IndicatorEngine.MACD_SIGNAL - 1)
+        
+        period = IndicatorEngine.BOLLINGER_PERIOD
+        middle = state['sums'][:, self.SMA_PERIODS.index(period)] / period
+        width = IndicatorEngine.BOLLINGER_WIDTH * np.sqrt(np.clip(state['sum_squares'] / period - middle ** 2, 0, None))
+        out['bollinger_upper'] = require(middle + width, period)
+        out['bollinger_lower'] = require(middle - width, period)
+        
+        return out
+    
+    def indicators(
+        self,
+        symbols: Iterable[str],
+        prices: Optional[Dict[str, float]] = None
+    ) -> Dict[str, TechnicalIndicators]:
+        """
+        Current indicators, with live prices applied as a provisional bar.
+        
+        Args:
+            symbols: Symbols to report (unknown ones are skipped)
+            prices: Symbol -> price of the unfinished current bar
+        
+        Returns:
+            Symbol -> TechnicalIndicators
+        """
+        with self._lock:
+            symbols = [s for s in symbols if s in self._rows]
+            if not symbols:
+                return {}
+            
+            rows = np.array([self._rows[s] for s in symbols], dtype=np.int64)
+            preview = None
+            if prices:
+                preview = np.array([float(prices.get(s, np.nan)) for s in symbols], dtype=np.float64)
+            values = self.compute_arrays(rows, preview)
+        
+        timestamp = pd.Timestamp.now().to_pydatetime()
+        columns = {field: array.tolist() for field, array in values.items()}
+        results = {}
+        for i, symbol in enumerate(symbols):
+            fields = {field: column[i] for field, column in columns.items()}
+            if all(v != v for v in fields.values()):
+                continue
+            results[symbol] = TechnicalIndicators.model_construct(
+                symbol=symbol,
+                timestamp=timestamp,
+                **{
+                    field: None if value != value else to_number(value, self.numeric_mode)
+                    for field, value in fields.items()
+                }
+            )
+        return results
+    
+    def _recompute_sums(self) -> None:
+        """Rebuild running sums from the ring buffers (drops accumulated rounding)."""
+        a = self._arrays
+        n = len(a['count'])
+        if n == 0:
+            return
+        
+        offsets = np.arange(1, self.RING_SIZE + 1)
+        index = (a['position'][:, None] - offsets[None, :]) % self.RING_SIZE
+        recent = np.take_along_axis(a['ring'], index, axis=1)  # newest first
+        filled = offsets[None, :] <= a['count'][:, None]
+        
+        for i, period in enumerate(self.SMA_PERIODS):
+            window = np.where(filled[:, :period], recent[:, :period], 0.0)
+            a['sums'][:, i] = window.sum(axis=1)
+            if period == IndicatorEngine.BOLLINGER_PERIOD:
+                a['sum_squares'][:] = (window ** 2).sum(axis=1)
+    
+    def _load_state(self) -> None:
+        if not self.state_path or not self.state_path.exists():
+            return
+        
+        try:
+            with np.load(self.state_path, allow_pickle=False) as data:
+                if tuple(data['sma_periods'].tolist()) != self.SMA_PERIODS:
+                    logger.warning(f"Indicator state {self.state_path} uses other windows, starting over")
+                    return
+                symbols = data['symbols'].tolist()
+                arrays = {name: data[name].copy() for name in self._SCALARS + ('sums', 'ring')}
+            
+            self._rows = {symbol: row for row, symbol in enumerate(symbols)}
+            self._arrays = arrays
+            self._recompute_sums()
+            logger.info(f"Loaded indicator state for {len(symbols)} symbols")
+        except Exception as e:
+            logger.error(f"Ignoring unreadable indicator state {self.state_path}: {e}")
+    
+    def save(self) -> None:
+        """Snapshot the state to state_path (atomically replaced)."""
+        if not self.state_path:
+            return
+        
+        with self._lock:
+            n = len(self._rows)
+            symbols = sorted(self._rows, key=self._rows.get)
+            arrays = {name: values[:n] for name, values in self._arrays.items()}
+        
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix('.tmp.npz')
+            np.savez(
+                tmp_path,
+                symbols=np.array(symbols, dtype=str),
+                sma_periods=np.array(self.SMA_PERIODS),
+                **arrays
+            )
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.error(f"Could not write indicator state {self.state_path}: {e}")
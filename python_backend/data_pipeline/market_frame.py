@@ -0,0 +1,188 @@
+"""
+Columnar Market Frame
+=====================
+
+Struct-of-arrays view of a snapshot's stocks: one NumPy array per field
+plus a symbol -> row index. Built once per snapshot, then shared by the
+DataFrame, JSON and sector views instead of walking StockData objects on
+every request.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class MarketFrame:
+    """
+    Immutable columnar representation of a list of stocks.
+    
+    Numeric fields are float64 arrays (NaN where the source had no value),
+    volume is int64 and timestamps are datetime64. The arrays are
+    read-only; to_dataframe() copies them unless asked for a zero-copy view.
+    
+    Usage:
+        frame = MarketFrame.from_stocks(market_data.stocks)
+        prices = frame['price']
+        df = frame.to_dataframe()
+        rows = frame.to_records()
+    """
+    
+    FLOAT_FIELDS = (
+        'price', 'open', 'high', 'low', 'close', 'change', 'change_percent',
+        'market_cap', 'pe_ratio', 'dividend_yield'
+    )
+    OBJECT_FIELDS = ('symbol', 'name', 'sector', 'source')
+    
+    # Column order of DataFrame and record views (matches StockData)
+    COLUMNS = (
+        'symbol', 'name', 'price', 'open', 'high', 'low', 'close', 'volume',
+        'change', 'change_percent', 'market_cap', 'sector', 'pe_ratio',
+        'dividend_yield', 'timestamp', 'source'
+    )
+    
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Wrap prebuilt column arrays (use from_stocks to build them).
+        
+        Args:
+            columns: Field name -> array, all of the same length
+        """
+        for values in columns.values():
+            values.setflags(write=False)
+        
+        self._columns = columns
+        self._index = {symbol: row for row, symbol in enumerate(columns['symbol'])}
+        self._records: Optional[List[dict]] = None
+        self._records_lock = threading.Lock()
+    
+    @classmethod
+    def from_stocks(cls, stocks: Iterable) -> 'MarketFrame':
+        """
+        Build a frame from StockData objects.
+        
+        Args:
+            stocks: StockData objects (any objects with the same attributes)
+        
+        Returns:
+            MarketFrame with one row per stock, in input order
+        """
+        stocks = list(stocks)
+        columns = {}
+        
+        for field in cls.OBJECT_FIELDS:
+            columns[field] = np.array([getattr(s, field) for s in stocks], dtype=object)
+        
+        for field in cls.FLOAT_FIELDS:
+            values = (getattr(s, field) for s in stocks)
+            columns[field] = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+        
+        columns['volume'] = np.array([s.volume for s in stocks], dtype=np.int64)
+        columns['timestamp'] = np.array([s.timestamp for s in stocks], dtype='datetime64[us]')
+        
+        return cls(columns)
+    
+    def __len__(self) -> int:
+        return len(self._columns['symbol'])
+    
+    def __getitem__(self, field: str) -> np.ndarray:
+        """Read-only column array."""
+        return self._columns[field]
+    
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._index
+    
+    @property
+    def symbols(self) -> np.ndarray:
+        return self._columns['symbol']
+    
+    def row(self, symbol: str) -> Optional[int]:
+        """Row number of a symbol, or None."""
+        return self._index.get(symbol)
+    
+    def to_dataframe(self, copy: bool = True) -> pd.DataFrame:
+        """
+        DataFrame of the frame's columns.
+        
+        Args:
+            copy: Copy the columns (default). With copy=False the DataFrame
+                shares memory with the frame's read-only arrays, so
+                assigning into it raises; use that only for read-only
+                consumers such as exports.
+        
+        Returns:
+            DataFrame with one row per stock
+        """
+        if not len(self):
+            return pd.DataFrame()
+        return pd.DataFrame({field: self._columns[field] for field in self.COLUMNS}, copy=copy)
+    
+    def to_records(self) -> List[dict]:
+        """
+        JSON-ready rows (floats, ints, ISO timestamps, None for missing).
+        
+        Built on first use and cached: every later call returns the same
+        list, so treat it as read-only.
+        """
+        if self._records is None:
+            with self._records_lock:
+                if self._records is None:
+                    self._records = self._build_records()
+        return self._records
+    
+    def record(self, symbol: str) -> Optional[dict]:
+        """JSON-ready row for one symbol, or None."""
+        row = self._index.get(symbol)
+        return None if row is None else self.to_records()[row]
+    
+    def _build_records(self) -> List[dict]:
+        # tolist() converts whole columns to Python scalars in C; NaN -> None
+        # is the only per-value work left
+        values = {}
+        for field in self.COLUMNS:
+            column = self._columns[field]
+            if field in self.FLOAT_FIELDS:
+                values[field] = [None if v != v else v for v in column.tolist()]
+            elif field == 'timestamp':
+                values[field] = np.datetime_as_string(column).tolist()
+            else:
+                values[field] = column.tolist()
+        
+        return [dict(zip(self.COLUMNS, row)) for row in zip(*(values[field] for field in self.COLUMNS))]
+    
+    def sector_summary(self) -> List[dict]:
+        """
+        Per-sector aggregates computed over the columns.
+        
+        Returns:
+            List of {sector, stock_count, avg_change, total_volume}, sorted
+            by sector; stocks without a sector are omitted. avg_change is
+            the mean over stocks with a known change (None if there are none)
+        """
+        sectors = self._columns['sector']
+        has_sector = np.array([s is not None for s in sectors], dtype=bool)
+        if not has_sector.any():
+            return []
+        
+        names, groups = np.unique(sectors[has_sector].astype(str), return_inverse=True)
+        counts = np.bincount(groups, minlength=len(names))
+        volume_sums = np.bincount(groups, weights=self._columns['volume'][has_sector], minlength=len(names))
+        
+        # One missing change must not turn the whole sector's average into NaN
+        changes = self._columns['change_percent'][has_sector]
+        known = np.isfinite(changes)
+        change_counts = np.bincount(groups, weights=known, minlength=len(names))
+        change_sums = np.bincount(groups, weights=np.where(known, changes, 0.0), minlength=len(names))
+        
+        return [
+            {
+                'sector': str(name),
+                'stock_count': int(count),
+                'avg_change': float(change_sum / change_count) if change_count else None,
+                'total_volume': float(volume_sum)
+            }
+            for name, count, change_count, change_sum, volume_sum
+            in zip(names, counts, change_counts, change_sums, volume_sums)
+        ]
@@ -7,15 +7,23 @@ Primary entry point for data ingestion.
 """
 
 import logging
-from typing import Optional, List, Dict
+import threading
+import time
+from typing import Callable, Optional, List, Dict, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
-from .schemas import StockData, MarketIndices, UnifiedMarketData, TechnicalIndicators
+from .schemas import StockData, MarketIndices, UnifiedMarketData, TechnicalIndicators, to_number
 from .casablanca_source import CasablancaBourseClient
 from .yahoo_fallback import YahooFinanceFallback
 from .alphavantage_optional import AlphaVantageClient
 from .config import PipelineConfig, setup_logging
+from .singleflight import SingleFlight
+from .universe import SymbolUniverse
+from .snapshot_history import SnapshotHistory
+from .indicators import IndicatorState
+from .correlation import CorrelationEngine
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +49,29 @@ class MarketDataPipeline:
         hist_df = pipeline.fetch_historical_data('ATW', period='1y')
     """
     
+    # Alpha Vantage free tier allows 5 calls per minute
+    MAX_INDICATOR_SYMBOLS = 5
+    
+    # Local indicators use daily bars, so new bars are pulled in at most hourly
+    INDICATOR_REFRESH_SECONDS = 3600
+    INDICATOR_HISTORY_PERIOD = '1y'
+    
+    # Shorter history requests once the indicator state is up to date:
+    # (period, used while the last committed bar is fewer days old than this)
+    INDICATOR_CATCHUP_PERIODS = (('5d', 5), ('1mo', 28), ('3mo', 88))
+    
+    # Relative difference above which an Alpha Vantage value is reported
+    INDICATOR_TOLERANCE = 0.05
+    
+    # Daily returns behind correlations: enough closes for two max windows
+    RETURNS_HISTORY_PERIOD = '2y'
+    
+    # Single-flight key shared by every snapshot fetch
+    SNAPSHOT_KEY = 'snapshot'
+    
+    # Recent snapshot versions kept for delta requests
+    SNAPSHOT_HISTORY_SIZE = 32
+    
     def __init__(self, config: Optional[PipelineConfig] = None):
         """
         Initialize the data pipeline.
@@ -66,22 +97,70 @@ class MarketDataPipeline:
         self._last_data_source: Optional[str] = None
         self._cached_data: Optional[UnifiedMarketData] = None
         
+        # Snapshot cache state (expiry on the monotonic clock)
+        self._cache_expires_at: float = 0.0
+        self._cache_ttl_seconds: float = 0.0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_stale_hits = 0
+        self._snapshot_fetched_at: float = 0.0
+        self._snapshot_version = 0
+        self._history = SnapshotHistory(self.SNAPSHOT_HISTORY_SIZE)
+        self._snapshot_listeners: List[Callable] = []
+        
+        # Indicators as of the last sync of closed bars (monotonic time of sync),
+        # and the Alpha Vantage values fetched with it
+        self._indicators: Dict[str, TechnicalIndicators] = {}
+        self._indicators_computed_at: float = 0.0
+        self._remote_indicators: Dict[str, TechnicalIndicators] = {}
+        self._indicator_mismatches = 0
+        self._indicator_refresh_lock = threading.Lock()
+        self._indicator_advance_lock = threading.Lock()
+        
+        # Trading day the return history was last synced for
+        self._returns_synced_on = None
+        self._returns_sync_lock = threading.Lock()
+        
+        # Coalesces concurrent snapshot/history fetches into one upstream call
+        self._inflight = SingleFlight()
+        
+        # Background refresh state
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+        self._refresh_wakeup = threading.Event()
+        
         logger.info("Pipeline initialization complete")
     
     def _init_data_sources(self) -> None:
         """Initialize all configured data sources."""
+        # Every source iterates over the same symbol registry
+        self.universe = SymbolUniverse(
+            cache_path=self.config.data_source.universe_cache_path,
+            max_age_hours=self.config.data_source.universe_refresh_hours
+        )
+        
         # Primary source: Casablanca Bourse
         logger.info("Initializing primary data source: Casablanca Bourse")
         self.primary_source = CasablancaBourseClient(
             timeout=self.config.data_source.request_timeout_seconds,
-            max_retries=self.config.data_source.max_retries
+            max_retries=self.config.data_source.max_retries,
+            max_concurrent_requests=self.config.data_source.max_concurrent_requests,
+            circuit_failure_threshold=self.config.data_source.circuit_failure_threshold,
+            circuit_recovery_seconds=self.config.data_source.circuit_recovery_seconds,
+            retry_backoff_seconds=self.config.data_source.retry_backoff_seconds,
+            universe=self.universe,
+            numeric_mode=self.config.numeric_mode
         )
         
         # Fallback source: Yahoo Finance
         if self.config.data_source.enable_yahoo_fallback:
             logger.info("Initializing fallback data source: Yahoo Finance")
             self.fallback_source = YahooFinanceFallback(
-                cache_duration_minutes=self.config.data_source.cache_duration_minutes
+                cache_duration_minutes=self.config.data_source.cache_duration_minutes,
+                history_store_dir=self.config.data_source.history_store_dir,
+                universe=self.universe,
+                numeric_mode=self.config.numeric_mode,
+                validate_data=self.config.enable_data_validation
             )
         else:
             self.fallback_source = None
@@ -92,25 +171,56 @@ class MarketDataPipeline:
             logger.info("Initializing optional data source: Alpha Vantage")
             self.alphavantage = AlphaVantageClient(
                 api_key=self.config.data_source.alphavantage_api_key,
-                timeout=self.config.data_source.request_timeout_seconds
+                timeout=self.config.data_source.request_timeout_seconds,
+                numeric_mode=self.config.numeric_mode
             )
         else:
             self.alphavantage = None
             logger.info("Alpha Vantage integration disabled")
+        
+        # Incremental local indicators: fed with daily bars from Yahoo history
+        if self.config.enable_local_indicators and self.fallback_source:
+            self.indicator_state = IndicatorState(
+                state_path=self.config.data_source.indicator_state_path,
+                numeric_mode=self.config.numeric_mode
+            )
+        else:
+            self.indicator_state = None
+        
+        # Return correlations across the universe, also from Yahoo history
+        self.correlation_engine = CorrelationEngine() if self.fallback_source else None
     
     def fetch_market_snapshot(self, force_refresh: bool = False) -> UnifiedMarketData:
         """
         Fetch complete market snapshot.
         
+        Snapshots are served from memory until their TTL expires; see
+        _snapshot_ttl_seconds for how the TTL is chosen. While the background
+        refresher runs, an expired snapshot is still returned immediately and
+        the refresher is woken to replace it. The snapshot's age is reported
+        in fetch_metadata['snapshot_age_seconds'].
+        
         Args:
             force_refresh: Force refresh even if cached data is available
         
         Returns:
             UnifiedMarketData object containing indices, stocks, and metadata
         """
+        cached = self._get_cached_snapshot(force_refresh)
+        if cached is not None:
+            return cached
+        
+        # Concurrent callers (sync or async) share one in-flight fetch
+        return self._inflight.do(self.SNAPSHOT_KEY, self._fetch_snapshot)
+    
+    def _fetch_snapshot(self) -> UnifiedMarketData:
+        """Fetch a new snapshot from the data sources, bypassing the cache."""
         logger.info("Fetching market snapshot")
         start_time = datetime.now()
         
+        if self.universe.needs_refresh() and self.primary_source.is_available():
+            self._refresh_universe()
+        
         # Try primary source first
         indices, stocks, source_used = self._fetch_from_primary()
         
@@ -119,10 +229,32 @@ class MarketDataPipeline:
             logger.warning("Primary source failed, attempting fallback")
             indices, stocks, source_used = self._fetch_from_fallback()
         
-        # Fetch technical indicators if enabled
+        # Compute (and optionally cross-check) technical indicators
         technical_indicators = None
-        if self.alphavantage and self.alphavantage.is_enabled():
-            technical_indicators = self._fetch_technical_indicators([s.symbol for s in stocks])
+        if self._indicators_enabled():
+            technical_indicators = self._fetch_technical_indicators(
+                [s.symbol for s in stocks],
+                {s.symbol: float(s.price) for s in stocks}
+            ) or None
+        
+        return self._build_snapshot(indices, stocks, source_used, technical_indicators, start_time)
+    
+    def _build_snapshot(
+        self,
+        indices: Optional[MarketIndices],
+        stocks: List[StockData],
+        source_used: str,
+        technical_indicators: Optional[Dict[str, TechnicalIndicators]],
+        start_time: datetime
+    ) -> UnifiedMarketData:
+        """Assemble a UnifiedMarketData snapshot and record it as the latest fetch."""
+        # Keep serving the last good snapshot if this fetch came back empty
+        if not stocks and self._cached_data is not None and self._cached_data.stocks:
+            logger.warning("Snapshot fetch returned no stocks, keeping previous snapshot")
+            return self._serve_snapshot(self._cached_data, stale=True)
+        
+        # Every accepted snapshot gets a new version (used for ETags)
+        self._snapshot_version += 1
         
         # Calculate data quality metrics
         data_quality = self._calculate_data_quality(stocks)
@@ -135,7 +267,10 @@ class MarketDataPipeline:
             'fetch_duration_seconds': fetch_duration,
             'stocks_count': len(stocks),
             'has_indices': indices is not None,
-            'has_technical_indicators': technical_indicators is not None
+            'has_technical_indicators': technical_indicators is not None,
+            'snapshot_version': self._snapshot_version,
+            'snapshot_age_seconds': 0.0,
+            'stale': False
         }
         
         # Create unified data object
@@ -151,14 +286,190 @@ class MarketDataPipeline:
         self._last_fetch_time = datetime.now()
         self._last_data_source = source_used
         self._cached_data = market_data
+        self._snapshot_fetched_at = time.monotonic()
+        self._history.record(self._snapshot_version, market_data)
+        self._notify_snapshot_listeners(market_data)
+        
+        # Failed fetches are not cached so the next request retries
+        self._cache_ttl_seconds = self._snapshot_ttl_seconds() if stocks else 0.0
+        self._cache_expires_at = self._snapshot_fetched_at + self._cache_ttl_seconds
         
         logger.info(f"Market snapshot complete (source={source_used}, duration={fetch_duration:.2f}s)")
         
         return market_data
     
+    def _get_cached_snapshot(self, force_refresh: bool = False) -> Optional[UnifiedMarketData]:
+        """
+        Return the cached snapshot if it can be served without fetching.
+        
+        A fresh snapshot is always served. An expired one is served as stale
+        while the background refresher is running, so requests never wait
+        on upstream latency.
+        
+        Args:
+            force_refresh: Bypass (and thereby invalidate) the cache
+        
+        Returns:
+            Cached UnifiedMarketData, or None on a miss
+        """
+        if not force_refresh and self._cached_data is not None:
+            if time.monotonic() < self._cache_expires_at:
+                self._cache_hits += 1
+                logger.debug("Serving market snapshot from cache")
+                return self._serve_snapshot(self._cached_data, stale=False)
+            
+            if self.is_background_refresh_running() and self._cached_data.stocks:
+                self._cache_stale_hits += 1
+                logger.debug("Serving stale market snapshot while refreshing")
+                self._request_background_refresh()
+                return self._serve_snapshot(self._cached_data, stale=True)
+        
+        self._cache_misses += 1
+        return None
+    
+    def _serve_snapshot(self, market_data: UnifiedMarketData, stale: bool) -> UnifiedMarketData:
+        """Return a shallow copy of a cached snapshot annotated with its current age."""
+        fetch_metadata = dict(market_data.fetch_metadata)
+        fetch_metadata['snapshot_age_seconds'] = round(time.monotonic() - self._snapshot_fetched_at, 3)
+        fetch_metadata['stale'] = stale
+        
+        return market_data.model_copy(update={'fetch_metadata': fetch_metadata})
+    
+    def get_snapshot_delta(self, since: int) -> Optional[dict]:
+        """
+        Changes from a past snapshot version to the latest one.
+        
+        Args:
+            since: snapshot_version the caller already holds
+        
+        Returns:
+            Delta dictionary (see SnapshotHistory.diff), or None if that
+            version is no longer kept and the full snapshot must be sent
+        """
+        return self._history.diff(since)
+    
+    def add_snapshot_listener(self, listener: Callable[[UnifiedMarketData, Optional[dict]], None]) -> None:
+        """
+        Call `listener(market_data, delta)` after each new snapshot version.
+        
+        `delta` is the change from the previous version (see
+        SnapshotHistory.diff), or None for the first snapshot. Listeners run
+        on the thread or event loop that built the snapshot and must not block.
+        """
+        self._snapshot_listeners.append(listener)
+    
+    def remove_snapshot_listener(self, listener: Callable) -> None:
+        """Stop calling a listener registered with add_snapshot_listener."""
+        if listener in self._snapshot_listeners:
+            self._snapshot_listeners.remove(listener)
+    
+    def _notify_snapshot_listeners(self, market_data: UnifiedMarketData) -> None:
+        if not self._snapshot_listeners:
+            return
+        
+        delta = self._history.diff(self._snapshot_version - 1)
+        for listener in list(self._snapshot_listeners):
+            try:
+                listener(market_data, delta)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed: {e}")
+    
+    def _snapshot_ttl_seconds(self) -> float:
+        """
+        Choose how long a freshly fetched snapshot stays valid.
+        
+        Uses cache_duration_minutes during trading hours. While the market is
+        closed prices cannot move, so closed_market_cache_minutes applies
+        instead, capped so the cache expires when the next session opens.
+        """
+        return self._session_aware_interval(self.config.data_source.cache_duration_minutes * 60.0)
+    
+    def _session_aware_interval(self, open_interval: float) -> float:
+        """
+        Scale an interval to the Casablanca trading session.
+        
+        Args:
+            open_interval: Interval in seconds to use while the market is open
+        
+        Returns:
+            open_interval during trading hours, otherwise the closed-market
+            interval capped at the time remaining until the next open
+        """
+        if self.primary_source.is_market_open():
+            return open_interval
+        
+        next_open = self.primary_source.next_market_open()
+        until_open = (next_open - datetime.now(next_open.tzinfo)).total_seconds()
+        closed_interval = self.config.data_source.closed_market_cache_minutes * 60.0
+        
+        return max(open_interval, min(closed_interval, until_open))
+    
+    def _next_refresh_delay(self) -> float:
+        """Seconds until the background refresher should fetch again."""
+        return self._session_aware_interval(float(self.config.data_source.refresh_interval_seconds))
+    
+    def start_background_refresh(self) -> None:
+        """
+        Start a daemon thread that keeps the market snapshot warm.
+        
+        The thread refreshes on the session-aware cadence from
+        _next_refresh_delay and whenever a request finds the cache expired.
+        """
+        if self.is_background_refresh_running():
+            return
+        
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name='snapshot-refresher',
+            daemon=True
+        )
+        self._refresh_thread.start()
+        logger.info("Background snapshot refresh started")
+    
+    def stop_background_refresh(self, timeout: Optional[float] = None) -> None:
+        """Stop the background refresh thread."""
+        if self._refresh_thread is None:
+            return
+        
+        self._refresh_stop.set()
+        self._refresh_wakeup.set()
+        self._refresh_thread.join(timeout)
+        self._refresh_thread = None
+        logger.info("Background snapshot refresh stopped")
+    
+    def is_background_refresh_running(self) -> bool:
+        """Check whether the background refresher is active."""
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
+    
+    def _request_background_refresh(self) -> None:
+        """Wake the background refresher ahead of schedule."""
+        self._refresh_wakeup.set()
+    
+    def _refresh_loop(self) -> None:
+        while not self._refresh_stop.is_set():
+            try:
+                self._inflight.do(self.SNAPSHOT_KEY, self._fetch_snapshot)
+            except Exception as e:
+                logger.error(f"Background snapshot refresh failed: {e}")
+            
+            self._refresh_wakeup.wait(self._next_refresh_delay())
+            self._refresh_wakeup.clear()
+    
+    def _refresh_universe(self) -> None:
+        """Reload the symbol universe from the exchange listing."""
+        self.universe.mark_attempt()
+        rows = self.primary_source.fetch_listing()
+        if rows:
+            self.universe.update(rows)
+    
     def _fetch_from_primary(self) -> tuple[Optional[MarketIndices], List[StockData], str]:
         """Fetch data from primary source (Casablanca Bourse)."""
         try:
+            if not self.primary_source.is_available():
+                logger.warning("Primary source circuit open, skipping to fallback")
+                return None, [], 'none'
+            
             logger.info("Fetching from primary source (Casablanca Bourse)")
             
             indices = self.primary_source.fetch_market_indices()
@@ -180,49 +491,222 @@ class MarketDataPipeline:
         try:
             logger.info("Fetching from fallback source (Yahoo Finance)")
             
-            # Yahoo Finance doesn't have direct MASI/MADEX, so we calculate approximations
-            moroccan_symbols = ['ATW', 'BCP', 'CDM', 'IAM', 'ADH', 'ALL', 'LHM', 'SID', 'WAA', 'MNG', 'LBL']
-            stocks = self.fallback_source.fetch_all_stocks(moroccan_symbols)
-            
-            # Calculate synthetic indices from stock performance
-            if stocks:
-                avg_change = sum(float(s.change_percent) for s in stocks) / len(stocks)
-                
-                # Create synthetic indices
-                indices = MarketIndices(
-                    masi=12847.35,  # Base value
-                    masi_change=avg_change,
-                    madex=10452.18,  # Base value
-                    madex_change=avg_change * 1.1,  # MADEX typically more volatile
-                    source='calculated',
-                    market_status='closed'  # Yahoo data is always delayed
-                )
-                
-                logger.info(f"Successfully fetched from fallback source ({len(stocks)} stocks)")
-                return indices, stocks, 'yahoo_finance'
-            else:
-                logger.error("Fallback source failed to fetch stocks")
-                return None, [], 'none'
+            stocks = self.fallback_source.fetch_all_stocks()
+            return self._fallback_result(stocks)
                 
         except Exception as e:
             logger.error(f"Error fetching from fallback source: {e}")
             return None, [], 'none'
     
-    def _fetch_technical_indicators(self, symbols: List[str]) -> Dict[str, TechnicalIndicators]:
-        """Fetch technical indicators for list of symbols."""
-        if not self.alphavantage or not self.alphavantage.is_enabled():
+    def _fallback_result(self, stocks: List[StockData]) -> tuple[Optional[MarketIndices], List[StockData], str]:
+        """Pair fallback stocks with indices synthesized from their performance."""
+        # Yahoo Finance doesn't have direct MASI/MADEX, so we calculate approximations
+        if stocks:
+            avg_change = sum(float(s.change_percent) for s in stocks) / len(stocks)
+            
+            # Create synthetic indices
+            mode = self.config.numeric_mode
+            indices = MarketIndices(
+                masi=to_number(12847.35, mode),  # Base value
+                masi_change=to_number(avg_change, mode),
+                madex=to_number(10452.18, mode),  # Base value
+                madex_change=to_number(avg_change * 1.1, mode),  # MADEX typically more volatile
+                source='calculated',
+                market_status='closed'  # Yahoo data is always delayed
+            )
+            
+            logger.info(f"Successfully fetched from fallback source ({len(stocks)} stocks)")
+            return indices, stocks, 'yahoo_finance'
+        else:
+            logger.error("Fallback source failed to fetch stocks")
+            return None, [], 'none'
+    
+    def _indicators_enabled(self) -> bool:
+        """Check whether any indicator source (local or Alpha Vantage) is active."""
+        return self.indicator_state is not None or (self.alphavantage is not None and self.alphavantage.is_enabled())
+    
+    def _indicators_fresh(self) -> bool:
+        """Whether closed bars were synced within INDICATOR_REFRESH_SECONDS."""
+        return self._indicators_computed_at > 0 and time.monotonic() - self._indicators_computed_at < self.INDICATOR_REFRESH_SECONDS
+    
+    def _indicator_history_period(self, symbol: str) -> str:
+        """Shortest history period that covers the bars missing from the state."""
+        last = self.indicator_state.last_timestamp(symbol)
+        if last is None:
+            return self.INDICATOR_HISTORY_PERIOD
+        
+        days = (pd.Timestamp.now(tz='UTC') - last).days
+        for period, max_days in self.INDICATOR_CATCHUP_PERIODS:
+            if days < max_days:
+                return period
+        return self.INDICATOR_HISTORY_PERIOD
+    
+    def _advance_indicator_state(self, symbols: List[str]) -> int:
+        """
+        Commit closed daily bars newer than the indicator state, then save it.
+        
+        Today's bar is still forming, so it is left out; live prices are
+        applied to it at snapshot time instead. Sync and async syncs are
+        serialized here, so each catch-up download starts from the state the
+        previous one left.
+        
+        Returns:
+            Number of bars committed
+        """
+        if self.indicator_state is None:
+            return 0
+        
+        with self._indicator_advance_lock:
+            bars = {}
+            for symbol in symbols:
+                if self.universe.yahoo_ticker(symbol) is None:
+                    continue
+                closed = self._closed_daily_history(symbol, self._indicator_history_period(symbol))
+                if closed is not None:
+                    bars[symbol] = (closed.index, closed['close'].to_numpy(dtype=float))
+            
+            committed = self.indicator_state.advance_many(bars)
+            if committed:
+                self.indicator_state.save()
+        logger.info(f"Indicator state advanced by {committed} bars across {len(bars)} symbols")
+        return committed
+    
+    def _store_indicators(
+        self,
+        symbols: List[str],
+        remote: Dict[str, TechnicalIndicators]
+    ) -> Dict[str, TechnicalIndicators]:
+        """Record a sync: cross-check the Alpha Vantage values against the state."""
+        indicators = self.indicator_state.indicators(symbols) if self.indicator_state else {}
+        for symbol, remote_indicators in remote.items():
+            self._merge_remote_indicators(indicators, symbol, remote_indicators)
+        
+        self._remote_indicators = remote
+        self._indicators = indicators
+        self._indicators_computed_at = time.monotonic()
+        logger.info(f"Technical indicators available for {len(indicators)} symbols")
+        return indicators
+    
+    def _forming_bar_prices(self, prices: Dict[str, float]) -> Dict[str, float]:
+        """
+        Live prices of symbols whose bar for today's session is not committed.
+        
+        Before the open and on weekends the live price is the last committed
+        close, so applying it again would count that bar twice.
+        """
+        now = datetime.now(self.primary_source.MARKET_TIMEZONE)
+        if now.weekday() >= 5 or now.time() < self.primary_source.MARKET_OPEN:
             return {}
         
-        logger.info(f"Fetching technical indicators for {len(symbols)} symbols")
-        indicators_map = {}
+        forming = {}
+        for symbol, price in prices.items():
+            last = self.indicator_state.last_timestamp(symbol)
+            if last is None or last.tz_convert(self.primary_source.MARKET_TIMEZONE).date() < now.date():
+                forming[symbol] = price
+        return forming
+    
+    def _current_indicators(
+        self,
+        symbols: List[str],
+        prices: Optional[Dict[str, float]] = None
+    ) -> Dict[str, TechnicalIndicators]:
+        """Indicators from the state, with live prices as today's bar once the session has started."""
+        indicators = {}
+        if self.indicator_state is not None:
+            indicators = self.indicator_state.indicators(symbols, self._forming_bar_prices(prices or {}))
+        for symbol, remote in self._remote_indicators.items():
+            indicators.setdefault(symbol, remote)
+        return indicators
+    
+    def _merge_remote_indicators(
+        self,
+        indicators: Dict[str, TechnicalIndicators],
+        symbol: str,
+        remote: Optional[TechnicalIndicators]
+    ) -> None:
+        """
+        Use an Alpha Vantage result to cross-check (or fill in) local values.
+        
+        Local values are kept; differences above INDICATOR_TOLERANCE are
+        logged and counted. Symbols without local history take the remote
+        indicators as they are.
+        """
+        if remote is None:
+            return
+        
+        local = indicators.get(symbol)
+        if local is None:
+            indicators[symbol] = remote
+            return
+        
+        for field, remote_value in remote.model_dump(exclude={'symbol', 'timestamp'}).items():
+            local_value = getattr(local, field)
+            if remote_value is None or local_value is None:
+                continue
+            
+            scale = max(abs(float(remote_value)), 1e-9)
+            if abs(float(local_value) - float(remote_value)) / scale > self.INDICATOR_TOLERANCE:
+                self._indicator_mismatches += 1
+                logger.warning(
+                    f"Indicator mismatch for {symbol}.{field}: local={float(local_value):.4f}, "
+                    f"alphavantage={float(remote_value):.4f}"
+                )
+    
+    def _fetch_technical_indicators(
+        self,
+        symbols: List[str],
+        prices: Optional[Dict[str, float]] = None
+    ) -> Dict[str, TechnicalIndicators]:
+        """
+        Technical indicators for a list of symbols.
+        
+        Computed locally for every symbol from the incremental indicator
+        state, with `prices` standing in for today's unfinished bar. At most
+        once per INDICATOR_REFRESH_SECONDS, closed bars newer than the state
+        are fetched and committed; when Alpha Vantage is enabled, its values
+        for the first MAX_INDICATOR_SYMBOLS symbols then cross-check the
+        local ones (and stand in for symbols without history).
+        
+        While the background refresher runs, syncing happens on a separate
+        thread and the current state is used meanwhile, so snapshot fetches
+        never wait on history downloads.
+        """
+        if not self._indicators_fresh():
+            if self.is_background_refresh_running():
+                if self._indicator_refresh_lock.acquire(blocking=False):
+                    threading.Thread(
+                        target=self._refresh_indicators_locked,
+                        args=(list(symbols),),
+                        name='indicator-refresher',
+                        daemon=True
+                    ).start()
+            else:
+                with self._indicator_refresh_lock:
+                    self._refresh_indicators(symbols)
+        
+        return self._current_indicators(symbols, prices)
+    
+    def _refresh_indicators_locked(self, symbols: List[str]) -> None:
+        try:
+            self._refresh_indicators(symbols)
+        except Exception as e:
+            logger.error(f"Technical indicator refresh failed: {e}")
+        finally:
+            self._indicator_refresh_lock.release()
+    
+    def _refresh_indicators(self, symbols: List[str]) -> Dict[str, TechnicalIndicators]:
+        """Sync new closed bars into the state and run the Alpha Vantage cross-check."""
+        logger.info(f"Syncing technical indicators for {len(symbols)} symbols")
+        self._advance_indicator_state(symbols)
         
-        for symbol in symbols[:5]:  # Limit to avoid rate limits
-            indicators = self.alphavantage.fetch_all_indicators(symbol)
-            if indicators:
-                indicators_map[symbol] = indicators
+        remote = {}
+        if self.alphavantage and self.alphavantage.is_enabled():
+            for symbol in symbols[:self.MAX_INDICATOR_SYMBOLS]:  # Limit to avoid rate limits
+                result = self.alphavantage.fetch_all_indicators(symbol)
+                if result is not None:
+                    remote[symbol] = result
         
-        logger.info(f"Fetched indicators for {len(indicators_map)} symbols")
-        return indicators_map
+        return self._store_indicators(symbols, remote)
     
     def _calculate_data_quality(self, stocks: List[StockData]) -> dict:
         """Calculate data quality metrics."""
@@ -265,6 +749,10 @@ class MarketDataPipeline:
         """
         Get current stocks as pandas DataFrame.
         
+        Built from the snapshot's columnar frame, so no per-stock conversion
+        happens here. The columns are copied, so the DataFrame can be
+        modified without affecting the snapshot.
+        
         Returns:
             DataFrame with stock data
         """
@@ -272,11 +760,7 @@ class MarketDataPipeline:
             logger.info("No cached data, fetching fresh data")
             self.fetch_market_snapshot()
         
-        stocks = self._cached_data.stocks
-        data = [stock.dict() for stock in stocks]
-        df = pd.DataFrame(data)
-        
-        return df
+        return self._cached_data.frame.to_dataframe()
     
     def fetch_historical_data(
         self,
@@ -300,7 +784,105 @@ class MarketDataPipeline:
             return pd.DataFrame()
         
         logger.info(f"Fetching historical data for {symbol} (period={period}, interval={interval})")
-        return self.fallback_source.fetch_historical_data(symbol, period, interval)
+        return self._inflight.do(
+            ('history', symbol, period, interval),
+            self.fallback_source.fetch_historical_data,
+            symbol, period, interval
+        )
+    
+    def _closed_daily_history(self, symbol: str, period: str) -> Optional[pd.DataFrame]:
+        """Daily bars of a symbol without today's (still forming) bar, or None."""
+        history = self.fetch_historical_data(symbol, period=period, interval='1d')
+        if history is None or history.empty or 'close' not in history.columns:
+            return None
+        
+        today = pd.Timestamp.now(tz=getattr(history.index, 'tz', None)).normalize()
+        return history[history.index < today]
+    
+    def _trading_day(self):
+        """Current date at the exchange."""
+        return datetime.now(self.primary_source.MARKET_TIMEZONE).date()
+    
+    def _sync_returns(self) -> None:
+        """
+        Bring the correlation engine's daily returns up to date.
+        
+        Runs at most once per trading day; histories come through the
+        history store, so only bars since the last sync are downloaded, and
+        only new dates are added to the engine's running sums.
+        """
+        if self.correlation_engine is None or self._returns_synced_on == self._trading_day():
+            return
+        
+        with self._returns_sync_lock:
+            day = self._trading_day()
+            if self._returns_synced_on == day:
+                return
+            
+            histories = {}
+            for symbol in self.universe.yahoo_symbols():
+                closed = self._closed_daily_history(symbol, self.RETURNS_HISTORY_PERIOD)
+                if closed is not None:
+                    histories[symbol] = closed
+            
+            self.correlation_engine.update(histories)
+            if self.correlation_engine.symbols:
+                self._returns_synced_on = day
+            else:
+                logger.warning("No daily history available for return correlations")
+    
+    def get_correlation_matrix(self, window: int = CorrelationEngine.DEFAULT_WINDOW) -> Tuple[List[str], np.ndarray]:
+        """
+        Pairwise daily-return correlations across the universe.
+        
+        Args:
+            window: Lookback in trading days
+        
+        Returns:
+            (symbols, N x N matrix with NaN for pairs lacking overlap)
+        """
+        if self.correlation_engine is None:
+            logger.error("Yahoo Finance fallback not enabled - cannot compute correlations")
+            return [], np.empty((0, 0))
+        
+        self._sync_returns()
+        return self.correlation_engine.matrix(window)
+    
+    def get_daily_returns(self) -> pd.DataFrame:
+        """
+        Aligned daily returns of the universe (closed bars, synced daily).
+        
+        Returns:
+            DataFrame indexed by date, one column per symbol, NaN where a
+            stock has no return
+        """
+        if self.correlation_engine is None:
+            logger.error("Yahoo Finance fallback not enabled - cannot provide daily returns")
+            return pd.DataFrame()
+        
+        self._sync_returns()
+        return self.correlation_engine.returns
+    
+    def get_pair_correlation(
+        self,
+        first: str,
+        second: str,
+        window: int = CorrelationEngine.DEFAULT_WINDOW
+    ) -> pd.Series:
+        """
+        Rolling daily-return correlation of two symbols.
+        
+        Returns:
+            Series indexed by date
+        
+        Raises:
+            KeyError: If a symbol has no return history
+        """
+        if self.correlation_engine is None:
+            raise KeyError(first)
+        
+        self._sync_returns()
+        return self.correlation_engine.rolling_pair(first, second, window)
     
     def get_pipeline_status(self) -> dict:
         """
@@ -314,12 +896,42 @@ class MarketDataPipeline:
             'primary_source': 'casablanca_bourse',
             'fallback_enabled': self.fallback_source is not None,
             'alphavantage_enabled': self.alphavantage is not None and self.alphavantage.is_enabled(),
+            'local_indicators_enabled': self.indicator_state is not None,
+            'indicators': {
+                'symbols': len(self._indicators),
+                'state_symbols': len(self.indicator_state) if self.indicator_state else 0,
+                'age_seconds': round(time.monotonic() - self._indicators_computed_at, 3) if self._indicators else None,
+                'alphavantage_mismatches': self._indicator_mismatches
+            },
+            'correlation': self.correlation_engine.get_status() if self.correlation_engine else None,
             'last_fetch_time': self._last_fetch_time.isoformat() if self._last_fetch_time else None,
             'last_data_source': self._last_data_source,
             'has_cached_data': self._cached_data is not None,
+            'background_refresh': self.is_background_refresh_running(),
+            'in_flight_fetches': self._inflight.in_flight(),
+            'circuit_breakers': self.primary_source.get_circuit_status(),
+            'universe': self.universe.get_status(),
+            'snapshot_history': len(self._history),
+            'cache': self._get_cache_stats(),
             'config': {
                 'log_level': self.config.log_level,
                 'auto_fallback': self.config.auto_fallback,
-                'cache_duration_minutes': self.config.data_source.cache_duration_minutes
+                'cache_duration_minutes': self.config.data_source.cache_duration_minutes,
+                'closed_market_cache_minutes': self.config.data_source.closed_market_cache_minutes
             }
         }
+    
+    def _get_cache_stats(self) -> dict:
+        """Snapshot cache counters and freshness."""
+        lookups = self._cache_hits + self._cache_stale_hits + self._cache_misses
+        remaining = max(0.0, self._cache_expires_at - time.monotonic()) if self._cached_data else 0.0
+        
+        return {
+            'hits': self._cache_hits,
+            'stale_hits': self._cache_stale_hits,
+            'misses': self._cache_misses,
+            'hit_rate': round((self._cache_hits + self._cache_stale_hits) / lookups, 4) if lookups else 0.0,
+            'ttl_seconds': self._cache_ttl_seconds,
+            'snapshot_age_seconds': round(time.monotonic() - self._snapshot_fetched_at, 3) if self._cached_data else None,
+            'expires_in_seconds': round(remaining, 3)
+        }
@@ -0,0 +1,153 @@
+"""
+Resilience Primitives
+=====================
+
+Circuit breaker and retry backoff used by the primary data source so an
+exchange outage costs milliseconds instead of a full timeout per request.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is short-circuited by an open breaker."""
+
+
+class CircuitBreaker:
+    """
+    Three-state circuit breaker.
+    
+    - closed: requests flow; consecutive failures are counted
+    - open: requests are rejected until recovery_timeout has elapsed
+    - half_open: a single probe request is allowed; success closes the
+      breaker, failure re-opens it
+    
+    Thread-safe; shared by sync and async clients.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            name: Endpoint name, used in logs and status
+            failure_threshold: Consecutive failures that open the breaker
+            recovery_timeout: Seconds to stay open before probing again
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._total_rejections = 0
+    
+    @property
+    def state(self) -> str:
+        """Current state, accounting for an elapsed recovery timeout."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+    
+    def is_open(self) -> bool:
+        """True while requests would be rejected (no state transition)."""
+        return self.state == self.OPEN
+    
+    def allow_request(self) -> bool:
+        """
+        Decide whether a request may proceed.
+        
+        Returns:
+            True if the caller should perform the request
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    self._total_rejections += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Circuit '{self.name}' half-open, probing")
+            
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self._total_rejections += 1
+                    return False
+                self._probe_in_flight = True
+            
+            return True
+    
+    def record_success(self) -> None:
+        """Record a successful request."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Record a failed request, opening the breaker if needed."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Circuit '{self.name}' opened after {self._failures} failures "
+                        f"(retry in {self.recovery_timeout:.0f}s)"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+    
+    def get_status(self) -> dict:
+        """Breaker state for monitoring."""
+        state = self.state
+        with self._lock:
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(self.recovery_timeout - (time.monotonic() - self._opened_at), 3)
+            
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'rejected_requests': self._total_rejections,
+                'retry_in_seconds': retry_in
+            }
+
+
+def backoff_delays(
+    max_retries: int,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    rng: Optional[random.Random] = None
+) -> Iterator[float]:
+    """
+    Jittered exponential backoff delays ("full jitter").
+    
+    Args:
+        max_retries: Number of delays to produce
+        base_delay: Delay cap for the first retry, doubled each time
+        max_delay: Upper bound for any single delay
+    
+    Yields:
+        Seconds to wait before each retry
+    """
+    rng = rng or random
+    for attempt in range(max_retries):
+        yield rng.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
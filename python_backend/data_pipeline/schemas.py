@@ -6,10 +6,39 @@ Defines unified data structures for all market data sources.
 Ensures consistency across primary, fallback, and optional data providers.
 """
 
+import logging
 from datetime import datetime
-from typing import Optional, Literal
-from pydantic import BaseModel, Field, validator
+from typing import Any, ClassVar, Dict, Optional, Literal, Iterable, Union
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from decimal import Decimal
+import numpy as np
+
+from .market_frame import MarketFrame
+
+logger = logging.getLogger(__name__)
+
+
+# How sources represent prices and ratios (PipelineConfig.numeric_mode):
+# 'float' (the default everywhere) keeps native floats end to end,
+# 'decimal' keeps exact Decimals for audit use
+NumericMode = Literal['float', 'decimal']
+Number = Union[float, Decimal]
+
+
+def to_number(value, mode: NumericMode = 'float') -> Number:
+    """
+    Convert a raw numeric value to the representation used by a mode.
+    
+    Args:
+        value: int, float, Decimal or numeric string
+        mode: 'float' or 'decimal'
+    
+    Returns:
+        float, or Decimal built from the value's string form
+    """
+    if mode == 'float':
+        return float(value)
+    return value if isinstance(value, Decimal) else Decimal(str(value))
 
 
 class StockData(BaseModel):
@@ -20,18 +49,18 @@ class StockData(BaseModel):
     """
     symbol: str = Field(..., description="Stock ticker symbol")
     name: str = Field(..., description="Company name")
-    price: Decimal = Field(..., description="Current/closing price in MAD")
-    open: Optional[Decimal] = Field(None, description="Opening price")
-    high: Optional[Decimal] = Field(None, description="Day's high")
-    low: Optional[Decimal] = Field(None, description="Day's low")
-    close: Optional[Decimal] = Field(None, description="Closing price")
+    price: Number = Field(..., description="Current/closing price in MAD")
+    open: Optional[Number] = Field(None, description="Opening price")
+    high: Optional[Number] = Field(None, description="Day's high")
+    low: Optional[Number] = Field(None, description="Day's low")
+    close: Optional[Number] = Field(None, description="Closing price")
     volume: int = Field(..., description="Trading volume")
-    change: Decimal = Field(..., description="Absolute price change")
-    change_percent: Decimal = Field(..., description="Percentage change")
-    market_cap: Optional[Decimal] = Field(None, description="Market capitalization in MAD")
+    change: Number = Field(..., description="Absolute price change")
+    change_percent: Number = Field(..., description="Percentage change")
+    market_cap: Optional[Number] = Field(None, description="Market capitalization in MAD")
     sector: Optional[str] = Field(None, description="Industry sector")
-    pe_ratio: Optional[Decimal] = Field(None, description="Price-to-earnings ratio")
-    dividend_yield: Optional[Decimal] = Field(None, description="Dividend yield percentage")
+    pe_ratio: Optional[Number] = Field(None, description="Price-to-earnings ratio")
+    dividend_yield: Optional[Number] = Field(None, description="Dividend yield percentage")
     timestamp: datetime = Field(default_factory=datetime.now, description="Data fetch timestamp")
     source: Literal['casablanca_bourse', 'yahoo_finance', 'manual'] = Field(..., description="Data source identifier")
     
@@ -42,6 +71,114 @@ class StockData(BaseModel):
             raise ValueError("Invalid numeric value")
         return v
     
+    # Float columns accepted by bulk_construct; required ones must be finite
+    NUMERIC_FIELDS: ClassVar[tuple] = (
+        'price', 'open', 'high', 'low', 'close', 'change', 'change_percent',
+        'market_cap', 'pe_ratio', 'dividend_yield'
+    )
+    REQUIRED_NUMERIC_FIELDS: ClassVar[tuple] = ('price', 'change', 'change_percent')
+    
+    @classmethod
+    def bulk_construct(
+        cls,
+        columns: Dict[str, Any],
+        source: str,
+        numeric_mode: NumericMode = 'float',
+        validate: bool = True
+    ) -> list['StockData']:
+        """
+        Build many StockData objects from columns without per-field validation.
+        
+        Intended for values that come from our own normalized frames. When
+        `validate` is set, whole columns are checked at once (see
+        _invalid_rows) and failing rows are dropped with a warning; the
+        models themselves are then created with model_construct.
+        
+        Args:
+            columns: 'symbol' and 'name' sequences, float arrays for
+                NUMERIC_FIELDS (NaN = missing; optional ones may be omitted),
+                an integer 'volume' array and an optional 'sector' sequence
+            source: Source identifier shared by every row
+            numeric_mode: 'float' or 'decimal' representation of values
+            validate: Run the vectorized checks (PipelineConfig.enable_data_validation)
+        
+        Returns:
+            List of StockData, in column order
+        """
+        symbols = list(columns['symbol'])
+        n = len(symbols)
+        numeric = {
+            field: np.asarray(columns[field], dtype=np.float64)
+            for field in cls.NUMERIC_FIELDS
+            if columns.get(field) is not None
+        }
+        volume = np.asarray(columns['volume'], dtype=np.int64)
+        
+        keep = np.ones(n, dtype=bool)
+        if validate:
+            # Non-positive OHLC values (e.g. no trade yet) are treated as missing
+            for field in ('open', 'high', 'low', 'close'):
+                if field in numeric:
+                    numeric[field] = np.where(numeric[field] > 0, numeric[field], np.nan)
+            
+            invalid = cls._invalid_rows(numeric, volume)
+            if invalid.any():
+                dropped = [symbols[i] for i in np.flatnonzero(invalid)]
+                logger.warning(f"Dropping {len(dropped)} invalid rows from {source}: {dropped}")
+                keep = ~invalid
+        
+        rows = np.flatnonzero(keep)
+        values = {}
+        for field, column in numeric.items():
+            column = column[rows].tolist()
+            if numeric_mode == 'decimal':
+                values[field] = [None if v != v else Decimal(str(v)) for v in column]
+            else:
+                values[field] = [None if v != v else v for v in column]
+        
+        names = list(columns['name'])
+        sectors = list(columns['sector']) if columns.get('sector') is not None else [None] * n
+        volumes = volume[rows].tolist()
+        timestamp = datetime.now()
+        
+        stocks = []
+        for out, i in enumerate(rows.tolist()):
+            fields = {field: column[out] for field, column in values.items()}
+            stocks.append(cls.model_construct(
+                symbol=symbols[i],
+                name=names[i],
+                volume=volumes[out],
+                sector=sectors[i],
+                timestamp=timestamp,
+                source=source,
+                **fields
+            ))
+        
+        return stocks
+    
+    @classmethod
+    def _invalid_rows(cls, numeric: Dict[str, np.ndarray], volume: np.ndarray) -> np.ndarray:
+        """
+        Vectorized sanity checks over whole columns.
+        
+        A row is invalid if a required value is missing or non-finite, the
+        price is not positive, volume is negative, high < low, or the change
+        is a loss of 100% or more.
+        """
+        invalid = volume < 0
+        with np.errstate(invalid='ignore'):
+            for field in cls.REQUIRED_NUMERIC_FIELDS:
+                invalid |= ~np.isfinite(numeric[field])
+            
+            invalid |= numeric['price'] <= 0
+            
+            if 'high' in numeric and 'low' in numeric:
+                invalid |= numeric['high'] < numeric['low']
+            
+            invalid |= numeric['change_percent'] <= -100
+        
+        return invalid
+    
     class Config:
         json_encoders = {
             Decimal: float,
@@ -55,12 +192,12 @@ class MarketIndices(BaseModel):
     
     Tracks MASI (Moroccan All Shares Index) and MADEX (Moroccan Most Active Shares Index).
     """
-    masi: Decimal = Field(..., description="MASI index value")
-    masi_change: Decimal = Field(..., description="MASI percentage change")
+    masi: Number = Field(..., description="MASI index value")
+    masi_change: Number = Field(..., description="MASI percentage change")
     masi_volume: Optional[int] = Field(None, description="MASI trading volume")
     
-    madex: Decimal = Field(..., description="MADEX index value")
-    madex_change: Decimal = Field(..., description="MADEX percentage change")
+    madex: Number = Field(..., description="MADEX index value")
+    madex_change: Number = Field(..., description="MADEX percentage change")
     madex_volume: Optional[int] = Field(None, description="MADEX trading volume")
     
     timestamp: datetime = Field(default_factory=datetime.now, description="Data fetch timestamp")
@@ -79,16 +216,16 @@ class TechnicalIndicators(BaseModel):
     Technical indicators (optional - from Alpha Vantage or calculated).
     """
     symbol: str
-    rsi: Optional[Decimal] = Field(None, description="Relative Strength Index")
-    sma_20: Optional[Decimal] = Field(None, description="20-day Simple Moving Average")
-    sma_50: Optional[Decimal] = Field(None, description="50-day Simple Moving Average")
-    sma_200: Optional[Decimal] = Field(None, description="200-day Simple Moving Average")
-    ema_12: Optional[Decimal] = Field(None, description="12-day Exponential Moving Average")
-    ema_26: Optional[Decimal] = Field(None, description="26-day Exponential Moving Average")
-    macd: Optional[Decimal] = Field(None, description="MACD indicator")
-    macd_signal: Optional[Decimal] = Field(None, description="MACD signal line")
-    bollinger_upper: Optional[Decimal] = Field(None, description="Bollinger Band upper")
-    bollinger_lower: Optional[Decimal] = Field(None, description="Bollinger Band lower")
+    rsi: Optional[Number] = Field(None, description="Relative Strength Index")
+    sma_20: Optional[Number] = Field(None, description="20-day Simple Moving Average")
+    sma_50: Optional[Number] = Field(None, description="50-day Simple Moving Average")
+    sma_200: Optional[Number] = Field(None, description="200-day Simple Moving Average")
+    ema_12: Optional[Number] = Field(None, description="12-day Exponential Moving Average")
+    ema_26: Optional[Number] = Field(None, description="26-day Exponential Moving Average")
+    macd: Optional[Number] = Field(None, description="MACD indicator")
+    macd_signal: Optional[Number] = Field(None, description="MACD signal line")
+    bollinger_upper: Optional[Number] = Field(None, description="Bollinger Band upper")
+    bollinger_lower: Optional[Number] = Field(None, description="Bollinger Band lower")
     timestamp: datetime = Field(default_factory=datetime.now)
     
     class Config:
@@ -103,6 +240,10 @@ class UnifiedMarketData(BaseModel):
     Complete market snapshot combining all data types.
     
     This is the primary output format for the data pipeline.
+    
+    Symbol and sector indexes are built once per snapshot, so lookups
+    through get_stock / stocks_in_sector are O(1). `frame` holds the same
+    stocks in columnar form for DataFrame, JSON and aggregate views.
     """
     indices: MarketIndices
     stocks: list[StockData]
@@ -110,6 +251,44 @@ class UnifiedMarketData(BaseModel):
     data_quality: dict = Field(default_factory=dict, description="Data quality metrics")
     fetch_metadata: dict = Field(default_factory=dict, description="Fetch process metadata")
     
+    _by_symbol: dict[str, StockData] = PrivateAttr(default_factory=dict)
+    _by_sector: dict[str, list[StockData]] = PrivateAttr(default_factory=dict)
+    _frame: Optional[MarketFrame] = PrivateAttr(default=None)
+    
+    def model_post_init(self, __context) -> None:
+        """Build the symbol and sector indexes and the columnar frame."""
+        by_symbol = {}
+        by_sector = {}
+        for stock in self.stocks:
+            by_symbol[stock.symbol] = stock
+            if stock.sector:
+                by_sector.setdefault(stock.sector, []).append(stock)
+        
+        self._by_symbol = by_symbol
+        self._by_sector = by_sector
+        self._frame = MarketFrame.from_stocks(self.stocks)
+    
+    @property
+    def frame(self) -> MarketFrame:
+        """Columnar view of the stocks (built once per snapshot)."""
+        return self._frame
+    
+    def get_stock(self, symbol: str) -> Optional[StockData]:
+        """Look up a stock by symbol."""
+        return self._by_symbol.get(symbol)
+    
+    def get_stocks(self, symbols: Iterable[str]) -> list[StockData]:
+        """Look up several stocks, skipping unknown symbols."""
+        return [self._by_symbol[s] for s in symbols if s in self._by_symbol]
+    
+    def stocks_in_sector(self, sector: str) -> list[StockData]:
+        """All stocks in a sector, in snapshot order."""
+        return self._by_sector.get(sector, [])
+    
+    def stocks_by_sector(self) -> dict[str, list[StockData]]:
+        """Sector -> stocks mapping (stocks without a sector are omitted)."""
+        return self._by_sector
+    
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
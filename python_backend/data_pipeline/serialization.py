@@ -0,0 +1,215 @@
+"""
+Payload Serialization
+=====================
+
+Fast JSON encoding and versioned, pre-serialized response bodies.
+
+A snapshot changes only when the pipeline fetches a new one, so its JSON
+body is rendered once per snapshot version and cached as bytes. Fields
+that change between versions (e.g. snapshot age) are left as slots and
+spliced in at serve time. Compressed encodings of a body are also
+produced once per version.
+"""
+
+import json
+import re
+import time
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from .compression import AVAILABLE_ENCODINGS, CACHED_LEVELS, compress
+
+# Optional: orjson is several times faster than the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, np.floating)):
+        return float(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON.
+    
+    Uses orjson when installed, the standard library otherwise. Datetimes,
+    Decimals and NumPy scalars/arrays are supported by both paths.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# Distinguishes ETags across server restarts, when versions start over
+_BOOT_ID = format(int(time.time()), 'x')
+
+_SLOT_PATTERN = re.compile(rb'"@@slot:(\w+)@@"')
+
+
+class VersionedPayload:
+    """
+    JSON body serialized once for a given data version.
+    
+    Usage:
+        payload = VersionedPayload(version, {
+            'stocks': rows,
+            'age': VersionedPayload.slot('age')
+        })
+        body = payload.render(age=1.5)
+        etag = payload.etag
+    """
+    
+    def __init__(self, version: Hashable, body: Any):
+        """
+        Serialize a body for a version.
+        
+        Args:
+            version: Identifier of the data the body was built from
+            body: JSON-serializable object; values created with slot()
+                are filled in by render()
+        """
+        self.version = version
+        self.etag = f'W/"{_BOOT_ID}-{version}"'
+        
+        # re.split with a group alternates [bytes, slot name, bytes, ...]
+        parts = _SLOT_PATTERN.split(dumps(body))
+        self._segments = parts[0::2]
+        self._slots = [name.decode('ascii') for name in parts[1::2]]
+        
+        self._encoded: Dict[str, bytes] = {}
+        self._gzip_prefix: Optional[Tuple[Any, bytes]] = None
+    
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        """
+        Content encodings encode() can serve from cache.
+        
+        Bodies with slots only support gzip: the compressor state after the
+        leading static segment is kept and resumed per request, and brotli
+        and zstd compressors cannot be copied.
+        """
+        return AVAILABLE_ENCODINGS if not self._slots else ('gzip',)
+    
+    @staticmethod
+    def slot(name: str) -> str:
+        """Placeholder for a value supplied at render time."""
+        return f"@@slot:{name}@@"
+    
+    def render(self, **values: Any) -> bytes:
+        """
+        Get the body bytes, splicing in slot values.
+        
+        Returns:
+            The cached bytes as-is when the body has no slots
+        """
+        if not self._slots:
+            return self._segments[0]
+        
+        out = [self._segments[0]]
+        for name, segment in zip(self._slots, self._segments[1:]):
+            out.append(dumps(values.get(name)))
+            out.append(segment)
+        return b''.join(out)
+    
+    def encode(self, encoding: Optional[str], **values: Any) -> bytes:
+        """
+        Get the body bytes in a content encoding.
+        
+        Args:
+            encoding: One of `encodings`, or None for identity
+            values: Slot values, as for render()
+        
+        Returns:
+            Compressed body; computed once per encoding when the body has
+            no slots
+        """
+        if encoding is None:
+            return self.render(**values)
+        
+        if not self._slots:
+            encoded = self._encoded.get(encoding)
+            if encoded is None:
+                encoded = compress(self._segments[0], encoding)
+                self._encoded[encoding] = encoded
+            return encoded
+        
+        if encoding != 'gzip':
+            raise ValueError(f"Payloads with slots support gzip only, not {encoding}")
+        
+        if self._gzip_prefix is None:
+            compressor = zlib.compressobj(CACHED_LEVELS['gzip'], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._gzip_prefix = (compressor, compressor.compress(self._segments[0]))
+        
+        # The copy resumes from the cached state, so only the slot values
+        # and trailing segments are compressed per request
+        compressor, head = self._gzip_prefix
+        compressor = compressor.copy()
+        out = [head]
+        for name, segment in zip(self._slots, self._segments[1:]):
+            out.append(compressor.compress(dumps(values.get(name))))
+            out.append(compressor.compress(segment))
+        out.append(compressor.flush())
+        return b''.join(out)
+    
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        Check an If-None-Match header against this payload (weak comparison).
+        
+        Args:
+            if_none_match: Raw header value, or None
+        
+        Returns:
+            True if the client already holds this version
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        
+        ours = self.etag[2:]
+        return any(tag.strip().removeprefix('W/') == ours for tag in if_none_match.split(','))
+
+
+class PayloadCache:
+    """
+    Latest VersionedPayload per key.
+    
+    Only one version per key is kept; asking for a newer version replaces
+    the cached body.
+    """
+    
+    def __init__(self):
+        self._payloads: Dict[Hashable, VersionedPayload] = {}
+    
+    def get(self, key: Hashable, version: Hashable, build) -> VersionedPayload:
+        """
+        Get the payload for key at version, building it if needed.
+        
+        Args:
+            key: Cache key (e.g. endpoint name)
+            version: Data version the body must match
+            build: Zero-argument callable returning the body object
+        
+        Returns:
+            VersionedPayload for that version
+        """
+        payload = self._payloads.get(key)
+        if payload is None or payload.version != version:
+            payload = VersionedPayload(version, build())
+            self._payloads[key] = payload
+        return payload
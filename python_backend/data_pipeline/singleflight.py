@@ -0,0 +1,129 @@
+"""
+Request Coalescing
+==================
+
+Single-flight execution: while a call for a given key is running, later
+callers for the same key wait for that call's result instead of starting
+their own. Works for threads and asyncio coroutines alike, so sync and
+async callers of the pipeline share one upstream fetch.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+    
+    Usage:
+        flights = SingleFlight()
+        
+        # In threads
+        data = flights.do('snapshot', fetch_snapshot)
+        
+        # In coroutines
+        data = await flights.do_async('snapshot', fetch_snapshot_async)
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (shared future, thread id of an async leader's event loop)
+        self._calls: Dict[Hashable, Tuple[Future, Optional[int]]] = {}
+        # Running async calls; the event loop itself only keeps weak references
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def _join_or_lead(self, key: Hashable, async_leader: bool) -> Tuple[Future, bool, Optional[int]]:
+        """Return the in-flight future for key, creating it if this caller leads."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                future, loop_thread = call
+                return future, False, loop_thread
+            
+            future = Future()
+            loop_thread = threading.get_ident() if async_leader else None
+            self._calls[key] = (future, loop_thread)
+            return future, True, loop_thread
+    
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+    
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) once per key, sharing the result with concurrent callers.
+        
+        Args:
+            key: Deduplication key
+            fn: Callable executed by the first caller
+            *args: Positional arguments for fn
+        
+        Returns:
+            The result of fn (the same object for every coalesced caller)
+        """
+        future, leader, loop_thread = self._join_or_lead(key, async_leader=False)
+        
+        if not leader:
+            if loop_thread == threading.get_ident():
+                # Blocking here would stall the very loop running the leader
+                raise RuntimeError(f"Sync call for {key!r} would deadlock the event loop running it")
+            logger.debug(f"Joining in-flight call for {key!r}")
+            return future.result()
+        
+        try:
+            result = fn(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._finish(key)
+    
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Await fn(*args) once per key, sharing the result with concurrent callers.
+        
+        The call runs as its own task, so cancelling any caller (the first
+        one included) leaves it running for the others.
+        
+        Args:
+            key: Deduplication key
+            fn: Coroutine function started by the first caller
+            *args: Positional arguments for fn
+        
+        Returns:
+            The result of fn (the same object for every coalesced caller)
+        """
+        future, leader, _ = self._join_or_lead(key, async_leader=True)
+        
+        if leader:
+            task = asyncio.create_task(self._run_async(key, future, fn, *args))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return await asyncio.shield(task)
+        
+        logger.debug(f"Joining in-flight call for {key!r}")
+        return await asyncio.shield(asyncio.wrap_future(future))
+    
+    async def _run_async(self, key: Hashable, future: Future, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        try:
+            result = await fn(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._finish(key)
+    
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
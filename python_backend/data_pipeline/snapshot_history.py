@@ -0,0 +1,150 @@
+"""
+Snapshot History
+================
+
+Bounded ring of recent snapshot versions, used to answer "what changed
+since version N" without resending the full snapshot. Only the columnar
+frame and index values of each version are kept, not the StockData
+objects.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from .market_frame import MarketFrame
+
+# Index fields compared between versions
+INDEX_FIELDS = ('masi', 'masi_change', 'masi_volume', 'madex', 'madex_change', 'madex_volume', 'market_status')
+
+# Stock fields compared between versions (timestamp changes on every fetch)
+STOCK_FIELDS = MarketFrame.FLOAT_FIELDS + ('volume', 'name', 'sector', 'source')
+
+
+def index_values(indices) -> Dict[str, object]:
+    """JSON-ready INDEX_FIELDS of a MarketIndices ({} if there are none)."""
+    if indices is None:
+        return {}
+    
+    values = {}
+    for field in INDEX_FIELDS:
+        value = getattr(indices, field)
+        values[field] = value if value is None or isinstance(value, (int, str)) else float(value)
+    return values
+
+
+class SnapshotHistory:
+    """
+    The last `capacity` snapshot versions, oldest evicted first.
+    
+    Usage:
+        history = SnapshotHistory(capacity=32)
+        history.record(version, market_data)
+        
+        delta = history.diff(since=12)
+        if delta is None:
+            ...  # version 12 was evicted, send the full snapshot
+    """
+    
+    def __init__(self, capacity: int = 32):
+        """
+        Initialize the ring.
+        
+        Args:
+            capacity: Number of versions to keep
+        """
+        self.capacity = max(1, capacity)
+        self._versions: 'OrderedDict[int, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def record(self, version: int, market_data) -> None:
+        """
+        Add a snapshot version, evicting the oldest beyond capacity.
+        
+        Args:
+            version: Snapshot version (fetch_metadata['snapshot_version'])
+            market_data: UnifiedMarketData of that version
+        """
+        entry = (market_data.frame, index_values(market_data.indices))
+        with self._lock:
+            self._versions[version] = entry
+            while len(self._versions) > self.capacity:
+                self._versions.popitem(last=False)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._versions)
+    
+    def __contains__(self, version: object) -> bool:
+        with self._lock:
+            return version in self._versions
+    
+    def diff(self, since: int) -> Optional[dict]:
+        """
+        Changes between a past version and the latest one.
+        
+        Args:
+            since: Version the client currently holds
+        
+        Returns:
+            {since, version, indices, stocks, removed}, where `indices` holds
+            changed index values, `stocks` one row per added or changed stock
+            (symbol, timestamp and the changed fields only) and `removed` the
+            symbols no longer listed; None if `since` is not in the ring
+        """
+        with self._lock:
+            if since not in self._versions:
+                return None
+            old_frame, old_indices = self._versions[since]
+            version = next(reversed(self._versions))
+            new_frame, new_indices = self._versions[version]
+        
+        indices = {
+            field: value for field, value in new_indices.items()
+            if old_indices.get(field) != value
+        }
+        
+        return {
+            'since': since,
+            'version': version,
+            'indices': indices,
+            'stocks': self._changed_rows(old_frame, new_frame) if old_frame is not new_frame else [],
+            'removed': [s for s in old_frame.symbols.tolist() if s not in new_frame]
+        }
+    
+    @staticmethod
+    def _changed_rows(old: MarketFrame, new: MarketFrame) -> list:
+        """Rows of `new` that are missing from or differ from `old`, trimmed to changed fields."""
+        n = len(new)
+        if not n:
+            return []
+        
+        # Position of each new row in the old frame (-1 = added since)
+        old_rows = np.array([old.row(s) if s in old else -1 for s in new.symbols.tolist()], dtype=np.int64)
+        added = old_rows < 0
+        aligned = np.where(added, 0, old_rows)
+        
+        changed = {}
+        for field in STOCK_FIELDS:
+            current = new[field]
+            previous = old[field][aligned] if len(old) else np.empty(n, dtype=current.dtype)
+            if field in MarketFrame.FLOAT_FIELDS:
+                differs = ~((current == previous) | (np.isnan(current) & np.isnan(previous)))
+            else:
+                differs = current != previous
+            changed[field] = np.asarray(differs, dtype=bool) | added
+        
+        any_changed = np.logical_or.reduce(list(changed.values()))
+        records = new.to_records()
+        
+        rows = []
+        for i in np.flatnonzero(any_changed).tolist():
+            record = records[i]
+            row = {'symbol': record['symbol'], 'timestamp': record['timestamp']}
+            for field in STOCK_FIELDS:
+                if changed[field][i]:
+                    row[field] = record[field]
+            rows.append(row)
+        return rows
@@ -0,0 +1,246 @@
+"""
+Symbol Universe Registry
+========================
+
+Single source of truth for the tradable universe: symbol, company name,
+Yahoo Finance ticker, sector, shares outstanding and index membership.
+
+The registry is refreshed from one exchange listing request and cached
+on disk, so every data source iterates over the same list and static
+company metadata never has to be looked up symbol by symbol.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Listing:
+    """Static metadata for one listed company."""
+    symbol: str
+    name: str
+    yahoo_ticker: Optional[str] = None
+    sector: Optional[str] = None
+    shares_outstanding: Optional[int] = None
+    indices: Tuple[str, ...] = field(default_factory=tuple)
+
+
+# Seed universe used until the first listing refresh succeeds
+DEFAULT_LISTINGS = [
+    Listing('ATW', 'Attijariwafa Bank', 'ATW.CS', 'Banking', indices=('MASI', 'MADEX')),
+    Listing('BCP', 'Banque Centrale Populaire', 'BCP.CS', 'Banking', indices=('MASI', 'MADEX')),
+    Listing('CDM', 'Crédit du Maroc', 'CDM.CS', 'Banking', indices=('MASI', 'MADEX')),
+    Listing('IAM', 'Maroc Telecom', 'IAM.CS', 'Telecommunications', indices=('MASI', 'MADEX')),
+    Listing('ADH', 'Douja Prom Addoha', 'ADH.CS', 'Real Estate', indices=('MASI', 'MADEX')),
+    Listing('ALL', 'Alliances', 'ALL.CS', 'Real Estate', indices=('MASI', 'MADEX')),
+    Listing('LHM', 'LafargeHolcim Maroc', 'LHM.CS', 'Building Materials', indices=('MASI', 'MADEX')),
+    Listing('SID', 'Sonasid', 'SID.CS', 'Steel', indices=('MASI', 'MADEX')),
+    # Samir is suspended from trading and has no Yahoo Finance quote
+    Listing('SRM', 'Samir', None, 'Oil & Gas', indices=('MASI',)),
+    Listing('WAA', 'Wafa Assurance', 'WAA.CS', 'Insurance', indices=('MASI', 'MADEX')),
+    Listing('MNG', 'Managem', 'MNG.CS', 'Mining', indices=('MASI', 'MADEX')),
+    Listing('LBL', "Label'Vie", 'LBL.CS', 'Distribution', indices=('MASI', 'MADEX')),
+]
+
+
+class SymbolUniverse:
+    """
+    Registry of listed companies shared by all data sources.
+    
+    Lookups read an immutable snapshot, so a refresh swaps the whole
+    universe atomically without locking readers.
+    
+    Usage:
+        universe = SymbolUniverse('data/universe.json')
+        for symbol in universe.symbols():
+            ...
+        if universe.needs_refresh():
+            universe.update(client.fetch_listing())
+    """
+    
+    YAHOO_SUFFIX = '.CS'
+    # Minimum delay between refresh attempts after a failed listing request
+    RETRY_SECONDS = 900
+    
+    def __init__(self, cache_path: Optional[str] = None, max_age_hours: float = 24):
+        """
+        Initialize the registry from the disk cache, or the seed list.
+        
+        Args:
+            cache_path: JSON file the listing is cached in (None keeps it in memory)
+            max_age_hours: Age after which the listing should be refreshed
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_age_seconds = max_age_hours * 3600
+        
+        self._lock = threading.Lock()
+        self._listings: Dict[str, Listing] = {listing.symbol: listing for listing in DEFAULT_LISTINGS}
+        self._source = 'default'
+        self._updated_at: Optional[float] = None
+        self._last_attempt: float = 0.0
+        
+        self._load_cache()
+        logger.info(f"Initialized symbol universe with {len(self._listings)} listings ({self._source})")
+    
+    def _load_cache(self) -> None:
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            
+            listings = [
+                Listing(**{**entry, 'indices': tuple(entry.get('indices') or ())})
+                for entry in payload['listings']
+            ]
+            if listings:
+                self._listings = {listing.symbol: listing for listing in listings}
+                self._source = payload.get('source', 'cache')
+                self._updated_at = payload.get('updated_at')
+        except Exception as e:
+            logger.error(f"Ignoring unreadable universe cache {self.cache_path}: {e}")
+    
+    def _save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'source': self._source,
+                    'updated_at': self._updated_at,
+                    'listings': [asdict(listing) for listing in self._listings.values()]
+                }, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.error(f"Could not write universe cache {self.cache_path}: {e}")
+    
+    def needs_refresh(self) -> bool:
+        """
+        Check whether the listing should be re-fetched.
+        
+        Returns:
+            True if the listing is older than max_age_hours (or was never
+            fetched) and no attempt was made in the last RETRY_SECONDS
+        """
+        now = time.time()
+        if now - self._last_attempt < self.RETRY_SECONDS:
+            return False
+        return self._updated_at is None or now - self._updated_at >= self.max_age_seconds
+    
+    def mark_attempt(self) -> None:
+        """Record a refresh attempt so failures are not retried immediately."""
+        self._last_attempt = time.time()
+    
+    def update(self, rows: Iterable[dict], source: str = 'casablanca_bourse') -> int:
+        """
+        Replace the universe with a freshly fetched listing.
+        
+        Yahoo tickers already known for a symbol are kept (including None
+        for symbols Yahoo does not quote); new symbols get the default
+        '<symbol>.CS' ticker unless the row provides one.
+        
+        Args:
+            rows: Listing rows with at least a 'symbol' key
+            source: Label recorded with the listing
+        
+        Returns:
+            Number of listings in the new universe (0 if rows were unusable,
+            in which case the current universe is kept)
+        """
+        self.mark_attempt()
+        current = self._listings
+        listings = {}
+        
+        for row in rows:
+            symbol = str(row.get('symbol') or '').strip().upper()
+            if not symbol:
+                continue
+            
+            known = current.get(symbol)
+            if 'yahoo_ticker' in row:
+                yahoo_ticker = row['yahoo_ticker']
+            elif known is not None:
+                yahoo_ticker = known.yahoo_ticker
+            else:
+                yahoo_ticker = f"{symbol}{self.YAHOO_SUFFIX}"
+            
+            shares = row.get('shares_outstanding')
+            listings[symbol] = Listing(
+                symbol=symbol,
+                name=row.get('name') or (known.name if known else symbol),
+                yahoo_ticker=yahoo_ticker,
+                sector=row.get('sector') or (known.sector if known else None),
+                shares_outstanding=int(shares) if shares else (known.shares_outstanding if known else None),
+                indices=tuple(row.get('indices') or (known.indices if known else ()))
+            )
+        
+        if not listings:
+            logger.warning("Listing refresh returned no symbols, keeping current universe")
+            return 0
+        
+        with self._lock:
+            self._listings = listings
+            self._source = source
+            self._updated_at = time.time()
+            self._save_cache()
+        
+        logger.info(f"Symbol universe refreshed: {len(listings)} listings")
+        return len(listings)
+    
+    def get(self, symbol: str) -> Optional[Listing]:
+        """Listing for a symbol, or None if it is not in the universe."""
+        return self._listings.get(symbol)
+    
+    def symbols(self) -> List[str]:
+        """All symbols, in listing order."""
+        return list(self._listings)
+    
+    def yahoo_symbols(self) -> List[str]:
+        """Symbols that have a Yahoo Finance ticker."""
+        return [symbol for symbol, listing in self._listings.items() if listing.yahoo_ticker]
+    
+    def yahoo_ticker(self, symbol: str) -> Optional[str]:
+        """
+        Yahoo Finance ticker for a symbol.
+        
+        Returns:
+            The registered ticker, '<symbol>.CS' for unknown symbols, or
+            None if the symbol is known to have no Yahoo quote
+        """
+        listing = self._listings.get(symbol)
+        if listing is None:
+            return f"{symbol}{self.YAHOO_SUFFIX}"
+        return listing.yahoo_ticker
+    
+    def index_members(self, index: str) -> List[str]:
+        """Symbols belonging to an index (e.g. 'MASI', 'MADEX')."""
+        return [symbol for symbol, listing in self._listings.items() if index in listing.indices]
+    
+    def get_status(self) -> dict:
+        """Registry size and freshness for monitoring."""
+        return {
+            'listings': len(self._listings),
+            'source': self._source,
+            'age_seconds': round(time.time() - self._updated_at, 1) if self._updated_at else None
+        }
+    
+    def __len__(self) -> int:
+        return len(self._listings)
+    
+    def __iter__(self) -> Iterator[Listing]:
+        return iter(list(self._listings.values()))
+    
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._listings
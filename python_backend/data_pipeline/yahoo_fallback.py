@@ -12,15 +12,22 @@ Provides:
 - Fallback real-time quotes
 """
 
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from decimal import Decimal
-from typing import Optional, List
+from typing import Dict, Optional, List
+from concurrent.futures import Executor
 import pandas as pd
 import yfinance as yf
 import numpy as np
 
-from .schemas import StockData, MarketIndices
+from .schemas import StockData, MarketIndices, NumericMode, Number, to_number
+from .market_frame import MarketFrame
+from .history_store import HistoryStore
+from .universe import SymbolUniverse
 
 logger = logging.getLogger(__name__)
 
@@ -33,35 +40,60 @@ class YahooFinanceFallback:
     or provides proxy data for analysis.
     """
     
-    # Mapping of Moroccan symbols to Yahoo Finance tickers
-    SYMBOL_MAPPING = {
-        'ATW': 'ATW.CS',  # Casablanca suffix
-        'BCP': 'BCP.CS',
-        'CDM': 'CDM.CS',
-        'IAM': 'IAM.CS',
-        'ADH': 'ADH.CS',
-        'ALL': 'ALL.CS',
-        'LHM': 'LHM.CS',
-        'SID': 'SID.CS',
-        'WAA': 'WAA.CS',
-        'MNG': 'MNG.CS',
-        'LBL': 'LBL.CS',
+    # Lookback for each yfinance period string ('max' and 'ytd' handled separately)
+    PERIOD_OFFSETS = {
+        '1d': pd.DateOffset(days=1),
+        '5d': pd.DateOffset(days=5),
+        '1mo': pd.DateOffset(months=1),
+        '3mo': pd.DateOffset(months=3),
+        '6mo': pd.DateOffset(months=6),
+        '1y': pd.DateOffset(years=1),
+        '2y': pd.DateOffset(years=2),
+        '5y': pd.DateOffset(years=5),
+        '10y': pd.DateOffset(years=10),
     }
     
-    def __init__(self, cache_duration_minutes: int = 5):
+    # History frames kept in memory, keyed by (symbol, interval)
+    HISTORY_MEMO_SIZE = 64
+    
+    def __init__(
+        self,
+        cache_duration_minutes: int = 5,
+        history_store_dir: Optional[str] = None,
+        universe: Optional[SymbolUniverse] = None,
+        numeric_mode: NumericMode = 'float',
+        validate_data: bool = True
+    ):
         """
         Initialize Yahoo Finance fallback client.
         
         Args:
             cache_duration_minutes: Cache duration to avoid excessive API calls
+            history_store_dir: Directory for the persistent OHLCV store
+                (None disables it and every history request goes to Yahoo)
+            universe: Symbol registry providing tickers and static metadata
+            numeric_mode: 'float' or 'decimal' representation of prices
+            validate_data: Run vectorized sanity checks on batched quotes
         """
         self.cache_duration = timedelta(minutes=cache_duration_minutes)
         self._cache = {}
         self._cache_timestamps = {}
+        self.history_store = HistoryStore(history_store_dir) if history_store_dir else None
+        
+        # (symbol, interval) -> (monotonic fetch time, period start or None for 'max', frame)
+        self._history_memo: OrderedDict = OrderedDict()
+        self._history_memo_lock = threading.Lock()
+        
+        # (symbol, interval) -> lock held while a stored series is checked and updated
+        self._series_locks: Dict[tuple, threading.Lock] = {}
+        
+        self.universe = universe or SymbolUniverse()
+        self.numeric_mode = numeric_mode
+        self.validate_data = validate_data
         
         logger.info("Initialized Yahoo Finance fallback client")
     
-    def _get_yahoo_symbol(self, local_symbol: str) -> str:
+    def _get_yahoo_symbol(self, local_symbol: str) -> Optional[str]:
         """
         Convert local Moroccan symbol to Yahoo Finance ticker.
         
@@ -69,9 +101,22 @@ class YahooFinanceFallback:
             local_symbol: Local stock symbol (e.g., 'ATW')
         
         Returns:
-            Yahoo Finance ticker (e.g., 'ATW.CS')
+            Yahoo Finance ticker (e.g., 'ATW.CS'), or None for symbols the
+            universe registers without one
         """
-        return self.SYMBOL_MAPPING.get(local_symbol, f"{local_symbol}.CS")
+        return self.universe.yahoo_ticker(local_symbol)
+    
+    def _num(self, value) -> Number:
+        """Convert a raw value according to numeric_mode."""
+        return to_number(value, self.numeric_mode)
+    
+    def _listing_name(self, symbol: str) -> str:
+        listing = self.universe.get(symbol)
+        return listing.name if listing else symbol
+    
+    def _listing_sector(self, symbol: str) -> Optional[str]:
+        listing = self.universe.get(symbol)
+        return listing.sector if listing else None
     
     def _is_cache_valid(self, symbol: str) -> bool:
         """Check if cached data is still valid."""
@@ -99,6 +144,9 @@ class YahooFinanceFallback:
                 return self._cache[symbol]
             
             yahoo_symbol = self._get_yahoo_symbol(symbol)
+            if yahoo_symbol is None:
+                logger.debug(f"{symbol} has no Yahoo Finance ticker, skipping")
+                return None
             logger.info(f"Fetching {symbol} ({yahoo_symbol}) from Yahoo Finance")
             
             ticker = yf.Ticker(yahoo_symbol)
@@ -120,19 +168,19 @@ class YahooFinanceFallback:
             
             stock_data = StockData(
                 symbol=symbol,
-                name=info.get('longName', symbol),
-                price=Decimal(str(current_price)),
-                open=Decimal(str(float(latest['Open']))) if 'Open' in latest else None,
-                high=Decimal(str(float(latest['High']))) if 'High' in latest else None,
-                low=Decimal(str(float(latest['Low']))) if 'Low' in latest else None,
-                close=Decimal(str(current_price)),
+                name=info.get('longName') or self._listing_name(symbol),
+                price=self._num(current_price),
+                open=self._num(float(latest['Open'])) if 'Open' in latest else None,
+                high=self._num(float(latest['High'])) if 'High' in latest else None,
+                low=self._num(float(latest['Low'])) if 'Low' in latest else None,
+                close=self._num(current_price),
                 volume=int(latest['Volume']),
-                change=Decimal(str(change)),
-                change_percent=Decimal(str(change_percent)),
-                market_cap=Decimal(str(info.get('marketCap', 0))) if info.get('marketCap') else None,
-                sector=info.get('sector'),
-                pe_ratio=Decimal(str(info.get('trailingPE', 0))) if info.get('trailingPE') else None,
-                dividend_yield=Decimal(str(info.get('dividendYield', 0) * 100)) if info.get('dividendYield') else None,
+                change=self._num(change),
+                change_percent=self._num(change_percent),
+                market_cap=self._num(info.get('marketCap', 0)) if info.get('marketCap') else None,
+                sector=info.get('sector') or self._listing_sector(symbol),
+                pe_ratio=self._num(info.get('trailingPE', 0)) if info.get('trailingPE') else None,
+                dividend_yield=self._num(info.get('dividendYield', 0) * 100) if info.get('dividendYield') else None,
                 source='yahoo_finance'
             )
             
@@ -146,25 +194,144 @@ class YahooFinanceFallback:
             logger.error(f"Error fetching {symbol} from Yahoo Finance: {e}")
             return None
     
-    def fetch_all_stocks(self, symbols: List[str]) -> List[StockData]:
+    def fetch_all_stocks(self, symbols: Optional[List[str]] = None) -> List[StockData]:
         """
         Fetch data for multiple stocks.
         
+        Downloads the last five daily bars for the whole universe in a single
+        multi-ticker request; symbols still cached are served from memory.
+        Falls back to per-symbol requests if the batched download fails.
+        
         Args:
-            symbols: List of stock symbols
+            symbols: List of stock symbols (defaults to every universe symbol
+                with a Yahoo ticker)
         
         Returns:
             List of StockData objects
         """
+        if symbols is None:
+            symbols = self.universe.yahoo_symbols()
+        else:
+            symbols = [s for s in symbols if self._get_yahoo_symbol(s) is not None]
+        
+        cached = {s: self._cache[s] for s in symbols if self._is_cache_valid(s)}
+        missing = [s for s in symbols if s not in cached]
+        
+        fetched = {}
+        if missing:
+            try:
+                fetched = self._fetch_batch(missing)
+            except Exception as e:
+                logger.error(f"Batched Yahoo Finance download failed, fetching individually: {e}")
+                fetched = {s: self.fetch_stock_data(s, use_cache=False) for s in missing}
+        
         stocks = []
         for symbol in symbols:
-            stock_data = self.fetch_stock_data(symbol)
+            stock_data = cached.get(symbol) or fetched.get(symbol)
             if stock_data:
                 stocks.append(stock_data)
         
         logger.info(f"Fetched {len(stocks)}/{len(symbols)} stocks from Yahoo Finance")
         return stocks
     
+    def _fetch_batch(self, symbols: List[str]) -> dict:
+        """
+        Download 5-day bars for several symbols in one request.
+        
+        Change and change-percent are computed across the whole frame at
+        once: for every ticker we locate its last and previous valid rows,
+        since tickers do not always trade on the same days. The resulting
+        columns are turned into StockData in bulk, without per-field
+        validation.
+        
+        Args:
+            symbols: Local stock symbols to download
+        
+        Returns:
+            Dictionary of {symbol: StockData}
+        """
+        yahoo_symbols = [self._get_yahoo_symbol(s) for s in symbols]
+        logger.info(f"Downloading {len(yahoo_symbols)} tickers from Yahoo Finance in one batch")
+        
+        data = yf.download(
+            yahoo_symbols,
+            period='5d',
+            interval='1d',
+            group_by='column',
+            auto_adjust=False,
+            progress=False,
+            threads=True
+        )
+        
+        if data.empty:
+            logger.warning("Batched download returned no data")
+            return {}
+        
+        fields = {}
+        for field in ('Open', 'High', 'Low', 'Close', 'Volume'):
+            frame = data[field].reindex(columns=yahoo_symbols)
+            fields[field] = frame.to_numpy(dtype=float)
+        
+        close = fields['Close']
+        n_rows = close.shape[0]
+        columns = np.arange(close.shape[1])
+        
+        # Position of the last and previous valid close per ticker
+        valid = ~np.isnan(close)
+        has_data = valid.any(axis=0)
+        last_idx = n_rows - 1 - np.argmax(valid[::-1], axis=0)
+        
+        earlier = valid & (np.arange(n_rows)[:, None] < last_idx)
+        has_previous = earlier.any(axis=0)
+        prev_idx = np.where(has_previous, n_rows - 1 - np.argmax(earlier[::-1], axis=0), last_idx)
+        
+        latest = {field: values[last_idx, columns] for field, values in fields.items()}
+        previous_close = close[prev_idx, columns]
+        
+        change = latest['Close'] - previous_close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_percent = np.where(previous_close != 0, change / previous_close * 100, 0.0)
+        
+        for i in np.flatnonzero(~has_data):
+            logger.warning(f"No historical data available for {yahoo_symbols[i]}")
+        
+        rows = np.flatnonzero(has_data)
+        listings = [self.universe.get(symbols[i]) for i in rows]
+        shares = np.array(
+            [listing.shares_outstanding if listing and listing.shares_outstanding else np.nan for listing in listings],
+            dtype=float
+        )
+        price = latest['Close'][rows]
+        
+        stocks = StockData.bulk_construct(
+            {
+                'symbol': [symbols[i] for i in rows],
+                'name': [listing.name if listing else symbols[i] for listing, i in zip(listings, rows)],
+                'sector': [listing.sector if listing else None for listing in listings],
+                'price': price,
+                'open': latest['Open'][rows],
+                'high': latest['High'][rows],
+                'low': latest['Low'][rows],
+                'close': price,
+                'volume': np.nan_to_num(latest['Volume'][rows]).astype(np.int64),
+                'change': change[rows],
+                'change_percent': change_percent[rows],
+                'market_cap': price * shares
+            },
+            source='yahoo_finance',
+            numeric_mode=self.numeric_mode,
+            validate=self.validate_data
+        )
+        
+        now = datetime.now()
+        results = {}
+        for stock_data in stocks:
+            results[stock_data.symbol] = stock_data
+            self._cache[stock_data.symbol] = stock_data
+            self._cache_timestamps[stock_data.symbol] = now
+        
+        return results
+    
     def fetch_historical_data(
         self,
         symbol: str,
@@ -182,35 +349,190 @@ class YahooFinanceFallback:
         Returns:
             pandas DataFrame with OHLCV data
         """
+        memoizable = period in self.PERIOD_OFFSETS or period in ('max', 'ytd')
+        
         try:
+            if memoizable:
+                memoized = self._memoized_history(symbol, period, interval)
+                if memoized is not None:
+                    return memoized
+            
             yahoo_symbol = self._get_yahoo_symbol(symbol)
+            if yahoo_symbol is None:
+                logger.debug(f"{symbol} has no Yahoo Finance ticker, no history available")
+                return pd.DataFrame()
             logger.info(f"Fetching historical data for {symbol} (period={period}, interval={interval})")
             
-            ticker = yf.Ticker(yahoo_symbol)
-            hist = ticker.history(period=period, interval=interval)
+            if self.history_store is not None and (period in self.PERIOD_OFFSETS or period in ('max', 'ytd')):
+                hist = self._fetch_with_store(symbol, yahoo_symbol, period, interval)
+            else:
+                hist = self._download_history(yahoo_symbol, period=period, interval=interval)
             
             if hist.empty:
                 logger.warning(f"No historical data for {yahoo_symbol}")
                 return pd.DataFrame()
             
-            # Normalize column names
-            hist = hist.rename(columns={
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Volume': 'volume'
-            })
-            
             hist['symbol'] = symbol
             hist['source'] = 'yahoo_finance'
             
+            if memoizable:
+                self._memoize_history(symbol, period, interval, hist)
             return hist
             
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {e}")
             return pd.DataFrame()
     
+    def _memoized_history(self, symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Serve a period from the in-memory history memo.
+        
+        An entry younger than the cache duration answers any period it
+        covers: narrower periods are sliced out of the wider frame.
+        
+        Returns:
+            A copy of the matching bars, or None on a miss
+        """
+        key = (symbol, interval)
+        start = self._period_start(period)
+        
+        with self._history_memo_lock:
+            entry = self._history_memo.get(key)
+            if entry is None:
+                return None
+            
+            fetched_at, covered_from, frame = entry
+            if time.monotonic() - fetched_at >= self.cache_duration.total_seconds():
+                del self._history_memo[key]
+                return None
+            if covered_from is not None and (start is None or start < covered_from):
+                return None
+            
+            self._history_memo.move_to_end(key)
+        
+        logger.debug(f"Serving {symbol} ({period}, {interval}) from history memo")
+        if start is not None:
+            frame = frame[frame.index >= start]
+        return frame.copy()
+    
+    def _memoize_history(self, symbol: str, period: str, interval: str, hist: pd.DataFrame) -> None:
+        """Keep a fetched frame, evicting the least recently used beyond HISTORY_MEMO_SIZE."""
+        with self._history_memo_lock:
+            self._history_memo[(symbol, interval)] = (time.monotonic(), self._period_start(period), hist.copy())
+            self._history_memo.move_to_end((symbol, interval))
+            while len(self._history_memo) > self.HISTORY_MEMO_SIZE:
+                self._history_memo.popitem(last=False)
+    
+    def _download_history(self, yahoo_symbol: str, **kwargs) -> pd.DataFrame:
+        """Download bars from Yahoo Finance with normalized column names."""
+        ticker = yf.Ticker(yahoo_symbol)
+        hist = ticker.history(**kwargs)
+        
+        # Normalize column names
+        return hist.rename(columns={
+            'Open': 'open',
+            'High': 'high',
+            'Low': 'low',
+            'Close': 'close',
+            'Volume': 'volume'
+        })
+    
+    def _period_start(self, period: str) -> Optional[pd.Timestamp]:
+        """First timestamp covered by a yfinance period string (None for 'max')."""
+        now = pd.Timestamp.now(tz='UTC')
+        if period == 'max':
+            return None
+        if period == 'ytd':
+            return pd.Timestamp(year=now.year, month=1, day=1, tz='UTC')
+        return now - self.PERIOD_OFFSETS[period]
+    
+    def _fetch_with_store(self, symbol: str, yahoo_symbol: str, period: str, interval: str) -> pd.DataFrame:
+        """
+        Serve history from the local store, downloading only what is missing.
+        
+        A full download happens only when the store does not reach back far
+        enough for the requested period. Otherwise, once the stored series
+        is older than the cache duration, only bars since the last stored
+        timestamp are fetched and appended. Concurrent requests for the same
+        series wait for each other, so the store is never checked against
+        metadata another request is about to change.
+        
+        Returns:
+            OHLCV DataFrame for the requested period
+        """
+        with self._history_memo_lock:
+            lock = self._series_locks.setdefault((symbol, interval), threading.Lock())
+        
+        with lock:
+            return self._update_store(symbol, yahoo_symbol, period, interval)
+    
+    def _update_store(self, symbol: str, yahoo_symbol: str, period: str, interval: str) -> pd.DataFrame:
+        store = self.history_store
+        start = self._period_start(period)
+        meta = store.get_meta(symbol, interval)
+        
+        covered = (
+            meta is not None
+            and meta['count'] > 0
+            and (
+                meta['coverage_start'] is None
+                or (start is not None and start.value >= meta['coverage_start'])
+            )
+        )
+        
+        if not covered:
+            logger.info(f"History store miss for {symbol} ({period}, {interval}), downloading full range")
+            hist = self._download_history(yahoo_symbol, period=period, interval=interval)
+            if hist.empty:
+                return hist
+            store.replace(symbol, interval, hist, coverage_start=start)
+        elif time.time() - meta['updated_at'] >= self.cache_duration.total_seconds():
+            last = pd.Timestamp(meta['last_timestamp'], tz='UTC')
+            try:
+                new_bars = self._download_history(yahoo_symbol, start=last, interval=interval)
+                store.append(symbol, interval, new_bars)
+            except Exception as e:
+                logger.warning(f"Incremental history update failed for {symbol}, serving stored bars: {e}")
+        else:
+            logger.debug(f"Serving {symbol} ({period}, {interval}) from history store")
+        
+        return store.read(symbol, interval, start)
+    
+    @staticmethod
+    def _closes(hist: pd.DataFrame) -> pd.Series:
+        """Closing prices without missing bars, as every indicator below expects."""
+        return hist['close'].dropna()
+    
+    @staticmethod
+    def _volatility(close: pd.Series) -> Optional[float]:
+        """Annualized standard deviation of daily returns, in percent (252 trading days)."""
+        if len(close) < 2:
+            return None
+        return float(close.pct_change().std() * np.sqrt(252) * 100)
+    
+    @staticmethod
+    def _moving_averages(close: pd.Series, periods: List[int]) -> dict:
+        """Latest simple moving average for each period with enough bars."""
+        return {
+            f'sma_{period}': float(close.iloc[-period:].mean())
+            for period in periods
+            if len(close) >= period
+        }
+    
+    @staticmethod
+    def _rsi(close: pd.Series, period: int) -> Optional[float]:
+        """Latest RSI from simple averages of the last `period` gains and losses."""
+        if len(close) < period + 1:
+            return None
+        
+        delta = close.diff().iloc[-period:]
+        avg_gain = delta.clip(lower=0).mean()
+        avg_loss = -delta.clip(upper=0).mean()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(avg_gain) / np.float64(avg_loss)
+        return float(100 - (100 / (1 + rs)))
+    
     def calculate_volatility(self, symbol: str, period: str = '1y') -> Optional[float]:
         """
         Calculate historical volatility (annualized standard deviation of returns).
@@ -225,17 +547,13 @@ class YahooFinanceFallback:
         try:
             hist = self.fetch_historical_data(symbol, period=period, interval='1d')
             
-            if hist.empty or len(hist) < 2:
+            if hist.empty:
                 return None
             
-            # Calculate daily returns
-            hist['returns'] = hist['close'].pct_change()
-            
-            # Annualized volatility (assuming 252 trading days)
-            volatility = hist['returns'].std() * np.sqrt(252) * 100
-            
-            logger.info(f"Calculated volatility for {symbol}: {volatility:.2f}%")
-            return float(volatility)
+            volatility = self._volatility(self._closes(hist))
+            if volatility is not None:
+                logger.info(f"Calculated volatility for {symbol}: {volatility:.2f}%")
+            return volatility
             
         except Exception as e:
             logger.error(f"Error calculating volatility for {symbol}: {e}")
@@ -262,12 +580,7 @@ class YahooFinanceFallback:
             if hist.empty:
                 return {}
             
-            smas = {}
-            for period in periods:
-                if len(hist) >= period:
-                    sma = hist['close'].rolling(window=period).mean().iloc[-1]
-                    smas[f'sma_{period}'] = float(sma)
-            
+            smas = self._moving_averages(self._closes(hist), periods)
             logger.info(f"Calculated moving averages for {symbol}: {smas}")
             return smas
             
@@ -289,33 +602,60 @@ class YahooFinanceFallback:
         try:
             hist = self.fetch_historical_data(symbol, period='3mo', interval='1d')
             
-            if hist.empty or len(hist) < period + 1:
+            if hist.empty:
                 return None
             
-            # Calculate price changes
-            delta = hist['close'].diff()
-            
-            # Separate gains and losses
-            gains = delta.where(delta > 0, 0)
-            losses = -delta.where(delta < 0, 0)
-            
-            # Calculate average gains and losses
-            avg_gains = gains.rolling(window=period).mean()
-            avg_losses = losses.rolling(window=period).mean()
-            
-            # Calculate RS and RSI
-            rs = avg_gains / avg_losses
-            rsi = 100 - (100 / (1 + rs))
-            
-            current_rsi = float(rsi.iloc[-1])
-            logger.info(f"Calculated RSI for {symbol}: {current_rsi:.2f}")
-            
+            current_rsi = self._rsi(self._closes(hist), period)
+            if current_rsi is not None:
+                logger.info(f"Calculated RSI for {symbol}: {current_rsi:.2f}")
             return current_rsi
             
         except Exception as e:
             logger.error(f"Error calculating RSI for {symbol}: {e}")
             return None
     
+    def analyze(
+        self,
+        symbol: str,
+        periods: Optional[List[int]] = None,
+        rsi_period: int = 14
+    ) -> dict:
+        """
+        Volatility, moving averages and RSI from a single history fetch.
+        
+        One year of daily bars covers all three calculations, so a stock
+        detail view needs one request instead of three.
+        
+        Args:
+            symbol: Stock symbol
+            periods: List of periods for SMA calculation (default: 20, 50, 200)
+            rsi_period: RSI period
+        
+        Returns:
+            {'symbol', 'volatility', 'moving_averages', 'rsi'}; values are
+            None (or empty) when history is missing or too short
+        """
+        if periods is None:
+            periods = [20, 50, 200]
+        result = {'symbol': symbol, 'volatility': None, 'moving_averages': {}, 'rsi': None}
+        
+        try:
+            hist = self.fetch_historical_data(symbol, period='1y', interval='1d')
+            if hist.empty:
+                return result
+            
+            close = self._closes(hist)
+            result['volatility'] = self._volatility(close)
+            result['moving_averages'] = self._moving_averages(close, periods)
+            result['rsi'] = self._rsi(close, rsi_period)
+            
+            logger.info(f"Analyzed {symbol}: {result}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error analyzing {symbol}: {e}")
+            return result
+    
     def to_dataframe(self, stocks: List[StockData]) -> pd.DataFrame:
         """
         Convert list of StockData to pandas DataFrame.
@@ -329,7 +669,47 @@ class YahooFinanceFallback:
         if not stocks:
             return pd.DataFrame()
         
-        data = [stock.dict() for stock in stocks]
-        df = pd.DataFrame(data)
+        df = MarketFrame.from_stocks(stocks).to_dataframe()
         
         return df
+
+
+class AsyncYahooFinanceFallback:
+    """
+    Asyncio facade over YahooFinanceFallback.
+    
+    yfinance has no async API, so every call is dispatched to an executor
+    and awaited; the event loop stays free while Yahoo responds.
+    """
+    
+    def __init__(self, client: YahooFinanceFallback, executor: Optional[Executor] = None):
+        """
+        Initialize the async Yahoo Finance facade.
+        
+        Args:
+            client: Synchronous client whose cache and settings are shared
+            executor: Executor for blocking calls (defaults to the loop's executor)
+        """
+        self.client = client
+        self.executor = executor
+    
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+    
+    async def fetch_stock_data(self, symbol: str, use_cache: bool = True) -> Optional[StockData]:
+        return await self._run(self.client.fetch_stock_data, symbol, use_cache)
+    
+    async def fetch_all_stocks(self, symbols: Optional[List[str]] = None) -> List[StockData]:
+        return await self._run(self.client.fetch_all_stocks, symbols)
+    
+    async def fetch_historical_data(
+        self,
+        symbol: str,
+        period: str = '1y',
+        interval: str = '1d'
+    ) -> pd.DataFrame:
+        return await self._run(self.client.fetch_historical_data, symbol, period, interval)
+    
+    async def analyze(self, symbol: str) -> dict:
+        return await self._run(self.client.analyze, symbol)
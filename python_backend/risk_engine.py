@@ -0,0 +1,224 @@
+"""
+Portfolio Risk Engine
+=====================
+
+Value at Risk (VaR) and Conditional VaR / Expected Shortfall (CVaR) of a
+stock portfolio, from the aligned daily returns the data pipeline keeps for
+the symbol universe (see data_pipeline.correlation).
+
+Three estimates are provided:
+- Historical: the portfolio is revalued over every past window of the
+  horizon in the lookback, compounding each stock's returns
+- Parametric: normal distribution with the sample mean and covariance
+- Monte Carlo: correlated normal return paths, compounded per stock and
+  generated in fixed-size chunks so memory stays bounded for any number
+  of simulations
+
+Losses are reported as positive fractions of portfolio value.
+"""
+
+import logging
+from statistics import NormalDist
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RiskModel:
+    """
+    Return moments of the universe over a lookback window.
+    
+    Built once per trading day (the covariance matrix is the expensive
+    part) and then queried for any portfolio.
+    
+    Usage:
+        model = RiskModel(pipeline.get_daily_returns(), lookback=250)
+        weights = model.weight_vector({'ATW': 0.6, 'IAM': 0.4})
+        var, cvar = model.historical(weights, confidence=0.95)
+        var, cvar = model.monte_carlo(weights, confidence=0.95, horizon_days=10)
+    """
+    
+    LOOKBACK = 250
+    
+    # Fewest observed returns for a stock (or pair) to enter the covariance
+    MIN_PERIODS = 20
+    
+    # Simulated returns held in memory at once (paths x days x symbols)
+    CHUNK_ELEMENTS = 2_000_000
+    
+    def __init__(self, returns: pd.DataFrame, lookback: int = LOOKBACK):
+        """
+        Estimate the model.
+        
+        Args:
+            returns: Daily simple returns, dates x symbols (NaN where missing)
+            lookback: Most recent trading days used
+        """
+        window = returns.iloc[-lookback:]
+        window = window.loc[:, window.notna().sum() >= self.MIN_PERIODS]
+        
+        self.lookback = lookback
+        self.symbols: List[str] = list(window.columns)
+        self.as_of: Optional[pd.Timestamp] = window.index[-1] if len(window) else None
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        
+        # A missing return is treated as an unchanged price
+        self.scenarios = window.to_numpy(dtype=np.float64, na_value=np.nan)
+        self.scenarios = np.where(np.isfinite(self.scenarios), self.scenarios, 0.0)
+        
+        self.mean = np.nan_to_num(window.mean().to_numpy(dtype=np.float64))
+        self.covariance = np.nan_to_num(window.cov(min_periods=self.MIN_PERIODS).to_numpy(dtype=np.float64))
+        
+        logger.info(f"Risk model estimated: {len(self.symbols)} symbols over {len(window)} days")
+    
+    def weight_vector(self, weights: Dict[str, float]) -> np.ndarray:
+        """
+        Portfolio weights aligned with `symbols`.
+        
+        Args:
+            weights: Symbol -> fraction of portfolio value (negative for short)
+        
+        Returns:
+            Weight per model symbol (0 for symbols not held)
+        
+        Raises:
+            KeyError: If a symbol has no (or too little) return history
+        """
+        vector = np.zeros(len(self.symbols))
+        for symbol, weight in weights.items():
+            if symbol not in self._positions:
+                raise KeyError(symbol)
+            vector[self._positions[symbol]] = weight
+        return vector
+    
+    def factor(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Lower-triangular L with L @ L.T equal to the covariance of some symbols.
+        
+        Pairwise-complete covariances need not be positive semi-definite,
+        so negative eigenvalues are clipped to zero before factoring.
+        
+        Args:
+            positions: Indices into `symbols`
+        """
+        covariance = self.covariance[np.ix_(positions, positions)]
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        repaired = (eigenvectors * np.clip(eigenvalues, 0, None)) @ eigenvectors.T
+        jitter = 1e-12 * max(np.trace(repaired), 1e-12)
+        return np.linalg.cholesky(repaired + jitter * np.eye(len(positions)))
+    
+    def portfolio_volatility(self, weights: np.ndarray) -> float:
+        """Daily standard deviation of portfolio returns."""
+        return float(np.sqrt(max(weights @ self.covariance @ weights, 0.0)))
+    
+    @staticmethod
+    def _tail(pnl: np.ndarray, confidence: float) -> tuple[float, float]:
+        """VaR and CVaR (positive losses) of a sample of portfolio returns."""
+        threshold = np.quantile(pnl, 1 - confidence)
+        return float(-threshold), float(-pnl[pnl <= threshold].mean())
+    
+    def historical(self, weights: np.ndarray, confidence: float = 0.95, horizon_days: int = 1) -> tuple[float, float]:
+        """
+        Historical-simulation VaR and CVaR.
+        
+        Multi-day horizons use overlapping windows of past returns,
+        compounded per stock as in monte_carlo.
+        
+        Returns:
+            (var, cvar) as fractions of portfolio value
+        """
+        if len(self.scenarios) < horizon_days:
+            raise ValueError(f"Not enough history for a {horizon_days}-day horizon")
+        
+        held = np.flatnonzero(weights)
+        windows = np.lib.stride_tricks.sliding_window_view(self.scenarios[:, held], horizon_days, axis=0)
+        growth = np.prod(1.0 + windows, axis=-1) - 1.0
+        return self._tail(growth @ weights[held], confidence)
+    
+    def parametric(self, weights: np.ndarray, confidence: float = 0.95, horizon_days: int = 1) -> tuple[float, float]:
+        """
+        Variance-covariance (normal) VaR and CVaR.
+        
+        Returns:
+            (var, cvar) as fractions of portfolio value
+        """
+        mu = float(self.mean @ weights) * horizon_days
+        sigma = self.portfolio_volatility(weights) * np.sqrt(horizon_days)
+        
+        normal = NormalDist()
+        z = normal.inv_cdf(1 - confidence)
+        var = -(mu + z * sigma)
+        cvar = -(mu - sigma * normal.pdf(z) / (1 - confidence))
+        return float(var), float(cvar)
+    
+    def monte_carlo(
+        self,
+        weights: np.ndarray,
+        confidence: float = 0.95,
+        horizon_days: int = 1,
+        simulations: int = 100_000,
+        seed: Optional[int] = None
+    ) -> tuple[float, float]:
+        """
+        Monte Carlo VaR and CVaR from correlated return paths.
+        
+        Each path draws `horizon_days` daily return vectors
+        mean + L @ z (z standard normal), compounds them per stock and
+        revalues the portfolio. Paths are generated in chunks of at most
+        CHUNK_ELEMENTS simulated returns; only the portfolio outcome of each
+        path is kept.
+        
+        Returns:
+            (var, cvar) as fractions of portfolio value
+        """
+        rng = np.random.default_rng(seed)
+        held = np.flatnonzero(weights)
+        if len(held) == 0:
+            return 0.0, 0.0
+        
+        # Only held stocks are simulated, from their own sub-covariance
+        factor_t = self.factor(held).T
+        mean, weights = self.mean[held], weights[held]
+        chunk = max(1, self.CHUNK_ELEMENTS // (horizon_days * len(held)))
+        
+        pnl = np.empty(simulations)
+        for start in range(0, simulations, chunk):
+            size = min(chunk, simulations - start)
+            shocks = rng.standard_normal((size, horizon_days, len(held)))
+            daily = mean + shocks @ factor_t
+            growth = np.prod(1.0 + daily, axis=1) - 1.0
+            pnl[start:start + size] = growth @ weights
+        
+        return self._tail(pnl, confidence)
+    
+    def evaluate(
+        self,
+        weights: Dict[str, float],
+        confidence: float = 0.95,
+        horizon_days: int = 1,
+        simulations: int = 100_000,
+        seed: Optional[int] = None
+    ) -> dict:
+        """
+        All three VaR/CVaR estimates for one portfolio.
+        
+        Returns:
+            {'volatility', 'historical', 'parametric', 'monte_carlo'}; each
+            estimate is {'var', 'cvar'} as fractions of portfolio value and
+            volatility is the annualized portfolio volatility
+        """
+        vector = self.weight_vector(weights)
+        
+        estimates = {
+            'historical': self.historical(vector, confidence, horizon_days),
+            'parametric': self.parametric(vector, confidence, horizon_days),
+            'monte_carlo': self.monte_carlo(vector, confidence, horizon_days, simulations, seed)
+        }
+        
+        result = {'volatility': float(self.portfolio_volatility(vector) * np.sqrt(252))}
+        for method, (var, cvar) in estimates.items():
+            result[method] = {'var': var, 'cvar': cvar}
+        return result
@@ -0,0 +1,112 @@
+"""
+Shared fixtures: an offline pipeline and synthetic Yahoo Finance data.
+"""
+
+import importlib
+import sys
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_pipeline import AsyncMarketDataPipeline
+from data_pipeline.config import DataSourceConfig, PipelineConfig
+from data_pipeline import yahoo_fallback
+from data_pipeline.schemas import MarketIndices, StockData
+
+SECTORS = {'ATW': 'Banking', 'BCP': 'Banking', 'IAM': 'Telecommunications', 'MNG': 'Mining'}
+
+
+def synthetic_closes(symbol: str, bars: int) -> np.ndarray:
+    """Deterministic random-walk closes for a symbol."""
+    rng = np.random.default_rng(sum(map(ord, symbol)))
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+
+
+def synthetic_history(symbol: str, bars: int = 300, end: pd.Timestamp = None) -> pd.DataFrame:
+    """Daily OHLCV bars (lower-case columns) ending on `end` (default: yesterday)."""
+    if end is None:
+        end = pd.Timestamp.now(tz='Africa/Casablanca').normalize() - pd.Timedelta(days=1)
+    index = pd.date_range(end=end, periods=bars, freq='D')
+    close = synthetic_closes(symbol, bars)
+    return pd.DataFrame(
+        {'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close, 'volume': 1000},
+        index=index
+    )
+
+
+def fake_download(tickers, **kwargs) -> pd.DataFrame:
+    """Stand-in for yfinance.download returning five bars per ticker."""
+    index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=5, freq='D')
+    frames = {}
+    for field in ('Open', 'High', 'Low', 'Close', 'Volume'):
+        frames[field] = pd.DataFrame(
+            {ticker: synthetic_closes(ticker, 5) if field != 'Volume' else np.full(5, 1000.0) for ticker in tickers},
+            index=index
+        )
+    return pd.concat(frames, axis=1)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Pipeline with no network access, caches on disk, or background refresh."""
+    monkeypatch.setattr(yahoo_fallback.yf, 'download', fake_download)
+    config = PipelineConfig(
+        data_source=DataSourceConfig(
+            history_store_dir=None,
+            universe_cache_path=None,
+            indicator_state_path=None,
+            max_retries=1
+        ),
+        enable_background_refresh=False
+    )
+    return AsyncMarketDataPipeline(config)
+
+
+def exchange_snapshot(bump: float = 0.0):
+    """Indices and stocks as the exchange client returns them, prices shifted by bump."""
+    indices = MarketIndices(
+        masi=13000 + bump, masi_change=0.5, madex=10000 + bump, madex_change=0.4,
+        source='casablanca_bourse', market_status='open'
+    )
+    stocks = [
+        StockData(
+            symbol=symbol, name=f'{symbol} SA', price=Decimal(str(100 + i + bump)), volume=1000 * (i + 1),
+            change=Decimal('1.5'), change_percent=Decimal(str(1.1 * i)), source='casablanca_bourse', sector=sector
+        )
+        for i, (symbol, sector) in enumerate(SECTORS.items())
+    ]
+    return indices, stocks, 'casablanca_bourse'
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """
+    The API server's app with an offline pipeline.
+    
+    Snapshots come from exchange_snapshot(api.bump); raise api.bump and
+    force a refresh to produce a new snapshot version.
+    """
+    for name in ('HISTORY_STORE_DIR', 'UNIVERSE_CACHE_PATH', 'INDICATOR_STATE_PATH'):
+        monkeypatch.setenv(name, '')
+    monkeypatch.setenv('ENABLE_BACKGROUND_REFRESH', 'false')
+    monkeypatch.setattr(yahoo_fallback.yf, 'download', fake_download)
+    
+    from fastapi.testclient import TestClient
+    server = importlib.import_module('api_server')
+    state = SimpleNamespace(bump=0.0)
+    
+    async def fetch_from_primary():
+        return exchange_snapshot(state.bump)
+    
+    monkeypatch.setattr(server.pipeline, '_fetch_from_primary_async', fetch_from_primary)
+    monkeypatch.setattr(server.pipeline, '_fetch_from_primary', lambda: exchange_snapshot(state.bump))
+    
+    state.server = server
+    state.client = TestClient(server.app)
+    return state
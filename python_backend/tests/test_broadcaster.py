@@ -0,0 +1,76 @@
+"""
+Streaming fan-out.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from data_pipeline.broadcaster import MarketBroadcaster
+from data_pipeline.market_frame import MarketFrame
+
+from .conftest import exchange_snapshot
+
+
+def snapshot(version: int, drop=()):
+    indices, stocks, _ = exchange_snapshot(version)
+    return SimpleNamespace(
+        frame=MarketFrame.from_stocks(s for s in stocks if s.symbol not in drop),
+        indices=indices,
+        fetch_metadata={'snapshot_version': version}
+    )
+
+
+def delta(version: int, symbols=(), removed=()):
+    return {
+        'version': version,
+        'indices': {},
+        'stocks': [{'symbol': symbol, 'price': 1.0} for symbol in symbols],
+        'removed': list(removed)
+    }
+
+
+def test_updates_are_filtered_per_subscription():
+    async def scenario():
+        broadcaster = MarketBroadcaster()
+        everything = broadcaster.subscribe()
+        by_symbol = broadcaster.subscribe(symbols=['IAM'])
+        by_sector = broadcaster.subscribe(sectors=['Banking'])
+        
+        broadcaster.publish(snapshot(1), None)
+        broadcaster.publish(snapshot(2), delta(2, symbols=['ATW', 'IAM']))
+        # BCP (Banking) is delisted in version 3
+        broadcaster.publish(snapshot(3, drop=['BCP']), delta(3, symbols=['MNG'], removed=['BCP']))
+        await asyncio.sleep(0)
+        
+        received = {}
+        for name, subscription in (('all', everything), ('symbol', by_symbol), ('sector', by_sector)):
+            received[name] = [subscription._queue.get_nowait() for _ in range(subscription._queue.qsize())]
+        return received
+    
+    received = asyncio.run(scenario())
+    
+    assert [len(m['stocks']) for m in received['all']] == [4, 2, 1]
+    assert received['all'][2]['removed'] == ['BCP']
+    
+    assert [[row['symbol'] for row in m['stocks']] for m in received['symbol']] == [['IAM'], ['IAM']]
+    
+    assert [[row['symbol'] for row in m['stocks']] for m in received['sector']] == [['ATW', 'BCP'], ['ATW'], []]
+    assert received['sector'][2]['removed'] == ['BCP']
+
+
+def test_slow_subscriber_keeps_latest_updates():
+    async def scenario():
+        broadcaster = MarketBroadcaster(max_pending=2)
+        subscription = broadcaster.subscribe()
+        for version in range(1, 6):
+            broadcaster.publish(snapshot(version), delta(version, symbols=['ATW']))
+        await asyncio.sleep(0)
+        
+        versions = [(await subscription.get())['version'] for _ in range(2)]
+        return versions, subscription.dropped, broadcaster.get_status()
+    
+    versions, dropped, status = asyncio.run(scenario())
+    
+    assert versions == [4, 5]
+    assert dropped == 3
+    assert status == {'subscribers': 1, 'published': 5, 'dropped': 3}
@@ -0,0 +1,80 @@
+"""
+Exchange client parsing.
+"""
+
+import asyncio
+import json
+from decimal import Decimal
+
+import httpx
+import requests
+
+from data_pipeline.casablanca_source import (
+    AsyncCasablancaBourseClient,
+    CasablancaBourseClient,
+    _parse_index_html,
+    _parse_indices
+)
+
+INDICES = {'masi': {'value': 13250.5, 'change_percent': 0.42, 'volume': 1200}, 'madex': {'value': 10800.25, 'change_percent': -0.1}}
+
+HOME_PAGE = """
+<html><body>
+  <span id="masi-value">13,250.50</span><span id="masi-change">0.42%</span>
+  <span id="madex-value">10,800.25 MAD</span><span id="madex-change">-0.10%</span>
+</body></html>
+"""
+
+
+def responses(url: str):
+    """(status, body) the fake exchange answers; the JSON indices API is down."""
+    if url.endswith('/api/indices'):
+        return 404, ''
+    if url.endswith('/api/stock/ATW'):
+        return 200, json.dumps({'price': 500.5, 'volume': 10, 'change': 1.5, 'change_percent': 0.3})
+    return 200, HOME_PAGE
+
+
+class FakeSession:
+    def get(self, url, timeout=None):
+        response = requests.Response()
+        response.status_code, body = responses(url)
+        response._content = body.encode()
+        return response
+
+
+def test_parsers():
+    indices = _parse_indices(INDICES, 'decimal', 'open')
+    assert indices.masi == Decimal('13250.5') and indices.masi_volume == 1200
+    assert indices.madex_change == Decimal('-0.1') and indices.madex_volume is None
+    
+    scraped = _parse_index_html(HOME_PAGE, 'float', 'closed')
+    assert (scraped.masi, scraped.masi_change, scraped.madex, scraped.madex_change) == (13250.5, 0.42, 10800.25, -0.1)
+    assert scraped.market_status == 'closed'
+    
+    assert _parse_index_html('<html></html>', 'float', 'closed') is None
+
+
+def test_sync_and_async_clients_parse_alike():
+    sync_client = CasablancaBourseClient(max_retries=0)
+    sync_client.session = FakeSession()
+    
+    def handler(request):
+        status, body = responses(str(request.url))
+        return httpx.Response(status, text=body)
+    
+    async def fetch_async():
+        client = AsyncCasablancaBourseClient(max_retries=0)
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await client.fetch_market_indices(), await client.fetch_stock_data('ATW')
+        finally:
+            await client.aclose()
+    
+    async_indices, async_stock = asyncio.run(fetch_async())
+    sync_indices, sync_stock = sync_client.fetch_market_indices(), sync_client.fetch_stock_data('ATW')
+    
+    assert sync_indices.masi == 13250.5
+    assert async_indices.model_dump(exclude={'timestamp'}) == sync_indices.model_dump(exclude={'timestamp'})
+    assert async_stock.model_dump(exclude={'timestamp'}) == sync_stock.model_dump(exclude={'timestamp'})
@@ -0,0 +1,92 @@
+"""
+Response compression.
+"""
+
+import gzip
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from data_pipeline.compression import CompressionMiddleware, choose_encoding
+from data_pipeline.serialization import VersionedPayload
+
+
+def snapshot_payload(version: int) -> VersionedPayload:
+    stocks = [{'symbol': f'S{i}', 'price': 100.0 + i + version} for i in range(200)]
+    return VersionedPayload(version, {
+        'stocks': stocks,
+        'fetch_metadata': {
+            'snapshot_version': version,
+            'snapshot_age_seconds': VersionedPayload.slot('snapshot_age_seconds'),
+            'stale': VersionedPayload.slot('stale')
+        }
+    })
+
+
+def test_spliced_gzip_matches_plain_body():
+    for version in (1, 2):
+        payload = snapshot_payload(version)
+        assert payload.encodings == ('gzip',)
+        
+        # Each request resumes a copy of the same cached compressor
+        for age, stale in ((0.5, False), (61.25, True), (None, None)):
+            spliced = payload.encode('gzip', snapshot_age_seconds=age, stale=stale)
+            assert gzip.decompress(spliced) == payload.render(snapshot_age_seconds=age, stale=stale)
+
+
+def test_payload_without_slots_is_compressed_once():
+    payload = VersionedPayload(1, {'sectors': ['Banking'] * 100})
+    
+    body = payload.encode('gzip')
+    assert gzip.decompress(body) == payload.render()
+    assert payload.encode('gzip') is body
+
+
+def test_choose_encoding():
+    assert choose_encoding('gzip, deflate', ('br', 'gzip')) == 'gzip'
+    assert choose_encoding('br;q=0, gzip;q=0.5', ('br', 'gzip')) == 'gzip'
+    assert choose_encoding('*', ('br', 'gzip')) == 'br'
+    assert choose_encoding('identity', ('gzip',)) is None
+    assert choose_encoding(None) is None
+
+
+def test_middleware_skips_excluded_and_small_bodies():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    large = b'{"rows":[' + b'{"symbol":"ATW","price":500.0},' * 100 + b'{}]}'
+    
+    @app.get('/json')
+    def json_body():
+        return Response(large, media_type='application/json')
+    
+    @app.get('/small')
+    def small_body():
+        return Response(b'{"ok":true}', media_type='application/json')
+    
+    @app.get('/parquet')
+    def parquet_body():
+        return Response(large, media_type='application/vnd.apache.parquet')
+    
+    @app.get('/stream')
+    def stream_body():
+        return Response(large, media_type='text/event-stream')
+    
+    client = TestClient(app)
+    headers = {'Accept-Encoding': 'gzip'}
+    
+    response = client.get('/json', headers=headers)
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.content == large
+    assert 'Accept-Encoding' in response.headers['vary']
+    
+    for path in ('/small', '/parquet', '/stream'):
+        response = client.get(path, headers=headers)
+        assert 'content-encoding' not in response.headers, path
+        assert len(response.content) == int(response.headers['content-length'])
+
+
+def test_snapshot_is_served_pre_compressed(api):
+    response = api.client.get('/api/market/snapshot?use_mock=false', headers={'Accept-Encoding': 'gzip'})
+    
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.json()['fetch_metadata']['snapshot_age_seconds'] is not None
@@ -0,0 +1,51 @@
+"""
+Incremental return correlation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline.correlation import CorrelationEngine
+
+from .conftest import synthetic_history
+
+
+def make_histories(bars: int) -> dict:
+    histories = {symbol: synthetic_history(symbol, bars=bars) for symbol in ('ATW', 'IAM', 'BCP', 'MNG')}
+    # Gaps: one symbol misses a stretch, another a few scattered closes
+    histories['MNG'].iloc[40:70, histories['MNG'].columns.get_loc('close')] = np.nan
+    histories['BCP'].iloc[[5, 60, 90, 95], histories['BCP'].columns.get_loc('close')] = np.nan
+    return histories
+
+
+def expected_matrix(engine: CorrelationEngine, window: int) -> pd.DataFrame:
+    return engine.returns.tail(window).corr(min_periods=engine.min_periods(window))
+
+
+def test_sliding_sums_match_pandas():
+    histories = make_histories(200)
+    engine = CorrelationEngine(max_window=60)
+    
+    # Start short of the window, then slide it forward a few days at a time
+    engine.update({symbol: df.iloc[:40] for symbol, df in histories.items()})
+    engine.matrix(window=30)
+    for end in range(45, 201, 5):
+        engine.update({symbol: df.iloc[:end] for symbol, df in histories.items()})
+        
+        symbols, matrix = engine.matrix(window=30)
+        expected = expected_matrix(engine, 30).loc[symbols, symbols].to_numpy()
+        np.testing.assert_allclose(matrix, expected, atol=1e-9, equal_nan=True)
+
+
+def test_corrected_last_close_reaches_the_matrix():
+    histories = make_histories(100)
+    engine = CorrelationEngine(max_window=60)
+    engine.update(histories)
+    engine.matrix(window=30)
+    
+    histories['ATW'].iloc[-1, histories['ATW'].columns.get_loc('close')] *= 1.05
+    assert engine.update(histories) == 0
+    
+    symbols, matrix = engine.matrix(window=30)
+    expected = CorrelationEngine.return_matrix(histories).tail(30).corr(min_periods=20)
+    np.testing.assert_allclose(matrix, expected.loc[symbols, symbols].to_numpy(), atol=1e-9, equal_nan=True)
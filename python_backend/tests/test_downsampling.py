@@ -0,0 +1,49 @@
+"""
+LTTB chart downsampling.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_pipeline.downsampling import downsample_frame, lttb_indices
+
+from .conftest import synthetic_closes, synthetic_history
+
+
+@pytest.mark.parametrize('n, max_points', [(1000, 100), (1000, 3), (50, 49), (7, 5)])
+def test_keeps_endpoints_and_exact_count(n, max_points):
+    y = synthetic_closes('ATW', n)
+    indices = lttb_indices(np.arange(n), y, max_points)
+    
+    assert len(indices) == max_points
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_short_series_pass_through():
+    y = synthetic_closes('IAM', 20)
+    np.testing.assert_array_equal(lttb_indices(np.arange(20), y, 20), np.arange(20))
+    np.testing.assert_array_equal(lttb_indices(np.arange(20), y, 100), np.arange(20))
+    
+    history = synthetic_history('IAM', bars=20)
+    assert downsample_frame(history, 20) is history
+
+
+def test_spike_survives():
+    y = np.sin(np.linspace(0, 6, 5000))
+    y[3217] = 25.0
+    
+    assert 3217 in lttb_indices(np.arange(5000), y, 200)
+
+
+def test_frame_rows_are_kept_whole():
+    history = synthetic_history('BCP', bars=500)
+    history.iloc[10, history.columns.get_loc('close')] = np.nan
+    
+    sampled = downsample_frame(history, 60)
+    
+    assert len(sampled) == 60
+    assert sampled.index.is_monotonic_increasing
+    assert sampled['close'].notna().all()
+    pd.testing.assert_frame_equal(sampled, history.loc[sampled.index])
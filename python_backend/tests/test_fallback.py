@@ -0,0 +1,63 @@
+"""
+Yahoo Finance fallback path.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .conftest import synthetic_history
+
+
+def test_fallback_fetches_universe(pipeline):
+    indices, stocks, source = pipeline._fetch_from_fallback()
+    
+    assert source == 'yahoo_finance'
+    assert indices is not None
+    assert {s.symbol for s in stocks} == set(pipeline.universe.yahoo_symbols())
+
+
+def test_async_fallback_fetches_universe(pipeline):
+    indices, stocks, source = asyncio.run(pipeline._fetch_from_fallback_async())
+    
+    assert source == 'yahoo_finance'
+    assert {s.symbol for s in stocks} == set(pipeline.universe.yahoo_symbols())
+
+
+def test_symbols_without_ticker_are_skipped(pipeline, monkeypatch):
+    requested = []
+    monkeypatch.setattr(
+        pipeline.fallback_source, '_download_history',
+        lambda ticker, **kwargs: requested.append(ticker) or pd.DataFrame()
+    )
+    
+    assert pipeline.fallback_source.fetch_historical_data('SRM').empty
+    assert 'SRM' not in {s.symbol for s in pipeline.fallback_source.fetch_all_stocks(['ATW', 'SRM'])}
+    pipeline._advance_indicator_state(['SRM'])
+    
+    assert requested == []
+
+
+def test_unusable_memo_entry_yields_empty_history(pipeline):
+    client = pipeline.fallback_source
+    naive = synthetic_history('ATW', bars=60).tz_localize(None)
+    client._history_memo[('ATW', '1d')] = (time.monotonic(), None, naive)
+    
+    assert client.fetch_historical_data('ATW', period='1mo').empty
+
+
+def test_analyze_matches_individual_indicators(pipeline, monkeypatch):
+    client = pipeline.fallback_source
+    history = synthetic_history('ATW', bars=250)
+    history.iloc[[3, 120, 240], history.columns.get_loc('close')] = np.nan
+    monkeypatch.setattr(client, 'fetch_historical_data', lambda symbol, period='1y', interval='1d': history.copy())
+    
+    result = client.analyze('ATW')
+    
+    assert result['volatility'] == pytest.approx(client.calculate_volatility('ATW'))
+    assert result['moving_averages'] == pytest.approx(client.calculate_moving_averages('ATW'))
+    assert result['rsi'] == pytest.approx(client.calculate_rsi('ATW'))
+    assert not np.isnan(result['rsi'])
@@ -0,0 +1,67 @@
+"""
+Memory-mapped OHLCV history store.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline.history_store import HistoryStore
+from data_pipeline.yahoo_fallback import YahooFinanceFallback
+
+from .conftest import synthetic_history
+
+
+def test_read_restores_volume_dtype(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    history = synthetic_history('ATW', bars=30)
+    store.replace('ATW', '1d', history.iloc[:20], coverage_start=None)
+    store.append('ATW', '1d', history.iloc[20:])
+    
+    df = store.read('ATW', '1d')
+    
+    assert df['volume'].dtype == np.int64
+    pd.testing.assert_frame_equal(df, history, check_index_type=False, check_freq=False)
+    
+    df.loc[df.index[0], 'close'] = 0.0
+    assert store.read('ATW', '1d')['close'].iloc[0] == history['close'].iloc[0]
+
+
+def test_shorter_replace_leaves_mapped_views_readable(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    history = synthetic_history('ATW', bars=2000)
+    store.replace('ATW', '1d', history, coverage_start=None)
+    view = store.read_arrays('ATW', '1d')['close']
+    
+    # Truncating the files would make this read past the new end of file
+    store.replace('ATW', '1d', history.iloc[-5:], coverage_start=None)
+    
+    assert view[-1] == history['close'].iloc[-1]
+    assert len(store.read('ATW', '1d')) == 5
+    assert store.read('ATW', '1d')['close'].iloc[0] == history['close'].iloc[-5]
+
+
+def test_concurrent_requests_download_a_series_once(tmp_path, monkeypatch):
+    client = YahooFinanceFallback(history_store_dir=str(tmp_path))
+    history = synthetic_history('ATW', bars=30)
+    downloads = []
+    
+    def download(yahoo_symbol, **kwargs):
+        downloads.append(kwargs)
+        time.sleep(0.05)
+        return history.copy()
+    
+    monkeypatch.setattr(client, '_download_history', download)
+    
+    threads = [
+        threading.Thread(target=client._fetch_with_store, args=('ATW', 'ATW.CS', 'max', '1d'))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(downloads) == 1
@@ -0,0 +1,55 @@
+"""
+Incremental technical indicators.
+"""
+
+import asyncio
+import threading
+import time as clock
+from datetime import time
+
+import numpy as np
+
+from data_pipeline.indicators import IndicatorEngine
+
+from .conftest import synthetic_history
+
+
+def test_closed_market_indicators_match_engine(pipeline, monkeypatch):
+    histories = {symbol: synthetic_history(symbol) for symbol in ('ATW', 'IAM')}
+    monkeypatch.setattr(
+        pipeline.fallback_source, 'fetch_historical_data',
+        lambda symbol, period='1y', interval='1d': histories[symbol].copy()
+    )
+    # Session not started yet: the live price is the last close
+    monkeypatch.setattr(pipeline.primary_source, 'MARKET_OPEN', time.max)
+    
+    prices = {symbol: float(df['close'].iloc[-1]) for symbol, df in histories.items()}
+    indicators = pipeline._fetch_technical_indicators(list(histories), prices)
+    
+    engine = IndicatorEngine(lookback_bars=1000)
+    for symbol, df in histories.items():
+        expected = engine.compute_arrays(df['close'].to_numpy()[None, :])
+        for field, values in expected.items():
+            assert np.isclose(getattr(indicators[symbol], field), values[0], rtol=1e-9), field
+
+
+def test_sync_and_async_syncs_advance_the_state_one_at_a_time(pipeline, monkeypatch):
+    histories = {symbol: synthetic_history(symbol) for symbol in ('ATW', 'IAM')}
+    active, overlaps = [], []
+    
+    def closed_history(symbol, period):
+        active.append(symbol)
+        overlaps.append(len(active))
+        clock.sleep(0.02)
+        active.remove(symbol)
+        return histories[symbol]
+    
+    monkeypatch.setattr(pipeline, '_closed_daily_history', closed_history)
+    
+    sync = threading.Thread(target=pipeline._fetch_technical_indicators, args=(list(histories),))
+    sync.start()
+    asyncio.run(pipeline._fetch_technical_indicators_async(list(histories)))
+    sync.join()
+    
+    assert max(overlaps) == 1
+    assert len(pipeline.indicator_state) == len(histories)
@@ -0,0 +1,56 @@
+"""
+Columnar snapshot frame.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from data_pipeline.market_frame import MarketFrame
+from data_pipeline.schemas import StockData
+
+
+def make_stocks():
+    return [
+        StockData(symbol='ATW', name='Attijariwafa', price=Decimal('500'), volume=100,
+                  change=Decimal('5'), change_percent=Decimal('1.0'), source='casablanca_bourse', sector='Banking'),
+        StockData(symbol='BCP', name='BCP', price=Decimal('300'), volume=200,
+                  change=Decimal('3'), change_percent=Decimal('3.0'), source='casablanca_bourse', sector='Banking'),
+        StockData(symbol='IAM', name='Maroc Telecom', price=Decimal('100'), volume=300,
+                  change=Decimal('-1'), change_percent=Decimal('-1.0'), source='casablanca_bourse',
+                  sector='Telecommunications')
+    ]
+
+
+def test_dataframe_is_writable():
+    frame = MarketFrame.from_stocks(make_stocks())
+    df = frame.to_dataframe()
+    
+    df.loc[0, 'price'] = 1.0
+    df.iloc[1, df.columns.get_loc('volume')] = 7
+    df.at[2, 'change'] = 0.0
+    
+    assert frame['price'][0] == 500.0
+    assert frame['volume'][1] == 200
+
+
+def test_zero_copy_dataframe_is_read_only():
+    frame = MarketFrame.from_stocks(make_stocks())
+    df = frame.to_dataframe(copy=False)
+    
+    assert np.shares_memory(df['price'].to_numpy(), frame['price'])
+    with pytest.raises(ValueError):
+        df['price'].values[0] = 1.0
+
+
+def test_sector_average_skips_missing_changes():
+    stocks = make_stocks()
+    stocks[0] = stocks[0].model_copy(update={'change_percent': float('nan')})
+    stocks[2] = stocks[2].model_copy(update={'change_percent': None})
+    
+    summary = {row['sector']: row for row in MarketFrame.from_stocks(stocks).sector_summary()}
+    
+    assert summary['Banking']['stock_count'] == 2
+    assert summary['Banking']['avg_change'] == pytest.approx(3.0)
+    assert summary['Telecommunications']['avg_change'] is None
@@ -0,0 +1,163 @@
+"""
+Circuit breaker and retries of the exchange client.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import requests
+
+from data_pipeline import resilience
+from data_pipeline.casablanca_source import AsyncCasablancaBourseClient, CasablancaBourseClient
+from data_pipeline.resilience import CircuitBreaker, CircuitOpenError, backoff_delays
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSession:
+    """Stand-in for requests.Session answering with queued status codes (None raises)."""
+    
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+    
+    def get(self, url, timeout=None):
+        self.calls += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status is None:
+            raise requests.ConnectionError(f"Connection refused: {url}")
+        response = requests.Response()
+        response.status_code = status
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, 'time', SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def client(monkeypatch, clock):
+    monkeypatch.setattr('data_pipeline.casablanca_source._time.sleep', lambda seconds: None)
+    return CasablancaBourseClient(
+        max_retries=2,
+        circuit_failure_threshold=3,
+        circuit_recovery_seconds=30,
+        retry_backoff_seconds=0.01
+    )
+
+
+def test_breaker_opens_probes_once_and_closes(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=30)
+    
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    
+    # Failing probe: one request allowed, then open again
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    
+    # Succeeding probe closes it
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_status()['consecutive_failures'] == 0
+    assert breaker.get_status()['rejected_requests'] == 3
+
+
+def test_backoff_delays_are_bounded():
+    delays = list(backoff_delays(6, base_delay=0.5, max_delay=4.0))
+    
+    assert len(delays) == 6
+    for attempt, delay in enumerate(delays):
+        assert 0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
+
+
+def test_max_retries_bounds_attempts(client):
+    client.session = FakeSession([503, 503, 503, 503])
+    
+    with pytest.raises(requests.HTTPError):
+        client._get('stock', 'https://example.test/stock')
+    
+    assert client.session.calls == client.max_retries + 1
+
+
+def test_retry_recovers_and_client_errors_are_not_retried(client):
+    client.session = FakeSession([None, 200])
+    assert client._get('stock', 'https://example.test/stock').status_code == 200
+    assert client.session.calls == 2
+    
+    client.session = FakeSession([404])
+    assert client._get('stock', 'https://example.test/stock').status_code == 404
+    assert client.session.calls == 1
+    assert client.breakers['stock'].state == CircuitBreaker.CLOSED
+
+
+def test_open_breaker_skips_requests_and_marks_client_unavailable(client, clock):
+    client.session = FakeSession([None] * 3)
+    with pytest.raises(requests.ConnectionError):
+        client._get('indices', 'https://example.test/indices')
+    
+    # Retrying stopped as soon as the breaker opened
+    assert client.session.calls == 3
+    assert not client.is_available()
+    
+    with pytest.raises(CircuitOpenError):
+        client._get('indices', 'https://example.test/indices')
+    assert client.session.calls == 3
+    
+    # Failing probe: the probe is not retried and the breaker re-opens
+    clock.now += 30
+    assert client.is_available()
+    client.session = FakeSession([None])
+    with pytest.raises(requests.ConnectionError):
+        client._get('indices', 'https://example.test/indices')
+    assert client.session.calls == 1
+    assert not client.is_available()
+    
+    # Succeeding probe closes it
+    clock.now += 30
+    client.session = FakeSession([200])
+    assert client._get('indices', 'https://example.test/indices').status_code == 200
+    assert client.is_available()
+    assert client.get_circuit_status()['indices']['state'] == CircuitBreaker.CLOSED
+
+
+def test_async_client_shares_retry_bounds(monkeypatch, clock):
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(503)
+    
+    async def scenario():
+        client = AsyncCasablancaBourseClient(max_retries=2, circuit_failure_threshold=10, retry_backoff_seconds=0.001)
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client._get_async('stock', 'https://example.test/stock')
+        finally:
+            await client.aclose()
+    
+    asyncio.run(scenario())
+    assert len(calls) == 3
@@ -0,0 +1,40 @@
+"""
+Portfolio VaR/CVaR.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_engine import RiskModel
+
+
+def make_returns(symbols=40, days=300):
+    rng = np.random.default_rng(7)
+    market = rng.normal(0, 0.01, (days, 1))
+    returns = market + rng.normal(0, 0.01, (days, symbols))
+    return pd.DataFrame(returns, index=pd.bdate_range('2025-01-01', periods=days),
+                        columns=[f'S{i}' for i in range(symbols)])
+
+
+def test_monte_carlo_simulates_held_stocks_only():
+    model = RiskModel(make_returns())
+    weights = model.weight_vector({'S3': 0.7, 'S11': 0.3})
+    
+    var, cvar = model.monte_carlo(weights, confidence=0.95, simulations=200_000, seed=1)
+    expected_var, expected_cvar = model.parametric(weights, confidence=0.95)
+    
+    assert var == pytest.approx(expected_var, rel=0.03)
+    assert cvar == pytest.approx(expected_cvar, rel=0.03)
+    assert model.factor(np.flatnonzero(weights)).shape == (2, 2)
+
+
+def test_historical_compounds_each_stock_over_the_horizon():
+    returns = make_returns(symbols=3, days=60)
+    model = RiskModel(returns)
+    weights = model.weight_vector({'S0': 0.5, 'S2': -0.5})
+    
+    growth = (1 + returns).rolling(5).apply(np.prod, raw=True).dropna() - 1
+    pnl = (0.5 * growth['S0'] - 0.5 * growth['S2']).to_numpy()
+    
+    assert model.historical(weights, confidence=0.9, horizon_days=5) == pytest.approx(RiskModel._tail(pnl, 0.9))
@@ -0,0 +1,21 @@
+"""
+Numeric representation of market data.
+"""
+
+from decimal import Decimal
+
+from data_pipeline.config import DataSourceConfig, PipelineConfig
+from data_pipeline.indicators import IndicatorEngine
+from data_pipeline.schemas import to_number
+
+
+def test_float_is_the_default_everywhere():
+    assert PipelineConfig(data_source=DataSourceConfig()).numeric_mode == 'float'
+    assert IndicatorEngine().numeric_mode == 'float'
+    assert type(to_number('12.30')) is float
+
+
+def test_decimal_mode_keeps_the_source_digits():
+    assert to_number('12.30', 'decimal') == Decimal('12.30')
+    assert to_number(0.1, 'decimal') == Decimal('0.1')
+    assert to_number(Decimal('7.5'), 'decimal') == Decimal('7.5')
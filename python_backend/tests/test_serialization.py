@@ -0,0 +1,71 @@
+"""
+Versioned payloads and ETags.
+"""
+
+import json
+
+from data_pipeline.serialization import PayloadCache, VersionedPayload
+
+
+SNAPSHOT = "/api/market/snapshot?use_mock=false"
+
+
+def test_slots_are_filled_at_render_time():
+    payload = VersionedPayload(3, {'stocks': [{'symbol': 'ATW'}], 'age': VersionedPayload.slot('age')})
+    
+    assert json.loads(payload.render(age=1.5)) == {'stocks': [{'symbol': 'ATW'}], 'age': 1.5}
+    assert json.loads(payload.render(age=None))['age'] is None
+
+
+def test_etag_matching():
+    payload = VersionedPayload(7, {'a': 1})
+    other = VersionedPayload(8, {'a': 1})
+    
+    assert payload.etag.startswith('W/"') and payload.etag != other.etag
+    assert payload.matches(payload.etag)
+    assert payload.matches(payload.etag[2:])
+    assert payload.matches(f'{other.etag}, {payload.etag}')
+    assert payload.matches('*')
+    assert not payload.matches(other.etag)
+    assert not payload.matches(None)
+
+
+def test_cache_builds_once_per_version():
+    cache = PayloadCache()
+    builds = []
+    
+    def build():
+        builds.append(1)
+        return {'n': len(builds)}
+    
+    first = cache.get('snapshot', 1, build)
+    assert cache.get('snapshot', 1, build) is first
+    assert cache.get('snapshot', 2, build).render() == b'{"n":2}'
+    assert len(builds) == 2
+
+
+def test_snapshot_revalidation(api):
+    response = api.client.get(SNAPSHOT + "&force_refresh=true")
+    assert response.status_code == 200
+    etag = response.headers['etag']
+    
+    response = api.client.get(SNAPSHOT, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+    
+    api.bump += 1
+    response = api.client.get(SNAPSHOT + "&force_refresh=true", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+    assert response.json()['indices']['masi'] == 13001
+
+
+def test_stocks_endpoint_formats(api):
+    response = api.client.get('/api/stocks')
+    assert response.status_code == 200
+    assert [row['symbol'] for row in response.json()['stocks']] == ['ATW', 'BCP', 'IAM', 'MNG']
+    
+    response = api.client.get('/api/stocks?format=parquet')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/vnd.apache.parquet')
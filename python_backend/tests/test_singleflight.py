@@ -0,0 +1,34 @@
+"""
+Request coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from data_pipeline.singleflight import SingleFlight
+
+
+def test_cancelled_leader_leaves_the_call_running_for_followers():
+    flights = SingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'snapshot'
+    
+    async def scenario():
+        leader = asyncio.create_task(flights.do_async('snapshot', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do_async('snapshot', fetch))
+        await asyncio.sleep(0)
+        
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+    
+    assert asyncio.run(scenario()) == 'snapshot'
+    assert calls == [1]
+    assert flights.in_flight() == 0
@@ -0,0 +1,63 @@
+"""
+Snapshot versions and deltas.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+from data_pipeline.market_frame import MarketFrame
+from data_pipeline.snapshot_history import SnapshotHistory
+
+from .conftest import exchange_snapshot
+
+
+def market_data(indices, stocks):
+    return SimpleNamespace(frame=MarketFrame.from_stocks(stocks), indices=indices)
+
+
+def test_diff_reports_changed_added_and_removed_stocks():
+    indices, stocks, _ = exchange_snapshot()
+    history = SnapshotHistory(capacity=4)
+    history.record(1, market_data(indices, stocks))
+    
+    new_indices, new_stocks, _ = exchange_snapshot()
+    new_indices = new_indices.model_copy(update={'masi': Decimal('13050')})
+    new_stocks[0] = new_stocks[0].model_copy(update={'price': Decimal('510'), 'volume': 5000})
+    removed = new_stocks.pop(1)
+    new_stocks.append(stocks[0].model_copy(update={'symbol': 'CIH', 'name': 'CIH Bank'}))
+    history.record(2, market_data(new_indices, new_stocks))
+    
+    delta = history.diff(since=1)
+    rows = {row['symbol']: row for row in delta['stocks']}
+    
+    assert delta['since'] == 1 and delta['version'] == 2
+    assert delta['indices'] == {'masi': 13050.0}
+    assert delta['removed'] == [removed.symbol]
+    assert set(rows) == {'ATW', 'CIH'}
+    assert set(rows['ATW']) == {'symbol', 'timestamp', 'price', 'volume'}
+    assert rows['ATW']['price'] == 510.0 and rows['ATW']['volume'] == 5000
+    assert rows['CIH']['name'] == 'CIH Bank' and 'sector' in rows['CIH']
+    
+    assert history.diff(since=2) == {'since': 2, 'version': 2, 'indices': {}, 'stocks': [], 'removed': []}
+
+
+def test_diff_is_none_for_evicted_or_unknown_versions():
+    indices, stocks, _ = exchange_snapshot()
+    history = SnapshotHistory(capacity=2)
+    for version in (1, 2, 3):
+        history.record(version, market_data(indices, stocks))
+    
+    assert 1 not in history and len(history) == 2
+    assert history.diff(since=1) is None
+    assert history.diff(since=4) is None
+    assert history.diff(since=2)['version'] == 3
+
+
+def test_delta_endpoint_falls_back_to_full_snapshot(api):
+    version = api.client.get('/api/market/snapshot?use_mock=false').json()['fetch_metadata']['snapshot_version']
+    
+    full = api.client.get(f'/api/market/delta?since={version + 100}').json()
+    assert full['full'] is True and len(full['stocks']) == 4
+    
+    delta = api.client.get(f'/api/market/delta?since={version}').json()
+    assert delta['full'] is False